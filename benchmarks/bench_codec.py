@@ -0,0 +1,84 @@
+"""
+Compare the JSON codecs available to ``IuguConfig.json_codec`` on large list pages.
+
+Run: ``python benchmarks/bench_codec.py [--invoices 1000] [--items 5]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from iugupy.codec import CODEC_NAMES, StdlibCodec, get_codec  # noqa: E402
+
+
+def make_invoice(i: int, items: int) -> dict:
+    return {
+        "id": f"{i:032X}",
+        "due_date": "2025-12-31",
+        "currency": "BRL",
+        "email": f"customer{i}@example.com",
+        "status": "pending" if i % 3 else "paid",
+        "total_cents": 1990 * items,
+        "paid_cents": None,
+        "customer_id": f"C{i:031X}",
+        "created_at_iso": "2025-12-01T10:00:00-03:00",
+        "updated_at": "2025-12-01T10:00:00-03:00",
+        "variables": [{"variable": "payment_data.transaction_number", "value": str(i)}],
+        "custom_variables": [],
+        "items": [
+            {
+                "id": f"{i:016X}{j:016X}",
+                "description": f"Service #{j}",
+                "quantity": 1,
+                "price_cents": 1990,
+                "price": "R$ 19,90",
+            }
+            for j in range(items)
+        ],
+    }
+
+
+def make_page(invoices: int, items: int) -> dict:
+    return {"totalItems": invoices, "items": [make_invoice(i, items) for i in range(invoices)]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--invoices", type=int, default=1000, help="invoices per page")
+    parser.add_argument("--items", type=int, default=5, help="items per invoice")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    page = make_page(args.invoices, args.items)
+    body = StdlibCodec().dumps(page)
+    create = make_invoice(0, 50)
+    print(f"page: {args.invoices} invoices x {args.items} items, {len(body) / 1024:.0f} KiB")
+    print(f"{'codec':<10}{'decode page':>14}{'encode page':>14}{'encode create':>16}")
+
+    baseline = None
+    for name in CODEC_NAMES[1:]:
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            print(f"{name:<10}{'not installed':>14}")
+            continue
+        number = 10
+        decode = min(timeit.repeat(lambda: codec.loads(body), number=number, repeat=args.repeat))
+        encode = min(timeit.repeat(lambda: codec.dumps(page), number=number, repeat=args.repeat))
+        small = min(timeit.repeat(lambda: codec.dumps(create), number=1000, repeat=args.repeat))
+        decode_ms, encode_ms, small_us = decode / number * 1e3, encode / number * 1e3, small * 1e3
+        if baseline is None:
+            baseline = decode_ms
+        print(
+            f"{name:<10}{decode_ms:>11.2f} ms{encode_ms:>11.2f} ms{small_us:>13.1f} us"
+            f"   decode x{baseline / decode_ms:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+End-to-end effect of ``IuguConfig.compression`` against the local emulator.
+
+The emulator gzips responses for clients that accept it and delays every body by its size
+over ``--bandwidth`` (bytes/s), standing in for a real network link. Each case runs with
+compression off (``identity``) and on, and reports the median latency, the response bytes
+that crossed the link and the bytes compression saved per call:
+
+    python benchmarks/bench_compression.py [--bandwidth 2000000] [--page-size 100]
+
+On a fast enough link compression costs more CPU than it saves in transfer time; lower
+``--bandwidth`` to see where it starts to pay off.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import iugupy  # noqa: E402
+from iugupy.compression import CompressionPolicy  # noqa: E402
+from iugupy.emulator import IuguEmulator  # noqa: E402
+
+MODES: Dict[str, CompressionPolicy] = {
+    "off": CompressionPolicy(encodings=()),
+    "gzip": CompressionPolicy(request_threshold=1024),
+}
+
+
+def make_create(items: int) -> Dict[str, Any]:
+    return {
+        "email": "customer@example.com",
+        "due_date": "2025-12-31",
+        "items": [
+            {"description": f"Service #{n} - monthly plan", "quantity": 1, "price_cents": 1990}
+            for n in range(items)
+        ],
+    }
+
+
+def cases(page_size: int, items: int) -> Dict[str, Callable[[iugupy.IuguClient], Any]]:
+    create = make_create(items)
+    return {
+        f"list {page_size} invoices": lambda c: c.invoices.list(limit=page_size),
+        f"create ({items} items)": lambda c: c.invoices.create(create),
+    }
+
+
+def run(
+    bandwidth: Optional[float], page_size: int, items: int, repeat: int
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    with IuguEmulator(compress=True, bandwidth=bandwidth) as emu:
+        emu.state.seed(invoices=page_size)
+        for case, call in cases(page_size, items).items():
+            for mode, policy in MODES.items():
+                config = iugupy.IuguConfig(
+                    api_token="tok", client_id="bench", base_url=emu.base_url, compression=policy
+                )
+                client = iugupy.IuguClient(config)
+                call(client)  # warm up the connection
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    call(client)
+                    timings.append(time.perf_counter() - started)
+                stats = client.compression_stats.snapshot()  # type: ignore[union-attr]
+                calls = repeat + 1
+                results.append(
+                    {
+                        "case": case,
+                        "mode": mode,
+                        "median_ms": statistics.median(timings) * 1e3,
+                        "response_bytes": stats["response_wire_bytes"] // calls,
+                        "saved_bytes": stats["bytes_saved"] // calls,
+                    }
+                )
+                client.session.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bandwidth", type=float, default=2_000_000, help="bytes/s (0: none)")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--items", type=int, default=200, help="items in the created invoice")
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    bandwidth = args.bandwidth or None
+    link = f"{bandwidth / 1e6:g} MB/s" if bandwidth else "unlimited"
+    print(f"emulator link: {link}")
+    print(f"{'case':<26}{'mode':<6}{'median':>11}{'resp/call':>12}{'saved/call':>12}")
+    for row in run(bandwidth, args.page_size, args.items, args.repeat):
+        print(
+            f"{row['case']:<26}{row['mode']:<6}{row['median_ms']:>8.2f} ms"
+            f"{row['response_bytes']:>12,}{row['saved_bytes']:>12,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Cold-start cost of the SDK: ``import iugupy`` and creating a client, in fresh interpreters.
+
+Each scenario runs ``--repeat`` times in a new ``python -X importtime`` process; the
+median of the time spent importing ``iugupy`` (and everything it pulled in) is reported,
+along with the wall time of the whole scenario and the heavy modules it loaded:
+
+    python benchmarks/bench_import.py                   # print the table
+    python benchmarks/bench_import.py --check           # exit 1 if a scenario loads
+                                                        # a deferred module or exceeds
+                                                        # --max-ms
+
+Importing the package and creating a client must not load ``requests`` or ``asyncio``;
+they are imported by the first request (or the async client). Import times depend on the
+machine, so ``--check`` only enforces the time budget when ``--max-ms`` is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Modules that must stay out of a cold start
+DEFERRED = ("requests", "urllib3", "asyncio", "ssl")
+
+CONFIG = "iugupy.IuguConfig(api_token='tok', client_id='bench')"
+
+# (name, statement, modules it is allowed to load among DEFERRED)
+SCENARIOS: List[Tuple[str, str, Tuple[str, ...]]] = [
+    ("import", "import iugupy", ()),
+    ("client", f"import iugupy; c = iugupy.IuguClient({CONFIG})", ()),
+    ("client.invoices", f"import iugupy; iugupy.IuguClient({CONFIG}).invoices", ()),
+    ("client.session", f"import iugupy; iugupy.IuguClient({CONFIG}).session", DEFERRED),
+]
+
+_PROBE = """
+import sys, time, json
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def parse_importtime(stderr: str, module: str = "iugupy") -> float:
+    """Cumulative microseconds spent importing ``module``, from ``-X importtime`` output."""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        if name == module:
+            return float(cumulative)
+    raise ValueError(f"{module} not found in -X importtime output")
+
+
+def run_once(statement: str) -> Tuple[float, float, List[str]]:
+    """(import us, scenario seconds, loaded modules) for one fresh interpreter."""
+    path = [str(SRC), os.environ.get("PYTHONPATH", "")]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, path))}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(statement=statement)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    result = json.loads(proc.stdout)
+    return parse_importtime(proc.stderr), result["elapsed"], result["modules"]
+
+
+@dataclass
+class Result:
+    import_ms: float  # median time importing iugupy
+    wall_ms: float  # median time of the whole scenario
+    loaded: List[str]  # DEFERRED modules the scenario loaded
+    iugupy_modules: int
+
+
+def measure(statement: str, repeat: int) -> Result:
+    imports, walls, modules = [], [], []
+    for _ in range(repeat):
+        import_us, elapsed, modules = run_once(statement)
+        imports.append(import_us)
+        walls.append(elapsed)
+    return Result(
+        import_ms=statistics.median(imports) / 1000,
+        wall_ms=statistics.median(walls) * 1000,
+        loaded=[name for name in DEFERRED if name in modules],
+        iugupy_modules=sum(1 for name in modules if name.startswith("iugupy")),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--check", action="store_true", help="fail on deferred imports")
+    parser.add_argument("--max-ms", type=float, help="with --check, budget for 'import'")
+    args = parser.parse_args(argv)
+
+    print(f"{'scenario':<18}{'import ms':>11}{'wall ms':>10}{'modules':>9}  deferred loaded")
+    failures = []
+    for name, statement, allowed in SCENARIOS:
+        result = measure(statement, args.repeat)
+        unexpected = [module for module in result.loaded if module not in allowed]
+        if unexpected:
+            failures.append(f"{name} loads {', '.join(unexpected)}")
+        if name == "import" and args.max_ms is not None and result.import_ms > args.max_ms:
+            failures.append(f"import takes {result.import_ms:.1f} ms (> {args.max_ms} ms)")
+        print(
+            f"{name:<18}{result.import_ms:>11.1f}{result.wall_ms:>10.1f}"
+            f"{result.iugupy_modules:>9}  {', '.join(result.loaded) or '-'}"
+        )
+
+    if args.check and failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""
+Per-call CPU overhead of the SDK, measured against an in-memory transport.
+
+Every resource method is timed end to end (validation, URL/header building, requests'
+prepare/send machinery, JSON encode/decode, error mapping) with the network replaced by
+a requests adapter that answers from memory. Success, error and large-payload cases are
+covered.
+
+Timings are divided by a fixed pure-Python calibration loop so results are comparable
+across machines, and compared against ``benchmarks/baseline.json``:
+
+    python benchmarks/bench_overhead.py                 # print the table
+    python benchmarks/bench_overhead.py --check         # exit 1 on regressions
+    python benchmarks/bench_overhead.py --update        # rewrite the baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import iugupy  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_codec import make_invoice, make_page  # noqa: E402
+
+BASE_URL = "https://api.iugu.test/v1"
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.5
+
+
+class MemoryAdapter(BaseAdapter):
+    """requests transport adapter that answers every request with a canned response."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.status = 200
+        self.body = b"{}"
+
+    def reply(self, status: int, payload: Any) -> None:
+        self.status = status
+        self.body = json.dumps(payload).encode()
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = self.status
+        resp.reason = "OK" if self.status < 400 else "Error"
+        resp.headers = CaseInsensitiveDict(
+            {"Content-Type": "application/json", "Content-Length": str(len(self.body))}
+        )
+        resp._content = self.body
+        resp.encoding = "utf-8"
+        resp.url = request.url or ""
+        resp.request = request
+        return resp
+
+    def close(self) -> None:
+        pass
+
+
+def make_client(adapter: MemoryAdapter, **config: Any) -> iugupy.IuguClient:
+    # The stdlib codec keeps results independent of which optional codecs are installed
+    cfg = iugupy.IuguConfig(
+        api_token="tok", client_id="cid", base_url=BASE_URL, json_codec="json", **config
+    )
+    client = iugupy.IuguClient(cfg)
+    client.session.mount("https://", adapter)
+    return client
+
+
+def expect_api_error(fn: Callable[[], Any]) -> Callable[[], None]:
+    def call() -> None:
+        try:
+            fn()
+        except iugupy.IuguAPIError:
+            return
+        raise AssertionError("expected IuguAPIError")
+
+    return call
+
+
+def build_cases(client: iugupy.IuguClient) -> List[Tuple[str, Any, Any, Callable[[], Any]]]:
+    """(name, status, response payload, call) for every benchmarked case."""
+    invoice = make_invoice(1, 3)
+    big_invoice = make_invoice(2, 200)
+    customer = {"id": "C1", "email": "a@b.com", "name": "Alice"}
+    plan = {"id": "P1", "identifier": "gold", "name": "Gold", "interval": 1}
+    subscription = {"id": "S1", "customer_id": "C1", "plan_identifier": "gold"}
+    payment_method = {"id": "PM1", "description": "card", "item_type": "credit_card"}
+    plan_data = {"name": "Gold", "identifier": "gold", "interval": 1, "interval_type": "months"}
+    invoice_data = {
+        "email": "a@b.com",
+        "due_date": "2025-12-31",
+        "items": [{"description": "Service", "quantity": 1, "price_cents": 1990}],
+    }
+    big_invoice_data = {**invoice_data, "items": invoice_data["items"] * 200}
+    errors = {"errors": {"email": ["is invalid"]}}
+    c = client
+    return [
+        # Success path, one case per resource method
+        ("plans.list", 200, {"totalItems": 1, "items": [plan]}, lambda: c.plans.list()),
+        ("plans.create", 200, plan, lambda: c.plans.create(plan_data)),
+        ("plans.get", 200, plan, lambda: c.plans.get("P1")),
+        ("plans.update", 200, plan, lambda: c.plans.update("P1", {"name": "Gold+"})),
+        ("plans.delete", 200, plan, lambda: c.plans.delete("P1")),
+        ("customers.list", 200, {"totalItems": 1, "items": [customer]}, lambda: c.customers.list()),
+        ("customers.create", 200, customer, lambda: c.customers.create({"email": "a@b.com"})),
+        ("customers.get", 200, customer, lambda: c.customers.get("C1")),
+        ("customers.update", 200, customer, lambda: c.customers.update("C1", {"name": "Bob"})),
+        ("customers.delete", 200, customer, lambda: c.customers.delete("C1")),
+        (
+            "customers.list_payment_methods",
+            200,
+            [payment_method],
+            lambda: c.customers.list_payment_methods("C1"),
+        ),
+        (
+            "customers.create_payment_method",
+            200,
+            payment_method,
+            lambda: c.customers.create_payment_method("C1", {"token": "t", "description": "d"}),
+        ),
+        (
+            "customers.get_payment_method",
+            200,
+            payment_method,
+            lambda: c.customers.get_payment_method("C1", "PM1"),
+        ),
+        (
+            "customers.update_payment_method",
+            200,
+            payment_method,
+            lambda: c.customers.update_payment_method("C1", "PM1", {"description": "d"}),
+        ),
+        (
+            "customers.delete_payment_method",
+            200,
+            payment_method,
+            lambda: c.customers.delete_payment_method("C1", "PM1"),
+        ),
+        ("invoices.list", 200, {"totalItems": 1, "items": [invoice]}, lambda: c.invoices.list()),
+        ("invoices.create", 200, invoice, lambda: c.invoices.create(invoice_data)),
+        ("invoices.get", 200, invoice, lambda: c.invoices.get("I1")),
+        ("invoices.update", 200, invoice, lambda: c.invoices.update("I1", {"email": "c@d.com"})),
+        ("invoices.delete", 200, invoice, lambda: c.invoices.delete("I1")),
+        (
+            "subscriptions.list",
+            200,
+            {"totalItems": 1, "items": [subscription]},
+            lambda: c.subscriptions.list(),
+        ),
+        (
+            "subscriptions.create",
+            200,
+            subscription,
+            lambda: c.subscriptions.create({"customer_id": "C1", "plan_identifier": "gold"}),
+        ),
+        ("subscriptions.get", 200, subscription, lambda: c.subscriptions.get("S1")),
+        (
+            "subscriptions.update",
+            200,
+            subscription,
+            lambda: c.subscriptions.update("S1", {"plan_identifier": "silver"}),
+        ),
+        ("subscriptions.delete", 200, subscription, lambda: c.subscriptions.delete("S1")),
+        ("subscriptions.activate", 200, subscription, lambda: c.subscriptions.activate("S1")),
+        ("subscriptions.suspend", 200, subscription, lambda: c.subscriptions.suspend("S1")),
+        (
+            "subscriptions.change_plan",
+            200,
+            subscription,
+            lambda: c.subscriptions.change_plan("S1", "silver"),
+        ),
+        # Error path: HTTP error mapped to IuguAPIError
+        (
+            "error.customers.create",
+            422,
+            errors,
+            expect_api_error(lambda: c.customers.create({"email": "x"})),
+        ),
+        (
+            "error.invoices.get",
+            404,
+            {"errors": "Not Found"},
+            expect_api_error(lambda: c.invoices.get("nope")),
+        ),
+        # Large payloads
+        ("large.invoices.list_1000", 200, make_page(1000, 5), lambda: c.invoices.list()),
+        ("large.invoices.get_200_items", 200, big_invoice, lambda: c.invoices.get("I2")),
+        (
+            "large.invoices.create_200_items",
+            200,
+            invoice,
+            lambda: c.invoices.create(big_invoice_data),
+        ),
+    ]
+
+
+# Cases repeated with IuguConfig(direct_send=True)
+DIRECT_CASES = (
+    "plans.get",
+    "customers.list",
+    "invoices.create",
+    "subscriptions.suspend",
+    "error.invoices.get",
+)
+
+
+def all_cases(adapter: MemoryAdapter) -> List[Tuple[str, Any, Any, Callable[[], Any]]]:
+    cases = build_cases(make_client(adapter))
+    direct = build_cases(make_client(adapter, direct_send=True))
+    cases.extend((f"direct.{name}", *rest) for name, *rest in direct if name in DIRECT_CASES)
+    return cases
+
+
+def calibrate(repeat: int) -> float:
+    """Seconds per iteration of a fixed loop of dict/str/call work similar to the SDK's."""
+    headers = {"Accept": "application/json", "User-Agent": "iugupy", "Content-Type": "x"}
+
+    def work() -> None:
+        merged = dict(headers)
+        merged["X-Test"] = "1"
+        "/".join(("https://api.iugu.test/v1", "invoices", "I1")).lower()
+        sorted(merged.items())
+
+    return min(timeit.repeat(work, number=20000, repeat=repeat)) / 20000
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> float:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(number=number, repeat=repeat)) / number
+
+
+def run(repeat: int, only: str = "") -> Tuple[float, Dict[str, float]]:
+    adapter = MemoryAdapter()
+    unit = calibrate(repeat)
+    results: Dict[str, float] = {}
+    for name, status, payload, call in all_cases(adapter):
+        if only and only not in name:
+            continue
+        adapter.reply(status, payload)
+        call()  # warm up and fail fast on broken cases
+        results[name] = measure(call, repeat)
+    return unit, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--check", action="store_true", help="fail on regressions vs baseline")
+    parser.add_argument("--update", action="store_true", help="write the results as baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"allowed slowdown vs baseline for --check (default {DEFAULT_TOLERANCE:.0%})",
+    )
+    args = parser.parse_args()
+
+    unit, results = run(args.repeat, args.filter)
+    baseline = json.loads(BASELINE.read_text())["cases"] if BASELINE.exists() else {}
+
+    print(f"calibration unit: {unit * 1e6:.3f} us")
+    print(f"{'case':<36}{'us/call':>11}{'units':>10}{'baseline':>10}{'ratio':>8}")
+    regressions = []
+    for name, seconds in results.items():
+        units = seconds / unit
+        base = baseline.get(name)
+        ratio = units / base if base else None
+        flag = ""
+        if ratio is not None and ratio > 1 + args.tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<36}{seconds * 1e6:>11.1f}{units:>10.1f}"
+            f"{base if base is not None else '-':>10}"
+            f"{f'{ratio:.2f}' if ratio is not None else '-':>8}{flag}"
+        )
+
+    if args.update:
+        cases = {**baseline, **{name: round(s / unit, 1) for name, s in results.items()}}
+        BASELINE.write_text(
+            json.dumps({"unit": "calibration loops", "cases": cases}, indent=2) + "\n"
+        )
+        print(f"baseline written to {BASELINE}")
+    if args.check and regressions:
+        print(f"{len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+End-to-end throughput of the sync and async clients against the local emulator.
+
+Run: ``python benchmarks/bench_throughput.py [--requests 5000] [--concurrency 16]
+[--latency uniform:1,5] [--error-rate 0.01]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import iugupy  # noqa: E402
+from iugupy.emulator import IuguEmulator  # noqa: E402
+
+
+def config(base_url: str, concurrency: int, retry: bool) -> iugupy.IuguConfig:
+    return iugupy.IuguConfig(
+        api_token="tok",
+        client_id="bench",
+        base_url=base_url,
+        pool_maxsize=concurrency,
+        retry=iugupy.RetryPolicy(base_delay=0.01) if retry else None,
+    )
+
+
+def run_sync(cfg: iugupy.IuguConfig, requests: int, concurrency: int) -> float:
+    client = iugupy.IuguClient(cfg)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(lambda i: client.plans.get("P1"), range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+def run_async(cfg: iugupy.IuguConfig, requests: int, concurrency: int) -> float:
+    async def main() -> float:
+        async with iugupy.AsyncIuguClient(cfg, max_connections=concurrency) as client:
+            gate = asyncio.Semaphore(concurrency)
+
+            async def one() -> None:
+                async with gate:
+                    await client.plans.get("P1")
+
+            started = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(requests)))
+            return requests / (time.perf_counter() - started)
+
+    return asyncio.run(main())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", default="0", help="emulator latency spec")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with IuguEmulator(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=0,
+        seed=1,
+    ) as emu:
+        emu.state.plans["P1"] = {"id": "P1", "identifier": "gold", "name": "Gold"}
+        retry = bool(args.error_rate or args.throttle_rate)
+        cfg = config(emu.base_url, args.concurrency, retry)
+        print(f"{args.requests} GETs, concurrency {args.concurrency}, latency {args.latency}")
+        print(f"sync  (threads): {run_sync(cfg, args.requests, args.concurrency):>8,.0f} req/s")
+        print(f"async (asyncio): {run_async(cfg, args.requests, args.concurrency):>8,.0f} req/s")
+        print(f"emulator served {emu.stats.requests} requests, {emu.stats.injected} faults")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,42 @@
+from typing import Any
+
 from .config import IuguConfig
 from .client import IuguClient
-from .errors import IuguAPIError, IuguValidationError
+from .breaker import CircuitBreakerPolicy
+from .compression import CompressionPolicy
+from .hedging import HedgingPolicy
+from .errors import (
+    IuguAPIError,
+    IuguCircuitOpenError,
+    IuguTenantBusyError,
+    IuguValidationError,
+)
+from .instrumentation import Hook, MetricsCollector
+from .latency import AdaptiveTimeout
+from .retry import RetryPolicy
+
+__all__ = [
+    "IuguConfig",
+    "IuguClient",
+    "AsyncIuguClient",
+    "IuguAPIError",
+    "IuguValidationError",
+    "IuguCircuitOpenError",
+    "IuguTenantBusyError",
+    "RetryPolicy",
+    "Hook",
+    "MetricsCollector",
+    "CircuitBreakerPolicy",
+    "AdaptiveTimeout",
+    "HedgingPolicy",
+    "CompressionPolicy",
+]
+
+
+def __getattr__(name: str) -> Any:
+    # The asyncio client (and asyncio itself) is only imported when asked for
+    if name == "AsyncIuguClient":
+        from .aio import AsyncIuguClient
 
-__all__ = ["IuguConfig", "IuguClient", "IuguAPIError", "IuguValidationError"]
+        return AsyncIuguClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
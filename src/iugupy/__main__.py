@@ -0,0 +1,190 @@
+"""
+Command line entry point: ``python -m iugupy <command> ...``.
+
+Credentials are read from ``--token`` or the ``IUGU_API_TOKEN`` environment variable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .client import IuguClient
+from .config import DEFAULT_BASE_URL, IuguConfig
+from .errors import IuguAPIError, IuguValidationError
+
+
+RESOURCES = ("plans", "customers", "subscriptions", "invoices")
+
+
+def _parse_params(pairs: Sequence[str]) -> Dict[str, Any]:
+    params: Dict[str, Any] = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep or not key:
+            raise IuguValidationError(f"invalid --param {pair!r}, expected key=value")
+        params[key] = value
+    return params
+
+
+def _make_client(args: argparse.Namespace) -> IuguClient:
+    token = args.token or os.environ.get("IUGU_API_TOKEN")
+    if not token:
+        raise IuguValidationError("an API token is required (--token or IUGU_API_TOKEN)")
+    client_id = os.environ.get("IUGU_CLIENT_ID", "iugupy-cli")
+    return IuguClient(IuguConfig(api_token=token, client_id=client_id, base_url=args.base_url))
+
+
+def _cmd_export(args: argparse.Namespace) -> int:
+    from .export import export_ndjson
+
+    output = args.output or f"{args.resource}.ndjson" + (".gz" if args.gzip else "")
+
+    def report(progress: Any) -> None:
+        if not args.quiet:
+            print(
+                f"\r{progress.records} records, {progress.pages} pages, "
+                f"{progress.records_per_second:,.0f} records/s",
+                end="",
+                file=sys.stderr,
+            )
+
+    with _make_client(args) as client:
+        result = export_ndjson(
+            getattr(client, args.resource),
+            output,
+            page_size=args.page_size,
+            concurrency=args.concurrency,
+            compress=True if args.gzip else None,
+            progress=report,
+            **_parse_params(args.param),
+        )
+    if not args.quiet:
+        print(file=sys.stderr)
+    resumed = " (resumed)" if result.resumed else ""
+    print(
+        f"exported {result.records} {args.resource} to {result.path}{resumed} in "
+        f"{result.elapsed:.1f}s ({result.records_per_second:,.0f} records/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _cmd_mirror(args: argparse.Namespace) -> int:
+    from .mirror import Mirror
+
+    with _make_client(args) as client:
+        with Mirror(client, args.database, page_size=args.page_size) as mirror:
+            results = mirror.sync(args.resource or None, full=args.full)
+    for result in results.values():
+        kind = "full" if result.full else "incremental"
+        print(
+            f"{result.resource}: {result.fetched} fetched, {result.deleted} deleted "
+            f"({kind}, {result.elapsed:.1f}s)",
+            file=sys.stderr,
+        )
+    return 0
+
+
+def _cmd_billing_run(args: argparse.Namespace) -> int:
+    from .billing import load_specs, run_billing, validate_specs
+
+    specs = load_specs(args.specs, format=args.format)
+    if args.validate_only:
+        problems = validate_specs(specs)
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        print(f"{len(specs)} specs, {len(problems)} invalid", file=sys.stderr)
+        return 1 if problems else 0
+
+    output = args.output or str(Path(args.specs).with_suffix(".results.ndjson"))
+
+    def report(progress: Any) -> None:
+        if not args.quiet:
+            print(
+                f"\r{progress.done}/{progress.total} specs: {progress.created} created, "
+                f"{progress.skipped} skipped, {progress.failed} failed",
+                end="",
+                file=sys.stderr,
+            )
+
+    with _make_client(args) as client:
+        result = run_billing(
+            client.invoices,
+            specs,
+            output,
+            journal_path=args.journal,
+            concurrency=args.concurrency,
+            progress=report,
+        )
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(
+        f"created {result.created}, skipped {result.skipped}, failed {result.failed} of "
+        f"{result.total} invoices in {result.elapsed:.1f}s "
+        f"({result.invoices_per_second:,.1f} invoices/s); results in {result.output}",
+        file=sys.stderr,
+    )
+    return 0 if result.ok else 2
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m iugupy", description="IUGU API tools")
+    parser.add_argument("--token", help="API token (default: $IUGU_API_TOKEN)")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="API base URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="stream a resource to NDJSON (resumable)")
+    export.add_argument("resource", choices=RESOURCES)
+    export.add_argument("-o", "--output", help="output file (default: <resource>.ndjson)")
+    export.add_argument("--gzip", action="store_true", help="gzip the output")
+    export.add_argument("--page-size", type=int, default=100)
+    export.add_argument("--concurrency", type=int, default=4, help="pages fetched in parallel")
+    export.add_argument(
+        "--param", action="append", default=[], metavar="KEY=VALUE", help="list filter"
+    )
+    export.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    export.set_defaults(func=_cmd_export)
+
+    mirror = commands.add_parser("mirror", help="sync the account into a local SQLite file")
+    mirror.add_argument("database", help="SQLite file (created if missing)")
+    mirror.add_argument(
+        "--resource", action="append", choices=RESOURCES, help="only sync this resource"
+    )
+    mirror.add_argument("--full", action="store_true", help="reload instead of updated_since")
+    mirror.add_argument("--page-size", type=int, default=100)
+    mirror.set_defaults(func=_cmd_mirror)
+
+    billing = commands.add_parser(
+        "billing-run", help="create invoices from a CSV/NDJSON spec file (resumable)"
+    )
+    billing.add_argument("specs", help="invoice specs (.csv, or NDJSON)")
+    billing.add_argument("--format", choices=("csv", "ndjson"), help="default: by extension")
+    billing.add_argument(
+        "-o", "--output", help="per-invoice results (default: <specs>.results.ndjson)"
+    )
+    billing.add_argument("--journal", help="created-invoice journal (default: <output>.journal)")
+    billing.add_argument("--concurrency", type=int, default=8, help="creates in flight")
+    billing.add_argument("--validate-only", action="store_true", help="check the specs and exit")
+    billing.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    billing.set_defaults(func=_cmd_billing_run)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (IuguAPIError, IuguValidationError) as exc:
+        print(str(exc), file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("\ninterrupted; rerun the same command to resume", file=sys.stderr)
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
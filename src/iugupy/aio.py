@@ -0,0 +1,429 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json as _json
+import ssl
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .clientbase import BaseClient, encode_query
+from .compression import GZIP, decode, decoders
+from .config import IuguConfig
+from .hedging import AsyncHedger
+from .singleflight import AsyncSingleFlight
+from .resources import LazyResource
+from .retry import IDEMPOTENT_METHODS
+
+JSON_MIME = "application/json"
+DEFAULT_MAX_CONNECTIONS = 100
+
+
+class AsyncResponse:
+    """
+    Minimal response object returned by :meth:`AsyncIuguClient.request`.
+
+    Mirrors the subset of ``requests.Response`` used by the resources:
+    ``status_code``, ``headers``, ``content``, ``text``, ``json()``, ``url`` and
+    ``request.method``.
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        reason: str,
+        headers: Dict[str, str],
+        content: bytes,
+        url: str,
+        method: str,
+    ) -> None:
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers  # keys are lower-cased
+        self.content = content
+        self.url = url
+        self.request = _RequestInfo(method)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return _json.loads(self.content)
+
+
+class _RequestInfo:
+    __slots__ = ("method",)
+
+    def __init__(self, method: str) -> None:
+        self.method = method
+
+
+class _Connection:
+    __slots__ = ("reader", "writer", "reused")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+class _ConnectionPool:
+    """
+    Keep-alive pool of HTTP/1.1 connections to a single origin.
+
+    At most ``max_connections`` requests are in flight at once; further callers
+    wait for a free slot instead of opening new sockets.
+    """
+
+    def __init__(self, host: str, port: int, use_tls: bool, max_connections: int) -> None:
+        self._host = host
+        self._port = port
+        self._ssl: Optional[ssl.SSLContext] = ssl.create_default_context() if use_tls else None
+        self._idle: List[_Connection] = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def acquire(self, *, fresh: bool = False) -> _Connection:
+        """A pooled keep-alive connection, or a new one (always new when ``fresh``)."""
+        await self._slots.acquire()
+        try:
+            while self._idle and not fresh:
+                conn = self._idle.pop()
+                if not conn.reader.at_eof():
+                    conn.reused = True
+                    return conn
+                conn.close()
+            return await self._open()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def _open(self) -> _Connection:
+        reader, writer = await asyncio.open_connection(
+            self._host,
+            self._port,
+            ssl=self._ssl,
+            server_hostname=self._host if self._ssl else None,
+        )
+        return _Connection(reader, writer)
+
+    def release(self, conn: _Connection, *, reusable: bool) -> None:
+        if reusable:
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    def close(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
+
+
+class AsyncIuguClient(BaseClient[AsyncSingleFlight, AsyncHedger]):
+    """
+    asyncio HTTP client for the IUGU API.
+
+    Same contract as :class:`IuguClient` (Basic Auth from api_token, JSON headers,
+    resources exposed as ``plans``, ``customers``, ``subscriptions`` and ``invoices``),
+    but every resource method returns an awaitable. Requests share a bounded pool of
+    keep-alive connections, so thousands of calls can be in flight from a single event
+    loop while at most ``max_connections`` sockets are open.
+
+    The client must be used from a single event loop; close it with ``await aclose()``
+    or use it as an async context manager.
+    """
+
+    # Resources, built on first access
+    plans = LazyResource("AsyncPlans")
+    customers = LazyResource("AsyncCustomers")
+    subscriptions = LazyResource("AsyncSubscriptions")
+    invoices = LazyResource("AsyncInvoices")
+
+    _single_flight_class = AsyncSingleFlight
+    _hedger_class = AsyncHedger
+
+    def __init__(
+        self, config: IuguConfig, *, max_connections: int = DEFAULT_MAX_CONNECTIONS
+    ) -> None:
+        super().__init__(config)
+
+        parts = urlsplit(self._base_url)
+        use_tls = parts.scheme == "https"
+        self._host = parts.hostname or ""
+        self._port = parts.port or (443 if use_tls else 80)
+        self._base_path = parts.path
+        self._host_header = parts.netloc.rsplit("@", 1)[-1]
+        self._use_tls = use_tls
+        self._max_connections = max_connections
+        self._pool: Optional[_ConnectionPool] = None
+
+        # Default headers; Authorization is precomputed once (token as username, blank password)
+        token = base64.b64encode(f"{config.api_token}:".encode()).decode()
+        default_headers: Dict[str, str] = {
+            "Accept": JSON_MIME,
+            "Content-Type": JSON_MIME,
+            "User-Agent": config.user_agent,
+            "Authorization": f"Basic {token}",
+        }
+        # Compressed responses (see IuguConfig.compression) are decoded in _exchange
+        if config.compression is not None:
+            default_headers["Accept-Encoding"] = config.compression.accept_encoding(decoders())
+        if config.extra_headers:
+            default_headers.update(config.extra_headers)
+        self._headers = default_headers
+
+    async def __aenter__(self) -> AsyncIuguClient:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def _get_pool(self) -> _ConnectionPool:
+        # Created lazily so the semaphore binds to the running event loop
+        if self._pool is None:
+            self._pool = _ConnectionPool(
+                self._host, self._port, self._use_tls, self._max_connections
+            )
+        return self._pool
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Optional[Any] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncResponse:
+        """
+        Perform an HTTP request relative to the configured base_url.
+        Ensures JSON headers are present; custom headers can override defaults.
+
+        Raises ``ConnectionError``/``OSError`` on network failures and ``TimeoutError``
+        when the whole exchange exceeds the timeout. When ``config.retry`` is set,
+        idempotent methods are retried according to the policy.
+        """
+        method = method.upper()
+        rel = path.lstrip("/")
+        if params:
+            query = encode_query(params)
+            if query:
+                rel += "?" + query
+        target = self._base_path + rel
+        url = self._base_url + rel
+
+        req_headers = self._headers
+        if headers:
+            req_headers = {**self._headers, **headers}
+        body = b"" if json is None else self._codec.dumps(json)
+        if body and self._compression is not None:
+            compressed = self._compress_body(body)
+            if compressed is not None:
+                body = compressed
+                req_headers = {**req_headers, "Content-Encoding": GZIP}
+
+        endpoint, timeout = self._endpoint_and_timeout(method, rel, timeout)
+
+        policy = self._config.retry
+        if policy is None or not policy.allows(method, headers):
+            return await self._attempt(method, target, url, req_headers, body, timeout, 1, endpoint)
+
+        state = policy.start(method, url)
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_timeout = state.attempt_timeout(timeout)
+            try:
+                resp = await self._attempt(
+                    method, target, url, req_headers, body, attempt_timeout, attempt, endpoint
+                )
+            except (OSError, EOFError, TimeoutError) as exc:
+                delay = state.retry_delay(error=exc)
+                if delay is None:
+                    raise
+            else:
+                delay = state.retry_delay(status_code=resp.status_code, headers=resp.headers)
+                if delay is None:
+                    return resp
+            await asyncio.sleep(delay)
+
+    async def _exchange(
+        self, method: str, target: str, url: str, headers: Mapping[str, str], body: bytes
+    ) -> AsyncResponse:
+        pool = self._get_pool()
+        head = self._build_head(method, target, headers, body)
+        # The request may have been applied before its connection dropped, so it is only
+        # sent again when that is safe: idempotent methods and keyed (deduplicated) POSTs
+        resendable = method in IDEMPOTENT_METHODS or any(
+            name.lower() == "idempotency-key" for name in headers
+        )
+        fresh = False
+        while True:
+            conn = await pool.acquire(fresh=fresh)
+            reusable = False
+            try:
+                conn.writer.write(head + body)
+                await conn.writer.drain()
+                try:
+                    status, reason, resp_headers = await _read_head(conn.reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    # The server may close an idle keep-alive socket at any time; a reused
+                    # connection that dies before answering is sent again, once, on a new one.
+                    if conn.reused and resendable and not fresh:
+                        fresh = True
+                        continue
+                    raise
+                content, reusable = await _read_body(conn.reader, method, status, resp_headers)
+                if self._compression_stats is not None:
+                    wire = len(content)
+                    encoding = resp_headers.get("content-encoding")
+                    if encoding:
+                        content = decode(content, encoding)
+                    self._compression_stats.record_response(len(content), wire, bool(encoding))
+                return AsyncResponse(status, reason, resp_headers, content, url, method)
+            finally:
+                pool.release(conn, reusable=reusable)
+
+    async def _attempt(
+        self,
+        method: str,
+        target: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: bytes,
+        timeout: Optional[float],
+        attempt: int,
+        endpoint: Optional[str],
+    ) -> AsyncResponse:
+        """One HTTP attempt, through the circuit breaker, latency tracking and hooks."""
+        if endpoint is None:
+            if self._hooks:
+                return await self._exchange_observed(
+                    method, target, url, headers, body, timeout, attempt
+                )
+            async with asyncio.timeout(timeout):
+                return await self._exchange(method, target, url, headers, body)
+
+        breaker, probe, started = self._begin_attempt(endpoint)
+        try:
+            if self._hooks:
+                resp = await self._exchange_observed(
+                    method, target, url, headers, body, timeout, attempt
+                )
+            else:
+                async with asyncio.timeout(timeout):
+                    resp = await self._exchange(method, target, url, headers, body)
+        except (OSError, EOFError, TimeoutError) as exc:
+            timed_out = isinstance(exc, TimeoutError)
+            self._attempt_failed(endpoint, breaker, probe, started, timed_out)
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.cancel(probe)
+            raise
+        self._attempt_done(endpoint, breaker, probe, started, resp.status_code)
+        return resp
+
+    async def _exchange_observed(
+        self,
+        method: str,
+        target: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: bytes,
+        timeout: Optional[float],
+        attempt: int,
+    ) -> AsyncResponse:
+        event, hooks, started = self._hooks_before(method, url, attempt, len(body))
+        try:
+            async with asyncio.timeout(timeout):
+                resp = await self._exchange(method, target, url, headers, body)
+        except BaseException as exc:
+            self._hooks_error(event, hooks, started, exc)
+            raise
+        self._hooks_after(event, hooks, started, resp)
+        return resp
+
+    def _build_head(
+        self, method: str, target: str, headers: Mapping[str, str], body: bytes
+    ) -> bytes:
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self._host_header}"]
+        lines.extend(f"{k}: {v}" for k, v in headers.items())
+        if body or method in ("POST", "PUT", "PATCH"):
+            lines.append(f"Content-Length: {len(body)}")
+        lines.append("\r\n")
+        return "\r\n".join(lines).encode("latin-1")
+
+    # Convenience HTTP verb helpers
+    async def get(self, path: str, **kwargs: Any) -> AsyncResponse:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs: Any) -> AsyncResponse:
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path: str, **kwargs: Any) -> AsyncResponse:
+        return await self.request("PUT", path, **kwargs)
+
+    async def patch(self, path: str, **kwargs: Any) -> AsyncResponse:
+        return await self.request("PATCH", path, **kwargs)
+
+    async def delete(self, path: str, **kwargs: Any) -> AsyncResponse:
+        return await self.request("DELETE", path, **kwargs)
+
+
+# ---- HTTP/1.1 response parsing ----
+async def _read_head(reader: asyncio.StreamReader) -> Tuple[int, str, Dict[str, str]]:
+    while True:
+        raw = await reader.readuntil(b"\r\n\r\n")
+        lines = raw.decode("latin-1").split("\r\n")
+        _version, status, *reason = lines[0].split(" ", 2)
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, _, value = line.partition(":")
+            key = name.strip().lower()
+            value = value.strip()
+            headers[key] = f"{headers[key]}, {value}" if key in headers else value
+        code = int(status)
+        # Skip interim 1xx responses (e.g. 100 Continue)
+        if 100 <= code < 200:
+            continue
+        return code, reason[0] if reason else "", headers
+
+
+async def _read_body(
+    reader: asyncio.StreamReader, method: str, status: int, headers: Mapping[str, str]
+) -> Tuple[bytes, bool]:
+    keep_alive = headers.get("connection", "").lower() != "close"
+    if method == "HEAD" or status in (204, 304):
+        return b"", keep_alive
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        chunks: List[bytes] = []
+        while True:
+            size_line = await reader.readuntil(b"\r\n")
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                # Consume optional trailers up to the final blank line
+                while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                    pass
+                return b"".join(chunks), keep_alive
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+    length = headers.get("content-length")
+    if length is not None:
+        return await reader.readexactly(int(length)), keep_alive
+    # No framing information: the body runs until the server closes the connection
+    return await reader.read(), False
@@ -0,0 +1,310 @@
+"""
+Month-end billing runs: create many invoices from a spec file, in parallel and resumably.
+
+Specs are read from NDJSON (one ``Invoices.create`` payload per line) or CSV (one row per
+invoice item; rows sharing a ``ref`` form one invoice) and all of them are validated with
+the same rules as ``Invoices.create`` before the first request is sent::
+
+    specs = load_specs("2025-12.csv")
+    result = run_billing(client.invoices, specs, "2025-12.results.ndjson")
+
+Every spec has a ``ref``: the ``ref`` field/column when present, otherwise a digest of
+its payload. Created invoices are appended to a journal (``<output>.journal``) as they
+complete, and running the same specs again skips every ``ref`` in it. Each create carries
+an ``Idempotency-Key`` derived from the ref and payload, so an invoice whose create was
+in flight when the run died is not created twice by the rerun either.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from .bulk import DEFAULT_BULK_CONCURRENCY, run_bulk
+from .errors import IuguAPIError, IuguValidationError
+from .idempotency import request_fingerprint
+from .resources.invoices import Invoices
+
+
+JOURNAL_SUFFIX = ".journal"
+REF_FIELD = "ref"
+# CSV columns that describe an invoice item rather than the invoice
+ITEM_COLUMNS = ("description", "quantity", "price_cents")
+_INT_ITEM_COLUMNS = ("quantity", "price_cents")
+# Invalid specs listed in the error raised before a run
+MAX_REPORTED_ERRORS = 20
+
+
+@dataclass
+class InvoiceSpec:
+    """One invoice to create: its run-wide ``ref``, payload and source line."""
+
+    ref: str
+    payload: Dict[str, Any]
+    line: int = 0
+
+    @property
+    def fingerprint(self) -> str:
+        return request_fingerprint("POST", "invoices", None, self.payload)
+
+    @property
+    def idempotency_key(self) -> str:
+        # Stable across reruns; a changed payload gets a new key
+        return request_fingerprint("POST", "billing-run", {REF_FIELD: self.ref}, self.payload)[:32]
+
+
+@dataclass
+class BillingResult:
+    """Summary of a billing run; per-spec outcomes are in the output file."""
+
+    output: Path
+    journal: Path
+    total: int = 0
+    created: int = 0
+    skipped: int = 0  # already in the journal
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def done(self) -> int:
+        return self.created + self.skipped + self.failed
+
+    @property
+    def ok(self) -> bool:
+        return self.failed == 0
+
+    @property
+    def invoices_per_second(self) -> float:
+        return self.created / self.elapsed if self.elapsed > 0 else 0.0
+
+
+# ---- Loading and validation ----
+def load_specs(
+    path: Union[str, os.PathLike[str]], *, format: Optional[str] = None
+) -> List[InvoiceSpec]:
+    """
+    Read invoice specs from ``path``. ``format`` is ``"csv"`` or ``"ndjson"`` and defaults
+    to the file extension (``.csv``; anything else is read as NDJSON).
+
+    CSV columns other than ``ref`` and the item columns (``description``, ``quantity``,
+    ``price_cents``) are invoice fields, taken from the first row of each invoice; empty
+    cells are left out. Malformed lines raise :class:`IuguValidationError`.
+    """
+    path = Path(path)
+    if format is None:
+        format = "csv" if path.suffix.lower() == ".csv" else "ndjson"
+    if format == "csv":
+        specs = _load_csv(path)
+    elif format == "ndjson":
+        specs = _load_ndjson(path)
+    else:
+        raise IuguValidationError(f"unknown spec format {format!r}, expected csv or ndjson")
+    return _assign_refs(specs)
+
+
+def _load_ndjson(path: Path) -> List[InvoiceSpec]:
+    specs: List[InvoiceSpec] = []
+    with open(path, encoding="utf-8") as fh:
+        for line, text in enumerate(fh, 1):
+            if not text.strip():
+                continue
+            try:
+                payload = json.loads(text)
+            except ValueError as exc:
+                raise IuguValidationError(f"{path}:{line}: invalid JSON: {exc}") from None
+            if not isinstance(payload, dict):
+                raise IuguValidationError(f"{path}:{line}: expected a JSON object")
+            ref = payload.pop(REF_FIELD, None)
+            specs.append(InvoiceSpec("" if ref is None else str(ref), payload, line))
+    return specs
+
+
+def _load_csv(path: Path) -> List[InvoiceSpec]:
+    by_ref: Dict[str, InvoiceSpec] = {}
+    specs: List[InvoiceSpec] = []
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        reader = csv.DictReader(fh)
+        for row in reader:
+            line = reader.line_num
+            cells = {k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+            ref = cells.pop(REF_FIELD, "")
+            item: Dict[str, Any] = {}
+            for column in ITEM_COLUMNS:
+                if column in cells:
+                    item[column] = cells.pop(column)
+            for column in _INT_ITEM_COLUMNS:
+                if column in item:
+                    try:
+                        item[column] = int(item[column])
+                    except ValueError:
+                        raise IuguValidationError(
+                            f"{path}:{line}: {column} must be an integer, got {item[column]!r}"
+                        ) from None
+            spec = by_ref.get(ref) if ref else None
+            if spec is None:
+                spec = InvoiceSpec(ref, {**cells, "items": []}, line)
+                specs.append(spec)
+                if ref:
+                    by_ref[ref] = spec
+            if item:
+                spec.payload["items"].append(item)
+    return specs
+
+
+def _assign_refs(specs: List[InvoiceSpec]) -> List[InvoiceSpec]:
+    # Specs without a ref are keyed by their payload; identical ones are numbered
+    seen: Dict[str, int] = {}
+    for spec in specs:
+        if not spec.ref:
+            base = spec.fingerprint[:16]
+            seen[base] = seen.get(base, 0) + 1
+            spec.ref = base if seen[base] == 1 else f"{base}-{seen[base]}"
+    return specs
+
+
+def validate_specs(specs: Iterable[InvoiceSpec]) -> List[str]:
+    """Problems found in ``specs`` (``Invoices.create`` rules, duplicate refs), one per spec."""
+    problems: List[str] = []
+    refs: Dict[str, int] = {}
+    for spec in specs:
+        where = f"line {spec.line} ({REF_FIELD} {spec.ref})"
+        if spec.ref in refs:
+            problems.append(f"{where}: duplicate {REF_FIELD}, first on line {refs[spec.ref]}")
+            continue
+        refs[spec.ref] = spec.line
+        try:
+            Invoices._validate_create(spec.payload)
+        except IuguValidationError as exc:
+            problems.append(f"{where}: {exc.message}")
+    return problems
+
+
+# ---- Journal ----
+def _default_journal(output: Path) -> Path:
+    return output.with_name(output.name + JOURNAL_SUFFIX)
+
+
+def _trim_partial_entry(path: Path) -> None:
+    # Appending after a line cut short by a crash would corrupt the next entry too
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return
+    if data and not data.endswith(b"\n"):
+        with open(path, "r+b") as fh:
+            fh.truncate(data.rfind(b"\n") + 1)
+
+
+def read_journal(path: Union[str, os.PathLike[str]]) -> Dict[str, str]:
+    """``ref -> invoice id`` of every invoice a previous run recorded as created."""
+    created: Dict[str, str] = {}
+    try:
+        fh = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return created
+    with fh:
+        for text in fh:
+            try:
+                entry = json.loads(text)
+            except ValueError:
+                continue  # a line cut short by a crash; its create is deduplicated by key
+            created[entry["ref"]] = entry["id"]
+    return created
+
+
+# ---- Run ----
+def run_billing(
+    invoices: Invoices,
+    specs: Iterable[InvoiceSpec],
+    output: Union[str, os.PathLike[str]],
+    *,
+    journal_path: Optional[Union[str, os.PathLike[str]]] = None,
+    concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    progress: Optional[Callable[[BillingResult], None]] = None,
+) -> BillingResult:
+    """
+    Create an invoice for every spec not already in the journal, with at most
+    ``concurrency`` creates in flight.
+
+    All specs are validated first; if any is invalid, :class:`IuguValidationError` is
+    raised and nothing is created. ``output`` is rewritten with one NDJSON line per spec
+    (``status`` is ``created``, ``skipped`` or ``failed``) in completion order. API and
+    network errors are recorded per spec and never abort the run; run the same specs
+    again to retry the failed ones.
+    """
+    specs = list(specs)
+    problems = validate_specs(specs)
+    if problems:
+        shown = "; ".join(problems[:MAX_REPORTED_ERRORS])
+        more = len(problems) - MAX_REPORTED_ERRORS
+        raise IuguValidationError(
+            f"{len(problems)} invalid invoice spec(s): {shown}"
+            + (f" (and {more} more)" if more > 0 else "")
+        )
+
+    out_path = Path(output)
+    journal = Path(journal_path) if journal_path else _default_journal(out_path)
+    _trim_partial_entry(journal)
+    done = read_journal(journal)
+    result = BillingResult(out_path, journal, total=len(specs))
+    lock = threading.Lock()
+    started = time.perf_counter()
+
+    with (
+        open(out_path, "w", encoding="utf-8") as out,
+        open(journal, "a", encoding="utf-8") as journal_fh,
+    ):
+
+        def record(entry: Dict[str, Any], invoice_id: Optional[str] = None) -> None:
+            with lock:
+                out.write(json.dumps(entry) + "\n")
+                out.flush()
+                if entry["status"] == "created":
+                    journal_fh.write(json.dumps({"ref": entry["ref"], "id": invoice_id}) + "\n")
+                    journal_fh.flush()
+                    result.created += 1
+                elif entry["status"] == "skipped":
+                    result.skipped += 1
+                else:
+                    result.failed += 1
+                result.elapsed = time.perf_counter() - started
+                if progress is not None:
+                    progress(result)
+
+        pending: Dict[str, InvoiceSpec] = {}
+        for spec in specs:
+            if spec.ref in done:
+                record({"ref": spec.ref, "status": "skipped", "id": done[spec.ref]})
+            else:
+                pending[spec.ref] = spec
+
+        def create(ref: str) -> None:
+            spec = pending[ref]
+            try:
+                invoice = invoices.create(spec.payload, idempotency_key=spec.idempotency_key)
+            except IuguAPIError as exc:
+                record({"ref": ref, "status": "failed", "error": str(exc), "code": exc.status_code})
+                return
+            except Exception as exc:
+                record({"ref": ref, "status": "failed", "error": repr(exc)})
+                return
+            invoice_id = _invoice_id(invoice)
+            record({"ref": ref, "status": "created", "id": invoice_id}, invoice_id)
+
+        run_bulk("billing-run", create, pending, concurrency=concurrency)
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _invoice_id(invoice: Any) -> Optional[str]:
+    # Plain dicts by default, models with typed_responses=True
+    if isinstance(invoice, dict):
+        return invoice.get("id")
+    return getattr(invoice, "id", None)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, FrozenSet, List
+
+from .errors import IuguCircuitOpenError
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+FAILURE_STATUSES = frozenset({500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class CircuitBreakerPolicy:
+    """
+    Per-endpoint circuit breaker (set ``IuguConfig.circuit_breaker``).
+
+    Each endpoint (method plus path template, e.g. ``GET invoices/:id``) keeps the
+    outcomes of its last ``window`` attempts. Once at least ``min_calls`` are recorded and
+    the share of failures (connection errors, timeouts and ``failure_statuses``) reaches
+    ``failure_rate``, the circuit opens: calls to that endpoint fail immediately with
+    :class:`~iugupy.errors.IuguCircuitOpenError` for ``open_seconds``. Then up to
+    ``half_open_calls`` probe requests are let through; if they all succeed the circuit
+    closes, and any failure opens it again.
+
+    Attributes:
+        failure_rate: Failure share (0 < rate <= 1) that opens the circuit.
+        min_calls: Minimum outcomes in the window before the rate is evaluated.
+        window: Number of recent outcomes kept per endpoint.
+        open_seconds: How long the circuit stays open before probing.
+        half_open_calls: Probe requests allowed (and required to succeed) when half-open.
+        failure_statuses: HTTP statuses counted as failures.
+    """
+
+    failure_rate: float = 0.5
+    min_calls: int = 20
+    window: int = 100
+    open_seconds: float = 30.0
+    half_open_calls: int = 1
+    failure_statuses: FrozenSet[int] = FAILURE_STATUSES
+
+    def __post_init__(self) -> None:
+        if not 0 < self.failure_rate <= 1:
+            raise ValueError("failure_rate must be in (0, 1]")
+        if self.min_calls <= 0 or self.window < self.min_calls or self.half_open_calls <= 0:
+            raise ValueError("require 0 < min_calls <= window and half_open_calls > 0")
+
+
+class CircuitBreaker:
+    """State machine of one endpoint; thread-safe."""
+
+    def __init__(self, endpoint: str, policy: CircuitBreakerPolicy) -> None:
+        self.endpoint = endpoint
+        self.policy = policy
+        self.state = CLOSED
+        self.rejected = 0
+        self.opened = 0
+        self._lock = threading.Lock()
+        self._outcomes: Deque[bool] = deque(maxlen=policy.window)  # True = failure
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+
+    def before(self) -> bool:
+        """
+        Admit a call, or raise :class:`IuguCircuitOpenError`. Returns True when the call
+        is a half-open probe (pass it back to :meth:`record`/:meth:`cancel`).
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+            if self.state == OPEN:
+                retry_in = self._opened_at + self.policy.open_seconds - time.monotonic()
+                if retry_in > 0:
+                    self.rejected += 1
+                    raise IuguCircuitOpenError(self.endpoint, retry_in)
+                self.state = HALF_OPEN
+                self._probes = self._probe_successes = 0
+            if self._probes >= self.policy.half_open_calls:
+                self.rejected += 1
+                raise IuguCircuitOpenError(self.endpoint, 0.0)
+            self._probes += 1
+            return True
+
+    def record(self, failed: bool, probe: bool) -> None:
+        with self._lock:
+            if probe:
+                if self.state != HALF_OPEN:
+                    return
+                if failed:
+                    self._open()
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.policy.half_open_calls:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                    self._failures = 0
+                return
+            if self.state != CLOSED:
+                return  # a call admitted before the circuit opened
+            outcomes = self._outcomes
+            if len(outcomes) == outcomes.maxlen and outcomes[0]:
+                self._failures -= 1
+            outcomes.append(failed)
+            if failed:
+                self._failures += 1
+                calls = len(outcomes)
+                policy = self.policy
+                if calls >= policy.min_calls and self._failures >= policy.failure_rate * calls:
+                    self._open()
+
+    def cancel(self, probe: bool) -> None:
+        """Release an admitted call whose outcome says nothing about the endpoint."""
+        if probe:
+            with self._lock:
+                if self.state == HALF_OPEN and self._probes:
+                    self._probes -= 1
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened += 1
+        self._opened_at = time.monotonic()
+
+
+class CircuitBreakers:
+    """The breakers of one client, created per endpoint on first use."""
+
+    def __init__(self, policy: CircuitBreakerPolicy) -> None:
+        self.policy = policy
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(endpoint)
+                if breaker is None:
+                    breaker = self._breakers[endpoint] = CircuitBreaker(endpoint, self.policy)
+        return breaker
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [
+            {"endpoint": b.endpoint, "state": b.state, "opened": b.opened, "rejected": b.rejected}
+            for _, b in sorted(self._breakers.items())
+        ]
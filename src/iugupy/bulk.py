@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from .errors import IuguValidationError
+
+
+DEFAULT_BULK_CONCURRENCY = 8
+
+
+@dataclass
+class BulkItemResult:
+    """Outcome of one item of a bulk operation."""
+
+    id: str
+    ok: bool
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class BulkReport:
+    """Per-item results of a bulk operation, in input order."""
+
+    action: str
+    dry_run: bool = False
+    results: List[BulkItemResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> List[BulkItemResult]:
+        return [r for r in self.results if r.ok]
+
+    @property
+    def failed(self) -> List[BulkItemResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def failed_ids(self) -> List[str]:
+        """Ids to pass to a new bulk call to retry only what failed."""
+        return [r.id for r in self.results if not r.ok]
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.results)
+
+    @property
+    def items_per_second(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _check_concurrency(concurrency: int) -> None:
+    if concurrency <= 0:
+        raise IuguValidationError("concurrency must be a positive integer")
+
+
+def run_bulk(
+    action: str,
+    fn: Callable[[str], Any],
+    ids: Iterable[str],
+    *,
+    concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    dry_run: bool = False,
+) -> BulkReport:
+    """
+    Call ``fn(id)`` for every id on a thread pool with at most ``concurrency`` calls in
+    flight. ``ids`` is consumed lazily, so it may be a generator over millions of ids.
+    Exceptions (validation or API errors) are recorded per item and never abort the run.
+    """
+    _check_concurrency(concurrency)
+    report = BulkReport(action, dry_run=dry_run)
+    # One slot per id, added when it is submitted: results stay in input order and an
+    # id is never dropped, whatever happens to its call
+    results: List[BulkItemResult] = []
+    started = time.perf_counter()
+
+    def record(index: int, item_id: str, future: Future[Any]) -> None:
+        if future.cancelled():
+            results[index] = BulkItemResult(item_id, False, error=CancelledError())
+            return
+        error = future.exception()
+        if error is None:
+            results[index] = BulkItemResult(item_id, True, result=future.result())
+        else:
+            results[index] = BulkItemResult(item_id, False, error=error)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="iugupy-bulk") as pool:
+        in_flight: Dict[Future[Any], tuple[int, str]] = {}
+        for index, item_id in enumerate(ids):
+            if len(in_flight) >= concurrency:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record(*in_flight.pop(future), future)
+            results.append(BulkItemResult(item_id, False))
+            in_flight[pool.submit(fn, item_id)] = (index, item_id)
+        wait(in_flight)
+        for future in list(in_flight):
+            record(*in_flight.pop(future), future)
+
+    report.results = results
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+async def arun_bulk(
+    action: str,
+    fn: Callable[[str], Awaitable[Any]],
+    ids: Iterable[str],
+    *,
+    concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    dry_run: bool = False,
+) -> BulkReport:
+    """
+    asyncio counterpart of :func:`run_bulk` (``fn`` returns an awaitable). An item whose
+    call is cancelled is recorded as failed with the ``CancelledError``; cancelling the
+    whole run cancels the calls still in flight.
+    """
+    import asyncio  # imported here so the sync client does not load asyncio
+
+    _check_concurrency(concurrency)
+    report = BulkReport(action, dry_run=dry_run)
+    results: List[BulkItemResult] = []
+    started = time.perf_counter()
+
+    async def one(index: int, item_id: str) -> None:
+        try:
+            results[index] = BulkItemResult(item_id, True, result=await fn(item_id))
+        except Exception as exc:
+            results[index] = BulkItemResult(item_id, False, error=exc)
+        except BaseException as exc:
+            # Cancellation (or KeyboardInterrupt...): record the item, then let it propagate
+            results[index] = BulkItemResult(item_id, False, error=exc)
+            raise
+
+    in_flight: set[asyncio.Task[None]] = set()
+    try:
+        for index, item_id in enumerate(ids):
+            if len(in_flight) >= concurrency:
+                _, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            results.append(BulkItemResult(item_id, False))
+            in_flight.add(asyncio.ensure_future(one(index, item_id)))
+        if in_flight:
+            await asyncio.wait(in_flight)
+    except BaseException:
+        for task in in_flight:
+            task.cancel()
+        raise
+
+    report.results = results
+    report.elapsed = time.perf_counter() - started
+    return report
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional, Protocol, Tuple
+
+if TYPE_CHECKING:
+    from .config import IuguConfig
+
+
+DEFAULT_CACHE_MAX_ENTRIES = 1024
+# Invalidated paths whose generation a ResourceCache remembers (see ResourceCache.generation)
+MAX_TRACKED_GENERATIONS = 4096
+
+
+class CacheBackend(Protocol):
+    """
+    Storage used by the read-through cache of ``get()`` calls.
+
+    Implementations must be thread-safe. ``get`` returns None for a missing or expired
+    entry. A shared store (e.g. Redis/memcached) can be plugged in through
+    ``IuguConfig.cache_backend`` to share entries and invalidations across workers.
+    """
+
+    def get(self, key: str) -> Optional[Any]: ...
+
+    def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class TTLCache:
+    """In-process LRU cache whose entries also expire after a per-entry TTL."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer")
+        self._max_entries = max_entries
+        self._data: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResourceCache:
+    """
+    Read-through cache for one resource's ``get(id)`` calls.
+
+    Keys are namespaced by a digest of the API token, so several accounts can share one
+    backend without seeing each other's data. Values are deep-copied on the way in and
+    out: callers may mutate what they receive without corrupting the cache.
+
+    Each path has a generation that ``invalidate`` bumps. A GET takes it before fetching
+    and passes it to ``store``, which drops the result if an update or delete of the same
+    path invalidated it in the meantime: that result may predate the write.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, api_token: str) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._prefix = "iugupy:" + hashlib.sha256(api_token.encode()).hexdigest()[:16] + ":"
+        # Only invalidated paths are tracked; the others share the floor generation, which
+        # moves forward whenever the table is reset, so no generation is ever reused
+        self._generations: Dict[str, int] = {}
+        self._floor = 0
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def key(self, path: str) -> str:
+        return self._prefix + path
+
+    def lookup(self, path: str) -> Optional[Any]:
+        value = self.backend.get(self.key(path))
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return copy.deepcopy(value)
+
+    def generation(self, path: str) -> int:
+        with self._lock:
+            return self._generations.get(path, self._floor)
+
+    def store(self, path: str, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Cache ``value`` for ``path``; with ``generation`` (taken before fetching it), only
+        if ``path`` was not invalidated since.
+        """
+        if value is None:
+            return
+        if generation is not None and self.generation(path) != generation:
+            return
+        key = self.key(path)
+        self.backend.set(key, copy.deepcopy(value), self.ttl)
+        if generation is not None and self.generation(path) != generation:
+            # Invalidated between the check and the set, possibly before its delete landed
+            self.backend.delete(key)
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            if len(self._generations) >= MAX_TRACKED_GENERATIONS:
+                self._generations.clear()
+                self._floor = next(self._counter)
+            self._generations[path] = next(self._counter)
+        self.backend.delete(self.key(path))
+
+
+def make_cache(config: IuguConfig) -> Optional[CacheBackend]:
+    """Cache backend for a client: the configured one, or an LRU when TTLs are set."""
+    if not config.cache_ttl:
+        return None
+    if config.cache_backend is not None:
+        return config.cache_backend
+    return TTLCache(config.cache_max_entries)
@@ -1,19 +1,33 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Mapping, Optional
+import threading
+import time
+from base64 import b64encode
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple, Type
 from urllib.parse import urljoin
 
-import requests
-from requests.auth import HTTPBasicAuth
-
+from .clientbase import BaseClient
+from .compression import GZIP, urllib3_encodings
 from .config import IuguConfig
-from .resources import Plans, Customers, Subscriptions, Invoices
+from .hedging import Hedger
+from .singleflight import SingleFlight
+from .resources import LazyResource
+
+if TYPE_CHECKING:
+    import requests
+
+    from .transport import DirectSend
 
 
 JSON_MIME = "application/json"
 
 
-class IuguClient:
+def basic_auth_header(api_token: str) -> str:
+    """Authorization header value for a token (Basic auth, token as user, no password)."""
+    return "Basic " + b64encode(f"{api_token}:".encode("latin-1")).decode("ascii")
+
+
+class IuguClient(BaseClient[SingleFlight, Hedger]):
     """
     Thin HTTP client for the IUGU API using requests.
 
@@ -21,13 +35,26 @@ class IuguClient:
       - Basic Auth built from api_token (username) and blank password
       - Accept: application/json
       - Content-Type: application/json (for requests that send a body)
+
+    ``session`` lets several clients (e.g. one per API token) share one
+    ``requests.Session`` and its connection pools; the shared session is not modified,
+    and this client's headers and Authorization are sent with each request instead.
+
+    Creating a client is cheap: ``requests`` is imported and the session built on the
+    first request (or ``session`` access), and each resource on first access.
     """
 
-    def __init__(self, config: IuguConfig) -> None:
-        self._config = config
-        self._session = requests.Session()
-        # Basic auth: token as username, blank password
-        self._session.auth = HTTPBasicAuth(config.api_token, "")
+    # Resources, built on first access
+    plans = LazyResource("Plans")
+    customers = LazyResource("Customers")
+    subscriptions = LazyResource("Subscriptions")
+    invoices = LazyResource("Invoices")
+
+    _single_flight_class = SingleFlight
+    _hedger_class = Hedger
+
+    def __init__(self, config: IuguConfig, *, session: Optional[requests.Session] = None) -> None:
+        super().__init__(config)
 
         # Default headers
         default_headers: Dict[str, str] = {
@@ -37,29 +64,82 @@ class IuguClient:
         }
         if config.extra_headers:
             default_headers.update(config.extra_headers)
-        self._session.headers.update(default_headers)
 
-        # Store base url and timeout
-        self._base_url = config.base_url.rstrip("/") + "/"
-        self._timeout = config.timeout
+        # Headers sent with every request, or None when they live on the session
+        self._default_headers = default_headers
+        self._headers: Optional[Dict[str, str]] = None
+        if session is not None:
+            default_headers["Authorization"] = basic_auth_header(config.api_token)
+            self._headers = default_headers
+        # Built by _connect() on first use; a session passed in is not ours to close
+        self._session: Optional[requests.Session] = session
+        self._owns_session = session is None
+        self._connected = False
+        self._connect_lock = threading.Lock()
+        self._transient_errors: Tuple[Type[BaseException], ...] = ()
+        # Errors meaning the server did not answer within the attempt's timeout
+        self._timeout_errors: Tuple[Type[BaseException], ...] = ()
+        self._direct: Optional[DirectSend] = None
 
-        # Resources
-        self.plans = Plans(self)
-        self.customers = Customers(self)
-        self.subscriptions = Subscriptions(self)
-        self.invoices = Invoices(self)
+        if config.warm_up_connections > 0:
+            self.warm_up(config.warm_up_connections)
 
-    @property
-    def config(self) -> IuguConfig:
-        return self._config
+    def _connect(self) -> requests.Session:
+        """Import the transport and set up the session (once, on first use)."""
+        with self._connect_lock:
+            if not self._connected:
+                from requests import ReadTimeout
+                from requests.auth import HTTPBasicAuth
+
+                from .transport import TRANSIENT_ERRORS, DirectSend, build_session
+
+                if self._compression is not None:
+                    # Only advertise what urllib3 can decode here (brotli/zstd are optional)
+                    accept = self._compression.accept_encoding(urllib3_encodings())
+                    self._default_headers["Accept-Encoding"] = accept
+                session = self._session
+                if session is None:
+                    session = build_session(self._config)
+                    # Basic auth: token as username, blank password
+                    session.auth = HTTPBasicAuth(self._config.api_token, "")
+                    session.headers.update(self._default_headers)
+                self._transient_errors = TRANSIENT_ERRORS
+                self._timeout_errors = (ReadTimeout,)
+                # Direct sends (see IuguConfig.direct_send) reuse one header template, with
+                # the Authorization header precomputed, and the pooled adapter for base_url
+                if self._config.direct_send:
+                    self._direct = DirectSend(session, self._base_url, self._headers)
+                self._session = session
+                self._connected = True
+        return self._session  # type: ignore[return-value]
 
     @property
     def session(self) -> requests.Session:  # exposed for advanced scenarios/testing
-        return self._session
+        return self._session if self._connected else self._connect()  # type: ignore[return-value]
 
-    @property
-    def base_url(self) -> str:
-        return self._base_url
+    def close(self) -> None:
+        """Shut down the hedging threads and close the session, unless it was passed in."""
+        if self._hedger is not None:
+            self._hedger.close()
+        if self._owns_session and self._connected:
+            self._session.close()  # type: ignore[union-attr]
+
+    def __enter__(self) -> IuguClient:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def warm_up(self, connections: Optional[int] = None) -> int:
+        """
+        Pre-open pooled connections to base_url so the first requests skip DNS/TCP/TLS.
+        Returns how many connections were opened (0 if the host is unreachable).
+        """
+        if connections is None:
+            connections = self._config.warm_up_connections or self._config.pool_maxsize
+        from .transport import warm_up
+
+        return warm_up(self.session, self._base_url, connections)
 
     def request(
         self,
@@ -70,25 +150,171 @@ class IuguClient:
         json: Optional[Any] = None,
         headers: Optional[Mapping[str, str]] = None,
         timeout: Optional[float] = None,
+        stream: bool = False,
     ) -> requests.Response:
         """
         Perform an HTTP request relative to the configured base_url.
         Ensures JSON headers are present; custom headers can override defaults.
+
+        With ``stream=True`` the body is left unread (see ``Response.iter_content``); the
+        caller must read it or close the response to release the connection.
+
+        When ``config.retry`` is set, idempotent methods are retried according to the
+        policy; the last response (or exception) is returned (or raised) as usual.
+        While the endpoint's circuit breaker is open, ``IuguCircuitOpenError`` is raised
+        without sending anything.
         """
-        url = urljoin(self._base_url, path.lstrip("/"))
-        # Merge headers if provided; session headers serve as defaults.
-        req_headers = dict(self._session.headers)
-        if headers:
-            req_headers.update(headers)
-
-        resp = self._session.request(
-            method=method.upper(),
+        if not self._connected:
+            self._connect()
+        method = method.upper()
+        if "://" in path:
+            url = urljoin(self._base_url, path)
+        else:
+            url = self._base_url + path.lstrip("/")
+        if self._headers is None or self._config.direct_send:
+            # The session (or direct-send template) has the defaults; only overrides
+            # need to be passed along.
+            req_headers = headers or None
+        else:
+            req_headers = {**self._headers, **headers} if headers else self._headers
+        endpoint, timeout = self._endpoint_and_timeout(
+            method, path if "://" in path else path.lstrip("/"), timeout
+        )
+        body = None if json is None else self._codec.dumps(json)
+        if body is not None and self._compression is not None:
+            compressed = self._compress_body(body)
+            if compressed is not None:
+                body = compressed
+                req_headers = {**(req_headers or {}), "Content-Encoding": GZIP}
+
+        policy = self._config.retry
+        if policy is None or not policy.allows(method, headers):
+            resp = self._attempt(
+                method, url, params, body, req_headers, timeout, 1, endpoint, stream
+            )
+            if self._compression_stats is not None and not stream:
+                self._record_response_size(resp)
+            return resp
+
+        state = policy.start(method, url)
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_timeout = state.attempt_timeout(timeout)
+            try:
+                resp = self._attempt(
+                    method,
+                    url,
+                    params,
+                    body,
+                    req_headers,
+                    attempt_timeout,
+                    attempt,
+                    endpoint,
+                    stream,
+                )
+            except self._transient_errors as exc:
+                delay = state.retry_delay(error=exc)
+                if delay is None:
+                    raise
+            else:
+                delay = state.retry_delay(status_code=resp.status_code, headers=resp.headers)
+                if delay is None:
+                    if self._compression_stats is not None and not stream:
+                        self._record_response_size(resp)
+                    return resp
+                resp.close()  # release the connection back to the pool before sleeping
+            time.sleep(delay)
+
+    def _record_response_size(self, resp: requests.Response) -> None:
+        size = len(resp.content)
+        compressed = bool(resp.headers.get("Content-Encoding"))
+        wire = size
+        if compressed:
+            # urllib3 counts the (compressed) bytes it read off the socket
+            tell = getattr(getattr(resp, "raw", None), "tell", None)
+            wire = tell() if tell is not None else size
+        self._compression_stats.record_response(size, wire, compressed)  # type: ignore[union-attr]
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        body: Optional[bytes],
+        headers: Optional[Mapping[str, str]],
+        timeout: Optional[float],
+        stream: bool = False,
+    ) -> requests.Response:
+        if self._direct is not None:
+            return self._direct.send(method, url, params, body, headers, timeout, stream)
+        return self._session.request(  # type: ignore[union-attr]
+            method=method,
             url=url,
             params=params,
-            json=json,
-            headers=req_headers,
-            timeout=self._timeout if timeout is None else timeout,
+            data=body,
+            headers=headers,
+            timeout=timeout,
+            stream=stream,
         )
+
+    def _attempt(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        body: Optional[bytes],
+        headers: Optional[Mapping[str, str]],
+        timeout: Optional[float],
+        attempt: int,
+        endpoint: Optional[str],
+        stream: bool = False,
+    ) -> requests.Response:
+        """One HTTP attempt, through the circuit breaker, latency tracking and hooks."""
+        if endpoint is None:
+            if self._hooks:
+                return self._send_observed(
+                    method, url, params, body, headers, timeout, attempt, stream
+                )
+            return self._send(method, url, params, body, headers, timeout, stream)
+
+        breaker, probe, started = self._begin_attempt(endpoint)
+        try:
+            if self._hooks:
+                resp = self._send_observed(
+                    method, url, params, body, headers, timeout, attempt, stream
+                )
+            else:
+                resp = self._send(method, url, params, body, headers, timeout, stream)
+        except self._transient_errors as exc:
+            timed_out = isinstance(exc, self._timeout_errors)
+            self._attempt_failed(endpoint, breaker, probe, started, timed_out)
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.cancel(probe)
+            raise
+        self._attempt_done(endpoint, breaker, probe, started, resp.status_code)
+        return resp
+
+    def _send_observed(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        body: Optional[bytes],
+        headers: Optional[Mapping[str, str]],
+        timeout: Optional[float],
+        attempt: int,
+        stream: bool = False,
+    ) -> requests.Response:
+        event, hooks, started = self._hooks_before(method, url, attempt, len(body) if body else 0)
+        try:
+            resp = self._send(method, url, params, body, headers, timeout, stream)
+        except BaseException as exc:
+            self._hooks_error(event, hooks, started, exc)
+            raise
+        self._hooks_after(event, hooks, started, resp)
         return resp
 
     # Convenience HTTP verb helpers
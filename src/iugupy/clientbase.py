@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Generic, List, Mapping, Optional, Tuple, Type, TypeVar
+from urllib.parse import urlencode
+
+from .breaker import CircuitBreaker, CircuitBreakers
+from .cache import CacheBackend, make_cache
+from .codec import JSONCodec, get_codec
+from .compression import CompressionStats
+from .config import IuguConfig
+from .idempotency import IdempotencyJournal
+from .instrumentation import Hook, RequestEvent, response_size
+from .latency import LatencyTracker, endpoint_key
+
+_SingleFlightT = TypeVar("_SingleFlightT")
+_HedgerT = TypeVar("_HedgerT")
+
+
+def encode_query(params: Mapping[str, Any]) -> str:
+    """
+    Query string for ``params``, built the way ``requests`` builds it: iterable values
+    repeat the key, and None values (alone or inside a list) are left out.
+    """
+    pairs: List[Tuple[str, Any]] = []
+    for key, value in params.items():
+        if isinstance(value, (str, bytes)) or not hasattr(value, "__iter__"):
+            value = (value,)
+        pairs.extend((key, v) for v in value if v is not None)
+    return urlencode(pairs)
+
+
+class BaseClient(Generic[_SingleFlightT, _HedgerT]):
+    """
+    State derived from :class:`IuguConfig` and its accessors, shared by
+    :class:`~iugupy.client.IuguClient` and :class:`~iugupy.aio.AsyncIuguClient`.
+
+    Subclasses set the single-flight and hedger classes matching their concurrency model
+    and implement the transport; the per-attempt circuit breaker and latency bookkeeping
+    lives here (``_begin_attempt``, ``_attempt_failed`` and ``_attempt_done``), as does
+    the running of hooks around an observed send (``_hooks_before``, ``_hooks_error`` and
+    ``_hooks_after``).
+    """
+
+    _single_flight_class: Type[_SingleFlightT]
+    _hedger_class: Type[_HedgerT]
+
+    def __init__(self, config: IuguConfig) -> None:
+        self._config = config
+        self._base_url = config.base_url.rstrip("/") + "/"
+        self._timeout = config.timeout
+        # Encodes request bodies once to bytes and decodes each response body once
+        self._codec = get_codec(config.json_codec)
+        # Compressed transfer (see IuguConfig.compression)
+        self._compression = config.compression
+        self._compression_stats = CompressionStats() if config.compression else None
+
+        # Shared by the resources whose get() results are cached (see IuguConfig.cache_ttl)
+        self._cache = make_cache(config)
+        # Coalesces identical concurrent GETs (see IuguConfig.single_flight)
+        self._single_flight: Optional[_SingleFlightT] = None
+        if config.single_flight:
+            self._single_flight = self._single_flight_class()
+        # Per-endpoint circuit breakers and latency windows (see IuguConfig.circuit_breaker,
+        # IuguConfig.adaptive_timeout and IuguConfig.hedging)
+        self._breakers = CircuitBreakers(config.circuit_breaker) if config.circuit_breaker else None
+        self._adaptive = config.adaptive_timeout
+        tracked = self._adaptive or config.hedging
+        self._latency = LatencyTracker(tracked.window) if tracked else None
+        # Races slow resource GETs against a second request (see IuguConfig.hedging)
+        self._hedger: Optional[_HedgerT] = None
+        if config.hedging is not None and self._latency is not None:
+            self._hedger = self._hedger_class(config.hedging, self._latency)  # type: ignore
+        # Idempotency keys for POSTs (see IuguConfig.idempotency_keys)
+        self._idempotency = config.idempotency_journal
+        if self._idempotency is None and config.idempotency_keys:
+            self._idempotency = IdempotencyJournal()
+        # Instrumentation callbacks run around every attempt (see add_hook)
+        self._hooks: List[Hook] = list(config.hooks)
+
+    @property
+    def config(self) -> IuguConfig:
+        return self._config
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+
+    @property
+    def codec(self) -> JSONCodec:
+        return self._codec
+
+    @property
+    def cache(self) -> Optional[CacheBackend]:
+        """Backend of the ``get()`` cache, or None when caching is disabled."""
+        return self._cache
+
+    @property
+    def single_flight(self) -> Optional[_SingleFlightT]:
+        """Coalescing group for identical in-flight GETs, or None when disabled."""
+        return self._single_flight
+
+    @property
+    def circuit_breakers(self) -> Optional[CircuitBreakers]:
+        """Per-endpoint circuit breakers, or None when disabled."""
+        return self._breakers
+
+    @property
+    def latency(self) -> Optional[LatencyTracker]:
+        """Recent per-endpoint latencies, or None when nothing uses them."""
+        return self._latency
+
+    @property
+    def hedger(self) -> Optional[_HedgerT]:
+        """Hedging of resource GETs and its per-endpoint stats, or None when disabled."""
+        return self._hedger
+
+    @property
+    def idempotency(self) -> Optional[IdempotencyJournal]:
+        """Journal of POST idempotency keys, or None when keys are disabled."""
+        return self._idempotency
+
+    @property
+    def compression_stats(self) -> Optional[CompressionStats]:
+        """Bytes on the wire vs uncompressed, or None when compression is not configured."""
+        return self._compression_stats
+
+    @property
+    def hooks(self) -> List[Hook]:
+        return list(self._hooks)
+
+    def add_hook(self, hook: Hook) -> None:
+        """Register a hook (e.g. a ``MetricsCollector``) called around every HTTP attempt."""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Hook) -> None:
+        self._hooks.remove(hook)
+
+    # ---- Request preparation ----
+    def _endpoint_and_timeout(
+        self, method: str, path: str, timeout: Optional[float]
+    ) -> Tuple[Optional[str], Optional[float]]:
+        """The endpoint to track (None when nothing tracks it) and the attempt timeout."""
+        endpoint = None
+        if self._breakers is not None or self._latency is not None:
+            endpoint = endpoint_key(method, path)
+            if timeout is None and self._adaptive is not None:
+                window = self._latency.window(endpoint)  # type: ignore[union-attr]
+                timeout = self._adaptive.timeout_for(window, self._timeout)
+        if timeout is None:
+            timeout = self._timeout
+        return endpoint, timeout
+
+    def _compress_body(self, body: bytes) -> Optional[bytes]:
+        """The gzip-compressed request body, or None when it is sent as is."""
+        if self._compression is None:
+            return None
+        compressed = self._compression.compress(body)
+        if compressed is not None:
+            stats = self._compression_stats
+            stats.record_request(len(body), len(compressed))  # type: ignore[union-attr]
+        return compressed
+
+    # ---- Per-attempt bookkeeping ----
+    def _begin_attempt(self, endpoint: str) -> Tuple[Optional[CircuitBreaker], bool, float]:
+        """Admit the attempt through the endpoint's breaker; returns (breaker, probe, start)."""
+        breaker = self._breakers.get(endpoint) if self._breakers is not None else None
+        probe = breaker.before() if breaker is not None else False
+        return breaker, probe, time.perf_counter()
+
+    def _attempt_failed(
+        self,
+        endpoint: str,
+        breaker: Optional[CircuitBreaker],
+        probe: bool,
+        started: float,
+        timed_out: bool,
+    ) -> None:
+        """A transport error (connection failure or timeout) ended the attempt."""
+        if breaker is not None:
+            breaker.record(True, probe)
+        if self._latency is not None and timed_out:
+            # The latency was at least the time waited. Without this sample an endpoint
+            # that slows down past its adaptive timeout keeps its old fast window, and
+            # the timeout never grows back: every later call would time out too.
+            self._latency.observe(endpoint, time.perf_counter() - started)
+
+    def _attempt_done(
+        self,
+        endpoint: str,
+        breaker: Optional[CircuitBreaker],
+        probe: bool,
+        started: float,
+        status: int,
+    ) -> None:
+        if breaker is not None:
+            breaker.record(status in breaker.policy.failure_statuses, probe)
+        if self._latency is not None and status < 500:
+            self._latency.observe(endpoint, time.perf_counter() - started)
+
+    # ---- Hooks around an observed send ----
+    def _hooks_before(
+        self, method: str, url: str, attempt: int, request_bytes: int
+    ) -> Tuple[RequestEvent, Tuple[Hook, ...], float]:
+        """Run ``before_request``; returns the event, the hooks to notify and the start."""
+        path = url[len(self._base_url) :] if url.startswith(self._base_url) else url
+        event = RequestEvent(method, path, url, attempt, request_bytes)
+        hooks = tuple(self._hooks)
+        for hook in hooks:
+            hook.before_request(event)
+        return event, hooks, time.perf_counter()
+
+    def _hooks_error(
+        self, event: RequestEvent, hooks: Tuple[Hook, ...], started: float, error: BaseException
+    ) -> None:
+        event.elapsed = time.perf_counter() - started
+        for hook in hooks:
+            hook.on_error(event, error)
+
+    def _hooks_after(
+        self, event: RequestEvent, hooks: Tuple[Hook, ...], started: float, response: Any
+    ) -> None:
+        event.elapsed = time.perf_counter() - started
+        event.status_code = response.status_code
+        event.response_bytes = response_size(response)
+        for hook in hooks:
+            hook.after_response(event, response)
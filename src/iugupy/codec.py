@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+from typing import Any, Callable, Dict, Mapping, Protocol, Union
+
+
+CODEC_NAMES = ("auto", "json", "orjson", "msgspec")
+
+
+class JSONCodec(Protocol):
+    """Encodes request bodies to bytes and decodes response bodies from bytes."""
+
+    name: str
+
+    def dumps(self, obj: Any) -> bytes: ...
+
+    def loads(self, data: Union[bytes, str]) -> Any: ...
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    # Same output as requests' json= handling (NaN/Infinity are rejected)
+    return json.dumps(obj, allow_nan=False).encode("utf-8")
+
+
+def _check_finite(obj: Any) -> None:
+    # orjson and msgspec encode NaN/Infinity as null; reject them like the stdlib does.
+    # Iterative with exact type checks first: this runs on every body containing null.
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is str or kind is int or value is None or kind is bool:
+            continue
+        if kind is dict:
+            stack.extend(value.values())
+        elif kind is list or kind is tuple:
+            stack.extend(value)
+        elif isinstance(value, float):
+            if not math.isfinite(value):
+                raise ValueError(f"Out of range float values are not JSON compliant: {value!r}")
+        elif isinstance(value, Mapping):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+
+
+# A number of 19+ digits (outside a string): orjson may decode it as a lossy float
+_WIDE_NUMBER = re.compile(rb"(?:^|[:\[,])\s*-?\d{19}")
+_WIDE_NUMBER_STR = re.compile(_WIDE_NUMBER.pattern.decode("ascii"))
+
+
+class StdlibCodec:
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return _stdlib_dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """
+    orjson, with non-str dict keys allowed as in the stdlib. Payloads orjson still
+    rejects (e.g. ints wider than 64 bits) are encoded and decoded with the stdlib
+    instead, and NaN/Infinity raise ``ValueError`` when encoding as they do there.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        self._option = orjson.OPT_NON_STR_KEYS
+        self._decode_error = orjson.JSONDecodeError
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            data = self._dumps(obj, option=self._option)
+        except TypeError:
+            return _stdlib_dumps(obj)
+        if b"null" in data:  # from a None or a non-finite float; only walk in that case
+            _check_finite(obj)
+        return data
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        # orjson either rejects ints wider than 64 bits or decodes them as floats
+        wide = _WIDE_NUMBER_STR if isinstance(data, str) else _WIDE_NUMBER
+        if wide.search(data):  # type: ignore[arg-type]
+            return json.loads(data)
+        try:
+            return self._loads(data)
+        except self._decode_error:
+            return json.loads(data)  # e.g. NaN, or raises the stdlib's error
+
+
+class MsgspecCodec:
+    """
+    msgspec; payloads it rejects are encoded and decoded with the stdlib instead, and
+    NaN/Infinity raise ``ValueError`` when encoding as they do there.
+    """
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._encode = msgspec.json.Encoder().encode
+        self._decode = msgspec.json.Decoder().decode
+        self._decode_error = msgspec.DecodeError
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            data = self._encode(obj)
+        except TypeError:
+            return _stdlib_dumps(obj)
+        if b"null" in data:
+            _check_finite(obj)
+        return data
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decode(data)
+        except self._decode_error:
+            return json.loads(data)  # e.g. NaN, or raises the stdlib's error
+
+
+_FACTORIES: Dict[str, Callable[[], JSONCodec]] = {
+    "json": StdlibCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+
+def get_codec(name: str = "auto") -> JSONCodec:
+    """
+    Return the JSON codec called ``name``.
+
+    ``"auto"`` picks the fastest installed one (orjson, then msgspec) and falls back to the standard
+    library. Every codec accepts the payloads the stdlib (and requests' ``json=``) accepts, such as
+    int dict keys and arbitrarily large ints, and rejects NaN and Infinity with ``ValueError``;
+    every codec decodes what ``json.loads`` does. Naming a codec whose package is not installed
+    raises ``ImportError``; an unknown name raises ``ValueError``.
+    """
+    if name == "auto":
+        for candidate in ("orjson", "msgspec"):
+            try:
+                return _FACTORIES[candidate]()
+            except ImportError:
+                continue
+        return StdlibCodec()
+    try:
+        factory = _FACTORIES[name]
+    except KeyError:
+        raise ValueError(f"unknown json codec {name!r}, expected one of {CODEC_NAMES}") from None
+    return factory()
@@ -0,0 +1,189 @@
+"""
+Compressed transfer (``IuguConfig.compression``).
+
+Responses: the client advertises the content codings it can decode in
+``Accept-Encoding`` (gzip and deflate always; brotli and zstd when their optional packages
+are installed) and decodes what the server picked. Requests: JSON bodies of at least
+``request_threshold`` bytes are gzip-compressed and sent with ``Content-Encoding: gzip``.
+
+:class:`CompressionStats` counts the bytes that went over the wire against their
+uncompressed size, so ``client.compression_stats.bytes_saved`` shows what it buys.
+"""
+
+from __future__ import annotations
+
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+
+GZIP = "gzip"
+DEFAULT_ENCODINGS = ("zstd", "br", "gzip")
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """
+    Compressed transfer (set ``IuguConfig.compression``).
+
+    - ``encodings``: response content codings to accept, most preferred first. Codings
+      that cannot be decoded here are left out of ``Accept-Encoding``; an empty tuple
+      asks for uncompressed responses (``identity``).
+    - ``request_threshold``: JSON request bodies of at least this many bytes are sent
+      gzip-compressed. None (the default) never compresses requests; only enable it for
+      servers that accept ``Content-Encoding: gzip`` request bodies.
+    - ``level``: gzip level for request bodies, 1 (fastest) to 9 (smallest).
+    """
+
+    encodings: Tuple[str, ...] = DEFAULT_ENCODINGS
+    request_threshold: Optional[int] = None
+    level: int = 6
+
+    def __post_init__(self) -> None:
+        if self.request_threshold is not None and self.request_threshold < 0:
+            raise ValueError("request_threshold must be >= 0")
+        if not 1 <= self.level <= 9:
+            raise ValueError("level must be between 1 and 9")
+
+    def accept_encoding(self, decodable: Iterable[str]) -> str:
+        """``Accept-Encoding`` value for the policy's codings that are in ``decodable``."""
+        supported = set(decodable)
+        accepted = [name for name in self.encodings if name in supported]
+        return ", ".join(accepted) if accepted else "identity"
+
+    def compress(self, body: bytes) -> Optional[bytes]:
+        """The gzip-compressed body, or None when it is below the threshold or grows."""
+        if self.request_threshold is None or len(body) < self.request_threshold:
+            return None
+        # wbits=31 writes a gzip member; a fixed header (no mtime) keeps retries identical
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        compressed = compressor.compress(body) + compressor.flush()
+        return compressed if len(compressed) < len(body) else None
+
+
+# ---- Response decoding ----
+def _brotli() -> Optional[Callable[[bytes], bytes]]:
+    for module in ("brotli", "brotlicffi"):
+        try:
+            return __import__(module).decompress  # type: ignore[no-any-return]
+        except ImportError:
+            continue
+    return None
+
+
+def _zstd() -> Optional[Callable[[bytes], bytes]]:
+    try:
+        from compression import zstd  # type: ignore[import-not-found]  # Python 3.14+
+
+        return zstd.decompress  # type: ignore[no-any-return]
+    except ImportError:
+        pass
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    return lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+def _inflate(data: bytes) -> bytes:
+    # "deflate" is zlib-wrapped per the RFC, but some servers send raw deflate
+    try:
+        return zlib.decompress(data)
+    except zlib.error:
+        return zlib.decompress(data, -zlib.MAX_WBITS)
+
+
+_decoders: Optional[Dict[str, Callable[[bytes], bytes]]] = None
+
+
+def decoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """Content coding -> decoder, for the codings this interpreter can decode."""
+    global _decoders
+    if _decoders is None:
+        found: Dict[str, Callable[[bytes], bytes]] = {
+            GZIP: lambda data: zlib.decompress(data, 16 + zlib.MAX_WBITS),
+            "deflate": _inflate,
+        }
+        for name, load in (("br", _brotli), ("zstd", _zstd)):
+            decode = load()
+            if decode is not None:
+                found[name] = decode
+        _decoders = found
+    return _decoders
+
+
+def decode(content: bytes, content_encoding: str) -> bytes:
+    """Undo a ``Content-Encoding`` (possibly several codings, applied in order)."""
+    table = decoders()
+    for name in reversed([c.strip().lower() for c in content_encoding.split(",")]):
+        if name in ("", "identity"):
+            continue
+        decoder = table.get(name)
+        if decoder is None:
+            raise ValueError(f"unsupported Content-Encoding {name!r}")
+        content = decoder(content)
+    return content
+
+
+def urllib3_encodings() -> FrozenSet[str]:
+    """Content codings the sync transport (urllib3) decodes in this environment."""
+    from urllib3.util.request import ACCEPT_ENCODING
+
+    return frozenset(name.strip() for name in ACCEPT_ENCODING.split(","))
+
+
+# ---- Metrics ----
+class CompressionStats:
+    """
+    Bytes sent and received by a client against their uncompressed size.
+
+    Request counters cover compressed request bodies only; response counters cover
+    every fully read response, compressed or not.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests_compressed = 0
+        self.request_bytes = 0  # uncompressed size of the compressed bodies
+        self.request_wire_bytes = 0
+        self.responses = 0
+        self.responses_compressed = 0
+        self.response_bytes = 0  # decoded size
+        self.response_wire_bytes = 0
+
+    def record_request(self, size: int, wire_size: int) -> None:
+        with self._lock:
+            self.requests_compressed += 1
+            self.request_bytes += size
+            self.request_wire_bytes += wire_size
+
+    def record_response(self, size: int, wire_size: int, compressed: bool) -> None:
+        with self._lock:
+            self.responses += 1
+            self.responses_compressed += compressed
+            self.response_bytes += size
+            self.response_wire_bytes += wire_size
+
+    @property
+    def bytes_saved(self) -> int:
+        return (self.request_bytes - self.request_wire_bytes) + (
+            self.response_bytes - self.response_wire_bytes
+        )
+
+    @property
+    def response_ratio(self) -> float:
+        """Wire bytes per decoded byte over all responses (1.0 = no savings)."""
+        return self.response_wire_bytes / self.response_bytes if self.response_bytes else 1.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests_compressed": self.requests_compressed,
+                "request_bytes": self.request_bytes,
+                "request_wire_bytes": self.request_wire_bytes,
+                "responses": self.responses,
+                "responses_compressed": self.responses_compressed,
+                "response_bytes": self.response_bytes,
+                "response_wire_bytes": self.response_wire_bytes,
+                "bytes_saved": self.bytes_saved,
+            }
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Optional, Mapping
+from typing import Optional, Mapping, Sequence, Tuple
+
+from .breaker import CircuitBreakerPolicy
+from .cache import DEFAULT_CACHE_MAX_ENTRIES, CacheBackend
+from .compression import CompressionPolicy
+from .hedging import HedgingPolicy
+from .idempotency import IdempotencyJournal
+from .instrumentation import Hook
+from .latency import AdaptiveTimeout
+from .retry import RetryPolicy
 
 
 DEFAULT_BASE_URL = "https://api.iugu.com/v1"
 DEFAULT_TIMEOUT = 30.0  # seconds
 DEFAULT_USER_AGENT = "iugupy/0.1.0 (+https://github.com/ramongsoares/iugu-py)"
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
 
 
 @dataclass(frozen=True)
@@ -23,6 +34,72 @@ class IuguConfig:
       - timeout: Default request timeout in seconds (float). Defaults to 30s.
       - user_agent: Value for the User-Agent header.
       - extra_headers: Additional headers to add to every request (merged with defaults).
+      - json_codec: JSON implementation for request/response bodies: "json" (stdlib),
+        "orjson", "msgspec", or "auto" (default) for the fastest one installed.
+      - typed_responses: Return compact ``iugupy.models`` objects (Invoice, Customer,
+        Plan, Subscription, PaymentMethod; list pages as ``ListPage``) instead of dicts.
+        Defaults to False.
+
+    Connection pooling:
+      - pool_connections: Number of per-host connection pools to keep. Defaults to 10.
+      - pool_maxsize: Maximum connections kept alive per host; size it to the number of
+        threads sharing the client. Defaults to 10.
+      - pool_block: When True, callers wait for a free pooled connection instead of
+        opening (and later discarding) extra ones. Defaults to False.
+      - tcp_keepalive: Enable TCP keep-alive probes on pooled sockets so idle connections
+        survive NAT/load balancer timeouts. Defaults to True.
+      - socket_options: Extra ``(level, option, value)`` tuples applied to every socket.
+      - warm_up_connections: Connections (DNS + TCP + TLS) to open to base_url when the
+        client is created. Defaults to 0 (no warm-up).
+      - direct_send: Send requests straight to the pooled connection adapter with a
+        precomputed header/auth template instead of going through
+        ``requests.Session.request`` on every call, which cuts client-side CPU per call.
+        Environment proxies/CA bundle are resolved once; cookies, redirects and later
+        changes to ``client.session`` headers or auth are not applied. Defaults to False.
+      - compression: A :class:`~iugupy.compression.CompressionPolicy`. Negotiates
+        compressed responses (gzip, plus brotli/zstd when their packages are installed)
+        and optionally gzips request bodies above a size threshold; bytes saved are
+        counted in ``client.compression_stats``. Defaults to None (the transport's
+        default ``Accept-Encoding``, uncompressed requests).
+
+    Resilience:
+      - retry: A :class:`RetryPolicy` to retry idempotent requests on connection errors,
+        429 and 5xx responses. Defaults to None (a single attempt).
+      - idempotency_keys: Send an ``Idempotency-Key`` header with every POST made by the
+        resources (creates, subscription actions). Keys are tracked in a journal: when an
+        attempt ends without a definitive answer (timeout, connection error, 5xx), calling
+        the same method again with the same payload reuses its key, so the API can
+        deduplicate it. Keyed POSTs are also retried by ``retry``. Defaults to False.
+      - idempotency_journal: The :class:`~iugupy.idempotency.IdempotencyJournal` to use,
+        e.g. a ``FileIdempotencyJournal`` that survives restarts. Setting it enables
+        ``idempotency_keys``. Defaults to an in-memory journal.
+      - circuit_breaker: A :class:`~iugupy.breaker.CircuitBreakerPolicy`. Endpoints whose
+        recent error rate crosses its threshold fail fast with ``IuguCircuitOpenError``
+        instead of waiting on a struggling API, then recover through half-open probes.
+        Defaults to None (disabled).
+      - adaptive_timeout: An :class:`~iugupy.latency.AdaptiveTimeout` deriving each
+        endpoint's timeout from its recent latency percentiles, capped by ``timeout``.
+        Defaults to None (``timeout`` is used for every request).
+      - hedging: A :class:`~iugupy.hedging.HedgingPolicy`. A resource GET still waiting
+        after its endpoint's latency percentile is raced against an identical second
+        request, within a budget of extra requests, to cut tail latency. Defaults to None.
+
+    Caching:
+      - cache_ttl: Per-resource TTL in seconds for ``get(id)`` results, keyed by resource
+        path (e.g. ``{"plans": 300, "customers": 30}``). Resources not listed are not
+        cached. Writes through the same client (update, delete, subscription actions,
+        payment method changes) invalidate the entry. Defaults to None (no caching).
+      - cache_max_entries: Capacity of the built-in LRU cache. Defaults to 1024.
+      - cache_backend: A :class:`CacheBackend` to use instead of the in-process LRU,
+        e.g. a shared store across workers.
+      - single_flight: Coalesce identical concurrent GETs (same path and params): while
+        one is in flight, other callers wait for it and share its decoded result instead
+        of sending their own request. Defaults to False.
+
+    Instrumentation:
+      - hooks: :class:`~iugupy.instrumentation.Hook` objects (e.g. a ``MetricsCollector``)
+        called before and after every HTTP attempt, retries included. More can be added
+        with ``client.add_hook``. Defaults to none, which adds no per-request overhead.
     """
 
     api_token: str
@@ -31,3 +108,24 @@ class IuguConfig:
     timeout: float = DEFAULT_TIMEOUT
     user_agent: str = DEFAULT_USER_AGENT
     extra_headers: Optional[Mapping[str, str]] = field(default=None)
+    json_codec: str = "auto"
+    typed_responses: bool = False
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE
+    pool_block: bool = False
+    tcp_keepalive: bool = True
+    socket_options: Optional[Sequence[Tuple[int, int, int]]] = field(default=None)
+    warm_up_connections: int = 0
+    direct_send: bool = False
+    compression: Optional[CompressionPolicy] = None
+    retry: Optional[RetryPolicy] = None
+    idempotency_keys: bool = False
+    idempotency_journal: Optional[IdempotencyJournal] = None
+    circuit_breaker: Optional[CircuitBreakerPolicy] = None
+    adaptive_timeout: Optional[AdaptiveTimeout] = None
+    hedging: Optional[HedgingPolicy] = None
+    cache_ttl: Optional[Mapping[str, float]] = field(default=None)
+    cache_max_entries: int = DEFAULT_CACHE_MAX_ENTRIES
+    cache_backend: Optional[CacheBackend] = field(default=None)
+    single_flight: bool = False
+    hooks: Sequence[Hook] = ()
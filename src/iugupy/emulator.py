@@ -0,0 +1,756 @@
+"""
+Local, stateful stand-in for the IUGU API, for load and soak testing.
+
+Implements the plans, customers (and payment methods), subscriptions and invoices
+endpoints used by the resources, keeps all data in memory, paginates list calls with
+``start``/``limit`` (with date filters and ``sortBy``) and can simulate latency,
+throttling (429) and server errors (5xx). It can also gzip responses for clients that
+accept it and throttle bandwidth, to measure compressed transfer; gzip request bodies are
+always accepted.
+
+In-process::
+
+    with IuguEmulator(latency="lognormal:20,0.5", error_rate=0.01) as emu:
+        client = IuguClient(IuguConfig(api_token="t", client_id="c", base_url=emu.base_url))
+
+From a shell: ``python -m iugupy.emulator --port 8080 --latency uniform:5,50``
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import gzip
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .cache import TTLCache
+
+
+MAX_PAGE_SIZE = 1000
+SERVER_ERROR_STATUSES = (500, 502, 503)
+READ_ONLY_FIELDS = frozenset(("id", "created_at", "updated_at"))
+# Idempotency-Key answers kept for replay: the most recent ones, for at most a day
+MAX_REPLAYS = 10_000
+REPLAY_TTL = 24 * 3600.0
+
+
+class Latency:
+    """
+    Response delay distribution, parsed from a spec string (values in milliseconds):
+
+      - ``"0"`` / ``"fixed:20"``: constant delay
+      - ``"uniform:5,50"``: uniform between the bounds
+      - ``"exponential:20"``: exponential with the given mean
+      - ``"lognormal:20,0.5"``: log-normal with the given median and sigma (long tail)
+    """
+
+    KINDS = ("fixed", "uniform", "exponential", "lognormal")
+
+    def __init__(self, spec: str = "0", rng: Optional[random.Random] = None) -> None:
+        kind, _, raw = spec.partition(":")
+        if not raw:
+            kind, raw = "fixed", kind
+        try:
+            args = [float(v) for v in raw.split(",")]
+        except ValueError:
+            raise ValueError(f"invalid latency spec {spec!r}") from None
+        expected = {"fixed": 1, "uniform": 2, "exponential": 1, "lognormal": 2}.get(kind)
+        if expected is None or len(args) != expected or any(a < 0 for a in args):
+            raise ValueError(
+                f"invalid latency spec {spec!r}, expected one of "
+                "fixed:MS, uniform:MIN,MAX, exponential:MEAN, lognormal:MEDIAN,SIGMA"
+            )
+        self.spec = spec
+        self._kind = kind
+        self._args = args
+        self._rng = rng or random.Random()
+
+    def sample(self) -> float:
+        """Next delay in seconds."""
+        a = self._args
+        if self._kind == "fixed":
+            ms = a[0]
+        elif self._kind == "uniform":
+            ms = self._rng.uniform(a[0], a[1])
+        elif self._kind == "exponential":
+            ms = self._rng.expovariate(1 / a[0]) if a[0] else 0.0
+        else:
+            ms = a[0] * math.exp(self._rng.gauss(0, a[1])) if a[0] else 0.0
+        return ms / 1000
+
+
+class EmulatorError(Exception):
+    def __init__(self, status: int, errors: Any) -> None:
+        super().__init__(status, errors)
+        self.status = status
+        self.errors = errors
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _parse_time(value: str) -> datetime:
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise EmulatorError(400, {"updated_since": ["formato inválido"]}) from None
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def _filter_rows(rows: Any, query: Mapping[str, str]) -> List[Dict[str, Any]]:
+    rows = list(rows)
+    if "updated_since" in query:
+        since = _parse_time(query["updated_since"])
+        rows = [row for row in rows if _parse_time(row["updated_at"]) >= since]
+    if "created_at_from" in query:
+        first = _parse_time(query["created_at_from"]).date()
+        rows = [row for row in rows if _parse_time(row["created_at"]).date() >= first]
+    if "created_at_to" in query:
+        last = _parse_time(query["created_at_to"]).date()
+        rows = [row for row in rows if _parse_time(row["created_at"]).date() <= last]
+    for name, direction in query.items():
+        if name.startswith("sortBy[") and name.endswith("]"):
+            field = name[len("sortBy[") : -1]
+            rows.sort(
+                # Rows without the field sort last and never compare their None to a value
+                key=lambda row: (row.get(field) is None, row.get(field)),
+                reverse=direction.lower() == "desc",
+            )
+    return rows
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex.upper()
+
+
+def _require(data: Mapping[str, Any], *fields: str) -> None:
+    missing = {f: ["não pode ficar em branco"] for f in fields if data.get(f) in (None, "", [])}
+    if missing:
+        raise EmulatorError(422, missing)
+
+
+def _require_any(data: Mapping[str, Any], *fields: str) -> None:
+    # Like the SDK's _require_any_of; the error is reported on the first field
+    if all(data.get(f) in (None, "", []) for f in fields):
+        raise EmulatorError(422, {fields[0]: ["não pode ficar em branco"]})
+
+
+class EmulatorState:
+    """
+    In-memory data behind the emulator. Every operation is atomic and returns shallow
+    copies, so responses can be serialized outside the lock (updates only ever replace
+    top-level values).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.plans: Dict[str, Dict[str, Any]] = {}
+        self.customers: Dict[str, Dict[str, Any]] = {}
+        self.payment_methods: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.subscriptions: Dict[str, Dict[str, Any]] = {}
+        self.invoices: Dict[str, Dict[str, Any]] = {}
+
+    def _table(self, resource: str) -> Dict[str, Dict[str, Any]]:
+        return getattr(self, resource)
+
+    @staticmethod
+    def _get(table: Mapping[str, Dict[str, Any]], object_id: str) -> Dict[str, Any]:
+        try:
+            return table[object_id]
+        except KeyError:
+            raise EmulatorError(404, "Not Found") from None
+
+    # ---- Generic CRUD ----
+    def list(
+        self, resource: str, start: int, limit: int, query: Optional[Mapping[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        One page of a resource. ``query`` may filter by ``updated_since`` (timestamp),
+        ``created_at_from``/``created_at_to`` (inclusive dates) and sort with
+        ``sortBy[field]=asc|desc``.
+        """
+        with self._lock:
+            rows: Any = self._table(resource).values()
+            if query:
+                rows = _filter_rows(rows, query)
+            page = [dict(row) for row in islice(rows, start, start + limit)]
+            return {"totalItems": len(rows), "items": page}
+
+    def get(self, resource: str, object_id: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._get(self._table(resource), object_id))
+
+    def create(self, resource: str, data: Mapping[str, Any]) -> Dict[str, Any]:
+        build = getattr(self, f"_build_{resource}")
+        data = {k: v for k, v in data.items() if k not in READ_ONLY_FIELDS}
+        with self._lock:
+            obj = build(data)
+            now = _now()
+            obj.setdefault("id", _new_id())
+            obj.update(created_at=now, updated_at=now)
+            self._table(resource)[obj["id"]] = obj
+            return dict(obj)
+
+    def update(self, resource: str, object_id: str, data: Mapping[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            obj = self._get(self._table(resource), object_id)
+            obj.update({k: v for k, v in data.items() if k not in READ_ONLY_FIELDS})
+            if resource == "invoices" and "items" in data:
+                obj.update(self._invoice_totals(obj["items"]))
+            obj["updated_at"] = _now()
+            return dict(obj)
+
+    def delete(self, resource: str, object_id: str) -> Dict[str, Any]:
+        with self._lock:
+            obj = self._get(self._table(resource), object_id)
+            del self._table(resource)[object_id]
+            if resource == "customers":
+                self.payment_methods.pop(object_id, None)
+            return obj  # no longer shared
+
+    # ---- Builders (run under the lock) ----
+    def _build_plans(self, data: Mapping[str, Any]) -> Dict[str, Any]:
+        _require(data, "name", "identifier", "interval", "interval_type")
+        if any(p["identifier"] == data["identifier"] for p in self.plans.values()):
+            raise EmulatorError(422, {"identifier": ["já está em uso"]})
+        return {**data, "prices": list(data.get("prices") or []), "features": []}
+
+    def _build_customers(self, data: Mapping[str, Any]) -> Dict[str, Any]:
+        _require(data, "email")
+        return {"name": None, "notes": None, "custom_variables": [], **data}
+
+    def _build_subscriptions(self, data: Mapping[str, Any]) -> Dict[str, Any]:
+        _require(data, "customer_id")
+        customer = self.customers.get(data["customer_id"])
+        if customer is None:
+            raise EmulatorError(422, {"customer": ["não encontrado"]})
+        plan = self._plan(data.get("plan_identifier"))
+        return {
+            "customer_name": customer.get("name"),
+            "customer_email": customer.get("email"),
+            "plan_name": plan.get("name") if plan else None,
+            "active": True,
+            "suspended": False,
+            "subitems": list(data.get("subitems") or []),
+            "recent_invoices": [],
+            **data,
+        }
+
+    def _build_invoices(self, data: Mapping[str, Any]) -> Dict[str, Any]:
+        _require(data, "due_date", "items")
+        _require_any(data, "email", "customer_id")
+        customer = self.customers.get(data.get("customer_id") or "")
+        if not data.get("email") and customer is not None:
+            data = {**data, "email": customer["email"]}
+        items = [{"id": _new_id(), **item} for item in data["items"]]
+        invoice_id = _new_id()
+        return {
+            "status": "pending",
+            "currency": "BRL",
+            "paid_at": None,
+            "secure_url": f"https://faturas.iugu.test/{invoice_id.lower()}",
+            **data,
+            "id": invoice_id,
+            "items": items,
+            **self._invoice_totals(items),
+        }
+
+    @staticmethod
+    def _invoice_totals(items: List[Mapping[str, Any]]) -> Dict[str, Any]:
+        total = sum(int(i.get("price_cents", 0)) * int(i.get("quantity", 1)) for i in items)
+        return {"total_cents": total, "items_total_cents": total}
+
+    def _plan(self, identifier: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not identifier:
+            return None
+        return next((p for p in self.plans.values() if p["identifier"] == identifier), None)
+
+    # ---- Payment methods ----
+    def list_payment_methods(self, customer_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._get(self.customers, customer_id)
+            return [dict(pm) for pm in self.payment_methods.get(customer_id, {}).values()]
+
+    def payment_method(
+        self, action: str, customer_id: str, pm_id: Optional[str], data: Mapping[str, Any]
+    ) -> Dict[str, Any]:
+        with self._lock:
+            customer = self._get(self.customers, customer_id)
+            methods = self.payment_methods.setdefault(customer_id, {})
+            if action == "create":
+                _require(data, "description", "token")
+                pm = {
+                    "id": _new_id(),
+                    "customer_id": customer_id,
+                    "description": data["description"],
+                    "item_type": "credit_card",
+                    "data": {"brand": "VISA", "display_number": "XXXX-XXXX-XXXX-1111"},
+                }
+                methods[pm["id"]] = pm
+                if data.get("set_as_default") or not customer.get("default_payment_method_id"):
+                    customer["default_payment_method_id"] = pm["id"]
+                return dict(pm)
+            pm = self._get(methods, pm_id or "")
+            if action == "delete":
+                del methods[pm["id"]]
+            elif action == "update":
+                if "description" in data:
+                    pm["description"] = data["description"]
+                if data.get("set_as_default"):
+                    customer["default_payment_method_id"] = pm["id"]
+            return dict(pm)
+
+    # ---- Subscription actions ----
+    def subscription_action(
+        self, subscription_id: str, action: str, plan_identifier: Optional[str]
+    ) -> Dict[str, Any]:
+        with self._lock:
+            sub = self._get(self.subscriptions, subscription_id)
+            if action in ("change_plan", "change_plan_simulation"):
+                plan = self._plan(plan_identifier)
+                if plan is None:
+                    raise EmulatorError(422, {"plan": ["não encontrado"]})
+                if action == "change_plan_simulation":
+                    return {
+                        "old_plan": sub.get("plan_identifier"),
+                        "new_plan": plan["identifier"],
+                        "expires_at": sub.get("expires_at"),
+                        "cost": 0,
+                    }
+                sub.update(plan_identifier=plan["identifier"], plan_name=plan.get("name"))
+            elif action == "activate":
+                sub.update(active=True, suspended=False)
+            elif action == "suspend":
+                sub.update(active=False, suspended=True)
+            else:
+                raise EmulatorError(404, "Not Found")
+            sub["updated_at"] = _now()
+            return dict(sub)
+
+    # ---- Bulk seeding ----
+    def seed(self, *, customers: int = 0, invoices: int = 0, plans: int = 0) -> None:
+        """Preload data, e.g. to exercise pagination over large lists."""
+        for i in range(plans):
+            self.create(
+                "plans",
+                {
+                    "name": f"Plan {i}",
+                    "identifier": f"plan-{i}",
+                    "interval": 1,
+                    "interval_type": "months",
+                },
+            )
+        for i in range(customers):
+            self.create("customers", {"email": f"customer{i}@example.com", "name": f"Customer {i}"})
+        for i in range(invoices):
+            self.create(
+                "invoices",
+                {
+                    "email": f"customer{i}@example.com",
+                    "due_date": "2030-12-31",
+                    "items": [{"description": "Service", "quantity": 1, "price_cents": 1990}],
+                },
+            )
+
+
+class _TokenBucket:
+    def __init__(self, rate: float) -> None:
+        self._rate = rate
+        self._tokens = rate
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._rate, self._tokens + (now - self._stamp) * self._rate)
+            self._stamp = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class EmulatorStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.statuses: Dict[int, int] = {}
+        self.injected = 0
+        self.replayed = 0  # POSTs answered from an earlier request with the same key
+
+    def record(self, status: int, injected: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if injected:
+                self.injected += 1
+
+    def record_replay(self) -> None:
+        with self._lock:
+            self.replayed += 1
+
+
+Route = Callable[..., Any]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without TCP_NODELAY every keep-alive
+    # response would stall on delayed ACKs (~40 ms)
+    disable_nagle_algorithm = True
+    server: _EmulatorServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.emulator.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    def do_POST(self) -> None:
+        self._handle()
+
+    def do_PUT(self) -> None:
+        self._handle()
+
+    def do_DELETE(self) -> None:
+        self._handle()
+
+    def _handle(self) -> None:
+        emu = self.server.emulator
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        emu._transfer(len(raw))
+
+        delay = emu.latency.sample()
+        if delay:
+            time.sleep(delay)
+
+        fault = emu._pick_fault()
+        if fault is not None:
+            status, headers, payload = fault
+            self._reply(status, payload, headers)
+            emu.stats.record(status, True)
+            return
+
+        key = self.headers.get("Idempotency-Key") if self.command == "POST" else None
+        if key:
+            status, payload = emu._replay_or_run(key, lambda: self._process(raw))
+        else:
+            status, payload = self._process(raw)
+        self._reply(status, payload)
+        emu.stats.record(status, False)
+
+    def _process(self, raw: bytes) -> Tuple[int, Any]:
+        emu = self.server.emulator
+        try:
+            if emu.api_token is not None and not self._authorized(emu.api_token):
+                raise EmulatorError(401, "Unauthorized")
+            encoding = self.headers.get("Content-Encoding", "identity").strip().lower()
+            if encoding == "gzip":
+                raw = gzip.decompress(raw)
+            elif encoding != "identity":
+                raise EmulatorError(415, f"unsupported Content-Encoding {encoding!r}")
+            data = json.loads(raw) if raw else {}
+            return 200, emu._dispatch(self.command, self.path, data)
+        except EmulatorError as exc:
+            return exc.status, {"errors": exc.errors}
+        except (ValueError, TypeError, OSError, EOFError) as exc:
+            return 400, {"errors": f"bad request: {exc}"}
+
+    def _authorized(self, token: str) -> bool:
+        expected = "Basic " + base64.b64encode(f"{token}:".encode()).decode()
+        return self.headers.get("Authorization") == expected
+
+    def _reply(
+        self, status: int, payload: Any, headers: Optional[Mapping[str, str]] = None
+    ) -> None:
+        emu = self.server.emulator
+        body = json.dumps(payload).encode()
+        gzipped = emu.compress and self._accepts_gzip()
+        if gzipped:
+            body = gzip.compress(body, compresslevel=6, mtime=0)
+        emu._transfer(len(body))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if emu.compress:
+            self.send_header("Vary", "Accept-Encoding")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _accepts_gzip(self) -> bool:
+        for coding in self.headers.get("Accept-Encoding", "").split(","):
+            name, _, params = coding.partition(";")
+            if name.strip().lower() in ("gzip", "*"):
+                return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+        return False
+
+
+class _EmulatorServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address: Tuple[str, int], emulator: IuguEmulator) -> None:
+        self.emulator = emulator
+        super().__init__(address, _Handler)
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients hanging up mid-response are routine under load (timeouts, hedging)
+        error = sys.exc_info()[1]
+        if isinstance(error, (BrokenPipeError, ConnectionResetError)) and not self.emulator.verbose:
+            return
+        super().handle_error(request, client_address)
+
+
+class IuguEmulator:
+    """
+    In-memory IUGU API served over HTTP/1.1 (keep-alive) from a background thread.
+
+    - latency: :class:`Latency` spec applied to every response, e.g. ``"uniform:5,50"``.
+    - error_rate: probability of answering with a random 500/502/503.
+    - throttle_rate: probability of answering 429 with ``Retry-After: retry_after``.
+    - rate_limit: requests per second above which requests get 429 (token bucket).
+    - api_token: when set, requests must carry it as Basic auth (401 otherwise).
+    - seed: random seed for reproducible latency and fault sequences.
+    - compress: gzip response bodies when the request's ``Accept-Encoding`` allows it.
+    - bandwidth: simulated link speed in bytes per second; each request and response
+      body is delayed by its size over the bandwidth (None: unlimited).
+
+    POSTs with an ``Idempotency-Key`` header already answered (non-5xx) get the same
+    response again without being applied twice; the last ``max_replays`` answers are kept,
+    for up to a day.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency: str = "0",
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        rate_limit: Optional[float] = None,
+        api_token: Optional[str] = None,
+        seed: Optional[int] = None,
+        state: Optional[EmulatorState] = None,
+        verbose: bool = False,
+        compress: bool = False,
+        bandwidth: Optional[float] = None,
+        max_replays: int = MAX_REPLAYS,
+    ) -> None:
+        for name, rate in (("error_rate", error_rate), ("throttle_rate", throttle_rate)):
+            if not 0 <= rate <= 1:
+                raise ValueError(f"{name} must be between 0 and 1")
+        if bandwidth is not None and bandwidth <= 0:
+            raise ValueError("bandwidth must be > 0")
+        self.compress = compress
+        self.bandwidth = bandwidth
+        self._rng = random.Random(seed)
+        self.latency = Latency(latency, random.Random(seed))
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._bucket = _TokenBucket(rate_limit) if rate_limit else None
+        self.api_token = api_token
+        self.state = state or EmulatorState()
+        self.stats = EmulatorStats()
+        self.verbose = verbose
+        self._address = (host, port)
+        self._server: Optional[_EmulatorServer] = None
+        self._thread: Optional[threading.Thread] = None
+        # Answers to POSTs carrying an Idempotency-Key, replayed for repeated keys
+        self._replays = TTLCache(max_replays)
+        # One lock per key being processed (with its number of waiters), so a repeated key
+        # waits for the first request's answer without serializing unrelated POSTs
+        self._key_locks: Dict[str, List[Any]] = {}
+        self._key_locks_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("emulator is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> IuguEmulator:
+        self._server = _EmulatorServer(self._address, self)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="iugupy-emulator", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def serve_forever(self) -> None:
+        self._server = _EmulatorServer(self._address, self)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def __enter__(self) -> IuguEmulator:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _transfer(self, size: int) -> None:
+        if self.bandwidth is not None and size:
+            time.sleep(size / self.bandwidth)
+
+    def _pick_fault(self) -> Optional[Tuple[int, Dict[str, str], Any]]:
+        if self._bucket is not None and not self._bucket.take():
+            return 429, {"Retry-After": f"{self.retry_after:g}"}, {"errors": "Too Many Requests"}
+        if not (self.throttle_rate or self.error_rate):
+            return None
+        roll = self._rng.random()
+        if roll < self.throttle_rate:
+            return 429, {"Retry-After": f"{self.retry_after:g}"}, {"errors": "Too Many Requests"}
+        if roll < self.throttle_rate + self.error_rate:
+            status = self._rng.choice(SERVER_ERROR_STATUSES)
+            return status, {}, {"errors": "Internal Server Error"}
+        return None
+
+    def _replay_or_run(self, key: str, run: Callable[[], Tuple[int, Any]]) -> Tuple[int, Any]:
+        with self._key_locks_lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                replay = self._replays.get(key)
+                if replay is not None:
+                    self.stats.record_replay()
+                    return replay
+                status, payload = run()
+                if status < 500:
+                    self._replays.set(key, (status, payload), REPLAY_TTL)
+                return status, payload
+        finally:
+            with self._key_locks_lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._key_locks[key]
+
+    def _dispatch(self, method: str, raw_path: str, data: Mapping[str, Any]) -> Any:
+        parts = urlsplit(raw_path)
+        segments = [s for s in parts.path.split("/") if s]
+        if segments[:1] == ["v1"]:
+            segments = segments[1:]
+        if not segments or segments[0] not in ("plans", "customers", "subscriptions", "invoices"):
+            raise EmulatorError(404, "Not Found")
+        resource, rest = segments[0], segments[1:]
+        state = self.state
+
+        if not rest:
+            if method == "GET":
+                query = parse_qs(parts.query)
+                start = max(int(query.get("start", ["0"])[0]), 0)
+                limit = min(max(int(query.get("limit", ["100"])[0]), 0), MAX_PAGE_SIZE)
+                filters = {k: v[0] for k, v in query.items() if k not in ("start", "limit")}
+                return state.list(resource, start, limit, filters)
+            if method == "POST":
+                return state.create(resource, data)
+        elif len(rest) == 1:
+            handlers: Dict[str, Route] = {
+                "GET": lambda: state.get(resource, rest[0]),
+                "PUT": lambda: state.update(resource, rest[0], data),
+                "DELETE": lambda: state.delete(resource, rest[0]),
+            }
+            if method in handlers:
+                return handlers[method]()
+        elif resource == "customers" and rest[1] == "payment_methods" and len(rest) <= 3:
+            customer_id, pm_id = rest[0], rest[2] if len(rest) == 3 else None
+            if pm_id is None and method == "GET":
+                return state.list_payment_methods(customer_id)
+            action = {"POST": "create", "GET": "get", "PUT": "update", "DELETE": "delete"}
+            if (pm_id is None) == (method == "POST"):
+                return state.payment_method(action[method], customer_id, pm_id, data)
+        elif resource == "subscriptions" and method == "POST" and len(rest) <= 3:
+            plan = rest[2] if len(rest) == 3 else None
+            return state.subscription_action(rest[0], rest[1], plan)
+        raise EmulatorError(404, "Not Found")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m iugupy.emulator", description="Local in-memory IUGU API emulator"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--latency",
+        default="0",
+        help="fixed:MS, uniform:MIN,MAX, exponential:MEAN or lognormal:MEDIAN,SIGMA",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 5xx responses")
+    parser.add_argument(
+        "--throttle-rate", type=float, default=0.0, help="fraction of 429 responses"
+    )
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After for 429s")
+    parser.add_argument("--rate-limit", type=float, help="requests per second before 429s")
+    parser.add_argument("--token", help="require this API token (default: accept any)")
+    parser.add_argument("--seed", type=int, help="random seed for latency and faults")
+    parser.add_argument(
+        "--compress", action="store_true", help="gzip responses for clients that accept it"
+    )
+    parser.add_argument("--bandwidth", type=float, help="simulated link speed in bytes/s")
+    parser.add_argument("--seed-invoices", type=int, default=0, help="preload N invoices")
+    parser.add_argument("--seed-customers", type=int, default=0, help="preload N customers")
+    parser.add_argument("--seed-plans", type=int, default=0, help="preload N plans")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    emulator = IuguEmulator(
+        args.host,
+        args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        rate_limit=args.rate_limit,
+        api_token=args.token,
+        seed=args.seed,
+        verbose=args.verbose,
+        compress=args.compress,
+        bandwidth=args.bandwidth,
+    )
+    emulator.state.seed(
+        customers=args.seed_customers, invoices=args.seed_invoices, plans=args.seed_plans
+    )
+    print(f"IUGU emulator listening on http://{args.host}:{args.port}/v1", flush=True)
+    try:
+        emulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
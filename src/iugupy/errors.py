@@ -37,3 +37,35 @@ class IuguValidationError(Exception):
 
     def __str__(self) -> str:  # pragma: no cover - simple formatting
         return f"IUGU Validation Error: {self.message}"
+
+
+@dataclass
+class IuguCircuitOpenError(Exception):
+    """Raised without sending the request while an endpoint's circuit breaker is open.
+
+    Attributes:
+        endpoint: The endpoint whose circuit is open, e.g. ``GET invoices/:id``.
+        retry_in: Seconds until the breaker lets probe requests through again.
+    """
+
+    endpoint: str
+    retry_in: float
+
+    def __str__(self) -> str:  # pragma: no cover - simple formatting
+        return f"IUGU circuit open for {self.endpoint} (retry in {self.retry_in:.1f}s)"
+
+
+@dataclass
+class IuguTenantBusyError(Exception):
+    """Raised when a tenant client has no free request slot within its acquire timeout.
+
+    Attributes:
+        client_id: The tenant's client id.
+        waited: Seconds spent waiting for a slot.
+    """
+
+    client_id: str
+    waited: float
+
+    def __str__(self) -> str:  # pragma: no cover - simple formatting
+        return f"IUGU tenant {self.client_id} is busy (no request slot after {self.waited:.1f}s)"
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .latency import DEFAULT_WINDOW, LatencyTracker
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+
+@dataclass(frozen=True)
+class HedgingPolicy:
+    """
+    Hedged GETs (set ``IuguConfig.hedging``).
+
+    When a GET made by a resource has not answered after the endpoint's ``percentile``
+    latency, an identical second request is sent; whichever answers first without a 5xx
+    status is returned and the other is cancelled (async) or discarded when it arrives
+    (sync). A 5xx is only returned when the other request fails as well. Endpoints
+    are hedged only once they have ``min_samples`` observed latencies, and at most
+    ``budget`` extra requests are sent per request made (e.g. 0.05 = 5% more traffic).
+
+    The synchronous client runs hedged GETs on a thread pool of ``max_workers``
+    threads, so each GET pays a thread hand-off while hedging is enabled.
+
+    Attributes:
+        percentile: Latency quantile after which the hedge is sent (0 < percentile <= 1).
+        min_delay: Lower bound of the hedge delay in seconds.
+        max_delay: Upper bound of the hedge delay in seconds, or None.
+        budget: Maximum ratio of hedge requests to hedgeable calls.
+        min_samples: Observed latencies needed before an endpoint is hedged.
+        window: Number of recent latencies kept per endpoint.
+        max_workers: Threads used by the synchronous client.
+    """
+
+    percentile: float = 0.95
+    min_delay: float = 0.005
+    max_delay: Optional[float] = None
+    budget: float = 0.05
+    min_samples: int = 50
+    window: int = DEFAULT_WINDOW
+    max_workers: int = 32
+
+    def __post_init__(self) -> None:
+        if not 0 < self.percentile <= 1:
+            raise ValueError("percentile must be in (0, 1]")
+        if not 0 <= self.budget <= 1:
+            raise ValueError("budget must be in [0, 1]")
+        if self.min_delay < 0 or self.max_workers < 2:
+            raise ValueError("require min_delay >= 0 and max_workers >= 2")
+
+
+@dataclass
+class HedgeStats:
+    calls: int = 0  # hedgeable calls (the endpoint had enough latency samples)
+    fired: int = 0  # hedge requests sent
+    won: int = 0  # hedges that answered first
+    denied: int = 0  # hedges skipped because the budget was spent
+
+    @property
+    def fire_ratio(self) -> float:
+        return self.fired / self.calls if self.calls else 0.0
+
+    @property
+    def win_ratio(self) -> float:
+        return self.won / self.fired if self.fired else 0.0
+
+
+class _HedgerBase:
+    def __init__(self, policy: HedgingPolicy, latency: LatencyTracker) -> None:
+        self.policy = policy
+        self._latency = latency
+        self._lock = threading.Lock()
+        self._stats: Dict[str, HedgeStats] = {}
+        self._calls = 0
+        self._fired = 0
+
+    def stats(self, endpoint: str) -> HedgeStats:
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = HedgeStats()
+            return stats
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "endpoint": e,
+                    "calls": s.calls,
+                    "fired": s.fired,
+                    "won": s.won,
+                    "denied": s.denied,
+                }
+                for e, s in sorted(self._stats.items())
+            ]
+
+    def _begin(self, endpoint: str) -> Tuple[Optional[HedgeStats], Optional[float]]:
+        """The endpoint's stats and hedge delay, or (None, None) when it is not hedged."""
+        policy = self.policy
+        window = self._latency.window(endpoint)
+        if len(window) < policy.min_samples:
+            return None, None
+        delay = window.percentile(policy.percentile)
+        if delay is None:
+            return None, None
+        delay = max(delay, policy.min_delay)
+        if policy.max_delay is not None:
+            delay = min(delay, policy.max_delay)
+        stats = self.stats(endpoint)
+        with self._lock:
+            stats.calls += 1
+            self._calls += 1
+        return stats, delay
+
+    def _allow(self, stats: HedgeStats) -> bool:
+        with self._lock:
+            if self._fired >= self.policy.budget * self._calls:
+                stats.denied += 1
+                return False
+            self._fired += 1
+            stats.fired += 1
+            return True
+
+
+def _server_error(response: Any) -> bool:
+    # A 5xx answer came from an unhealthy replica; the other request may still succeed
+    return getattr(response, "status_code", 0) >= 500
+
+
+def _discard(future: Future[Any]) -> None:
+    # Release the connection of a response nobody will read
+    if future.cancelled() or future.exception() is not None:
+        return
+    close = getattr(future.result(), "close", None)
+    if close is not None:
+        try:
+            close()
+        except Exception:
+            pass
+
+
+class Hedger(_HedgerBase):
+    """Runs a client's hedged GETs on a thread pool."""
+
+    def __init__(self, policy: HedgingPolicy, latency: LatencyTracker) -> None:
+        super().__init__(policy, latency)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        self.policy.max_workers, thread_name_prefix="iugupy-hedge"
+                    )
+        return self._executor
+
+    def run(self, endpoint: str, send: Callable[[], Any]) -> Any:
+        """Return the first response of ``send()``, hedged with a second call if slow."""
+        stats, delay = self._begin(endpoint)
+        if stats is None:
+            return send()
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        executor = self._get_executor()
+        primary = executor.submit(send)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._allow(stats):
+            return primary.result()
+
+        hedge = executor.submit(send)
+        winner: Optional[Future[Any]] = None
+        try:
+            pending = {primary, hedge}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    exc = future.exception()
+                    if exc is not None:
+                        error = error or exc
+                    elif _server_error(future.result()):
+                        winner = winner or future  # kept only if the other fails too
+                    else:
+                        winner = future
+                        if future is hedge:
+                            with self._lock:
+                                stats.won += 1
+                        return future.result()
+            if winner is not None:
+                return winner.result()
+            raise error  # type: ignore[misc]
+        finally:
+            for future in (primary, hedge):
+                if future is not winner and not future.cancel():
+                    future.add_done_callback(_discard)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class AsyncHedger(_HedgerBase):
+    """asyncio counterpart of :class:`Hedger`; the losing request is cancelled."""
+
+    async def run(self, endpoint: str, send: Callable[[], Awaitable[Any]]) -> Any:
+        import asyncio  # imported here so the sync client does not load asyncio
+
+        stats, delay = self._begin(endpoint)
+        if stats is None:
+            return await send()
+        primary = asyncio.ensure_future(send())
+        hedge: Optional[asyncio.Future[Any]] = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._allow(stats):
+                return await primary
+
+            hedge = asyncio.ensure_future(send())
+            pending = {primary, hedge}
+            error: Optional[BaseException] = None
+            failed: Optional[asyncio.Future[Any]] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    exc = task.exception()
+                    if exc is not None:
+                        error = error or exc
+                    elif _server_error(task.result()):
+                        failed = failed or task  # kept only if the other fails too
+                    else:
+                        if task is hedge:
+                            with self._lock:
+                                stats.won += 1
+                        return task.result()
+            if failed is not None:
+                return failed.result()
+            raise error  # type: ignore[misc]
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .errors import IuguAPIError
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+# How long a key whose outcome is unknown is offered again for the same request
+DEFAULT_IDEMPOTENCY_TTL = 24 * 60 * 60.0
+
+
+def request_fingerprint(
+    method: str, path: str, params: Optional[Mapping[str, Any]], body: Optional[Any]
+) -> str:
+    """Stable digest of a request: method, path, query params and canonical JSON body."""
+    canonical = json.dumps(
+        [method.upper(), path, params or {}, body],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def new_key() -> str:
+    return uuid.uuid4().hex
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "in_flight", "expires")
+
+    def __init__(self, fingerprint: str, in_flight: bool, expires: float) -> None:
+        self.fingerprint = fingerprint
+        self.in_flight = in_flight
+        self.expires = expires
+
+
+class IdempotencyJournal:
+    """
+    In-memory journal of idempotency keys whose request outcome is not yet known.
+
+    :meth:`begin` hands out the key for a request fingerprint: a key left over from an
+    earlier attempt of the same request that ended without a definitive answer (timeout,
+    connection error, 5xx) is reused, so the API can deduplicate the retry; otherwise a
+    new key is issued. :meth:`finish` drops the key once the API answered definitively
+    (any 2xx/4xx), or keeps it for ``ttl`` seconds when the outcome is unknown; keys
+    past their ``ttl`` are pruned on later calls, whatever their fingerprint.
+
+    Identical requests running concurrently each get their own key: only a request
+    that previously failed ambiguously is deduplicated.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_IDEMPOTENCY_TTL) -> None:
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}  # key -> entry
+        self._unknown: Dict[str, List[str]] = {}  # fingerprint -> reusable keys
+        self._expiry: Deque[Tuple[float, str]] = deque()  # (expires, key) in finish order
+        self.reused = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def pending(self) -> Dict[str, str]:
+        """Keys whose outcome is unknown (or still in flight), mapped to fingerprints."""
+        with self._lock:
+            return {key: e.fingerprint for key, e in self._entries.items()}
+
+    def begin(self, fingerprint: str) -> str:
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            keys = self._unknown.get(fingerprint)
+            while keys:
+                key = keys.pop()
+                entry = self._entries.get(key)
+                if entry is not None and entry.expires > now:
+                    entry.in_flight = True
+                    self.reused += 1
+                    break
+                self._entries.pop(key, None)
+            else:
+                key = new_key()
+                self._entries[key] = _Entry(fingerprint, True, now + self.ttl)
+            if not keys:
+                self._unknown.pop(fingerprint, None)
+            self._persist("begin", key, fingerprint)
+        return key
+
+    def finish(self, key: str, *, definitive: bool) -> None:
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            if definitive:
+                del self._entries[key]
+                self._persist("done", key, entry.fingerprint)
+            else:
+                entry.in_flight = False
+                entry.expires = now + self.ttl
+                self._unknown.setdefault(entry.fingerprint, []).append(key)
+                self._expiry.append((entry.expires, key))
+                self._persist("unknown", key, entry.fingerprint)
+
+    def _prune(self, now: float) -> None:
+        """Drop keys whose outcome stayed unknown past ``ttl``; called with the lock held."""
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= now:
+            expires, key = expiry.popleft()
+            entry = self._entries.get(key)
+            if entry is None or entry.in_flight or entry.expires != expires:
+                continue  # already gone, reused, or queued again by a later finish
+            del self._entries[key]
+            keys = self._unknown.get(entry.fingerprint)
+            if keys is not None and key in keys:
+                keys.remove(key)
+                if not keys:
+                    del self._unknown[entry.fingerprint]
+            self._persist("done", key, entry.fingerprint)
+
+    @contextmanager
+    def attempt(self, fingerprint: str) -> Iterator[str]:
+        """``begin`` a key, then ``finish`` it according to how the block exits."""
+        key = self.begin(fingerprint)
+        try:
+            yield key
+        except IuguAPIError as exc:
+            self.finish(key, definitive=exc.status_code < 500)
+            raise
+        except BaseException:
+            self.finish(key, definitive=False)
+            raise
+        self.finish(key, definitive=True)
+
+    def _persist(self, op: str, key: str, fingerprint: str) -> None:
+        """Hook for durable journals; called with the lock held."""
+
+
+class FileIdempotencyJournal(IdempotencyJournal):
+    """
+    :class:`IdempotencyJournal` persisted to an append-only JSON-lines file, so keys of
+    requests interrupted by a crash are reused after a restart. Requests that were in
+    flight when the process died are treated as having an unknown outcome. The file is
+    compacted to the live entries when it is opened, and again whenever it holds more
+    than twice as many records as live entries (and at least ``compact_after``).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike[str]],
+        ttl: float = DEFAULT_IDEMPOTENCY_TTL,
+        *,
+        compact_after: int = 1024,
+    ) -> None:
+        super().__init__(ttl)
+        self.path = Path(path)
+        self.compact_after = compact_after
+        self._records = 0  # lines in the file
+        self._load()
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def _load(self) -> None:
+        live: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line after a crash
+                    if record["op"] == "done":
+                        live.pop(record["key"], None)
+                    else:
+                        live[record["key"]] = record
+        now = time.time()
+        records = sorted(live.items(), key=lambda item: item[1].get("expires", now))
+        for key, record in records:
+            expires = record.get("expires", now)
+            if expires <= now:
+                continue
+            self._entries[key] = _Entry(record["fingerprint"], False, expires)
+            self._unknown.setdefault(record["fingerprint"], []).append(key)
+            self._expiry.append((expires, key))
+        self._rewrite()
+
+    def _rewrite(self) -> None:
+        """Replace the file with one record per live entry."""
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            for key, entry in self._entries.items():
+                fh.write(self._line("unknown", key, entry.fingerprint, entry.expires))
+        os.replace(tmp, self.path)
+        self._records = len(self._entries)
+
+    @staticmethod
+    def _line(op: str, key: str, fingerprint: str, expires: float) -> str:
+        record = {"op": op, "key": key, "fingerprint": fingerprint, "expires": expires}
+        return json.dumps(record, separators=(",", ":")) + "\n"
+
+    def _persist(self, op: str, key: str, fingerprint: str) -> None:
+        self._file.write(self._line(op, key, fingerprint, time.time() + self.ttl))
+        self._file.flush()
+        self._records += 1
+        if self._records > max(self.compact_after, 2 * len(self._entries)):
+            self._file.close()
+            self._rewrite()
+            self._file = self.path.open("a", encoding="utf-8")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
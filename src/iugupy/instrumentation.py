@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+# Upper bounds (seconds) of the latency histogram buckets, Prometheus style
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.15,
+    0.25,
+    0.35,
+    0.5,
+    0.75,
+    1.0,
+    1.5,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class RequestEvent:
+    """
+    One HTTP attempt as seen by hooks. A request retried by ``config.retry`` produces one
+    event per attempt (``attempt`` starts at 1).
+
+    ``elapsed`` (seconds) and ``status_code`` are set before ``after_response``/``on_error``
+    run; ``response_bytes`` is the Content-Length of the response when the server sent
+    one. ``context`` is a free-form dict hooks can use to pass data between callbacks.
+    """
+
+    __slots__ = (
+        "method",
+        "path",
+        "resource",
+        "url",
+        "attempt",
+        "request_bytes",
+        "status_code",
+        "response_bytes",
+        "elapsed",
+        "context",
+    )
+
+    def __init__(self, method: str, path: str, url: str, attempt: int, request_bytes: int) -> None:
+        self.method = method
+        self.path = path
+        self.resource = path.split("/", 1)[0].split("?", 1)[0]
+        self.url = url
+        self.attempt = attempt
+        self.request_bytes = request_bytes
+        self.status_code: Optional[int] = None
+        self.response_bytes: Optional[int] = None
+        self.elapsed = 0.0
+        self.context: Dict[str, Any] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"RequestEvent({self.method} {self.path!r}, attempt={self.attempt}, "
+            f"status={self.status_code}, elapsed={self.elapsed:.4f})"
+        )
+
+
+class Hook:
+    """
+    Base class for request hooks; override the callbacks you need.
+
+    Callbacks run synchronously on the calling thread (or event loop) for every attempt,
+    so they should be cheap. Exceptions raised by a hook propagate to the caller.
+    """
+
+    def before_request(self, event: RequestEvent) -> None:
+        pass
+
+    def after_response(self, event: RequestEvent, response: Any) -> None:
+        pass
+
+    def on_error(self, event: RequestEvent, error: BaseException) -> None:
+        pass
+
+
+def response_size(response: Any) -> Optional[int]:
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    length = headers.get("Content-Length") or headers.get("content-length")
+    try:
+        return int(length) if length is not None else None
+    except ValueError:
+        return None
+
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram with interpolated percentiles."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Estimate the ``q`` quantile (0 < q <= 1) by linear interpolation in its bucket."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                if index == len(self.bounds):
+                    return lower  # +Inf bucket: the best estimate is its lower bound
+                return lower + (self.bounds[index] - lower) * (rank - seen) / n
+            seen += n
+        return self.bounds[-1]
+
+
+class EndpointStats:
+    """Counters and latency histogram for one (resource, method) pair."""
+
+    __slots__ = ("calls", "errors", "statuses", "latency", "request_bytes", "response_bytes")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.statuses: Dict[str, int] = {}
+        self.latency = LatencyHistogram(buckets)
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+class MetricsCollector(Hook):
+    """
+    Built-in hook aggregating per resource/method call counts, error counts (exceptions
+    and HTTP status >= 400), payload sizes and latency histograms.
+
+    Read the numbers with :meth:`snapshot` (plain data, e.g. for OpenTelemetry observable
+    instruments) or :meth:`to_prometheus` (text exposition format).
+    """
+
+    def __init__(
+        self, *, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, prefix: str = "iugu"
+    ) -> None:
+        self._buckets = tuple(sorted(buckets))
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], EndpointStats] = {}
+
+    def after_response(self, event: RequestEvent, response: Any) -> None:
+        status = event.status_code
+        self._record(event, str(status), status is not None and status >= 400)
+
+    def on_error(self, event: RequestEvent, error: BaseException) -> None:
+        self._record(event, type(error).__name__, True)
+
+    def _record(self, event: RequestEvent, outcome: str, failed: bool) -> None:
+        key = (event.resource, event.method)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats(self._buckets)
+            stats.calls += 1
+            if failed:
+                stats.errors += 1
+            stats.statuses[outcome] = stats.statuses.get(outcome, 0) + 1
+            stats.latency.observe(event.elapsed)
+            stats.request_bytes += event.request_bytes
+            if event.response_bytes:
+                stats.response_bytes += event.response_bytes
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """One dict per (resource, method) with counters, percentiles and bucket counts."""
+        out: List[Dict[str, Any]] = []
+        with self._lock:
+            for (resource, method), stats in sorted(self._stats.items()):
+                hist = stats.latency
+                out.append(
+                    {
+                        "resource": resource,
+                        "method": method,
+                        "calls": stats.calls,
+                        "errors": stats.errors,
+                        "statuses": dict(stats.statuses),
+                        "request_bytes": stats.request_bytes,
+                        "response_bytes": stats.response_bytes,
+                        "latency_sum": hist.sum,
+                        "latency_buckets": list(zip(hist.bounds + (float("inf"),), hist.counts)),
+                        "p50": hist.percentile(0.50),
+                        "p95": hist.percentile(0.95),
+                        "p99": hist.percentile(0.99),
+                    }
+                )
+        return out
+
+    def get(self, resource: str, method: str) -> Optional[Mapping[str, Any]]:
+        """Snapshot entry for one resource and method, or None if nothing was recorded."""
+        for entry in self.snapshot():
+            if entry["resource"] == resource and entry["method"] == method.upper():
+                return entry
+        return None
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        p = self._prefix
+        entries = self.snapshot()
+        lines: List[str] = []
+
+        def family(name: str, kind: str) -> None:
+            lines.append(f"# TYPE {p}_{name} {kind}")
+
+        def labels(entry: Mapping[str, Any], **extra: str) -> str:
+            pairs = {"resource": entry["resource"], "method": entry["method"], **extra}
+            return ",".join(f'{k}="{v}"' for k, v in pairs.items())
+
+        family("requests_total", "counter")
+        for e in entries:
+            for outcome, n in sorted(e["statuses"].items()):
+                lines.append(f"{p}_requests_total{{{labels(e, status=outcome)}}} {n}")
+        for name, field in (
+            ("request_errors_total", "errors"),
+            ("request_bytes_total", "request_bytes"),
+            ("response_bytes_total", "response_bytes"),
+        ):
+            family(name, "counter")
+            lines.extend(f"{p}_{name}{{{labels(e)}}} {e[field]}" for e in entries)
+
+        family("request_duration_seconds", "histogram")
+        for e in entries:
+            cumulative = 0
+            for bound, n in e["latency_buckets"]:
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f"{p}_request_duration_seconds_bucket{{{labels(e, le=le)}}} {cumulative}"
+                )
+            lines.append(f"{p}_request_duration_seconds_sum{{{labels(e)}}} {e['latency_sum']}")
+            lines.append(f"{p}_request_duration_seconds_count{{{labels(e)}}} {e['calls']}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+DEFAULT_WINDOW = 500
+
+
+def endpoint_key(method: str, path: str) -> str:
+    """
+    Endpoint of a request: the method plus the path template, with ids replaced
+    (``GET invoices/:id``, ``POST subscriptions/:id/suspend``), so that list and get
+    calls of a resource are tracked apart.
+    """
+    segments = path.split("?", 1)[0].strip("/").split("/")
+    return f"{method} " + "/".join(s if i % 2 == 0 else ":id" for i, s in enumerate(segments))
+
+
+class LatencyWindow:
+    """
+    The last ``size`` latencies (seconds) of one endpoint, with percentiles.
+
+    Percentiles are computed from a sorted copy that is refreshed at most every
+    ``refresh_every`` new samples, so reading them on every request stays cheap.
+    """
+
+    def __init__(self, size: int = DEFAULT_WINDOW, refresh_every: int = 16) -> None:
+        if size <= 0:
+            raise ValueError("size must be positive")
+        self._size = size
+        self._refresh_every = max(refresh_every, 1)
+        self._samples: List[float] = []
+        self._next = 0
+        self._lock = threading.Lock()
+        self._sorted: List[float] = []
+        self._stale = 0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            if len(self._samples) < self._size:
+                self._samples.append(seconds)
+            else:
+                self._samples[self._next] = seconds
+                self._next = (self._next + 1) % self._size
+            self._stale += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank ``q`` quantile (0 < q <= 1) of the window, or None when empty."""
+        with self._lock:
+            # Small windows are re-sorted on every change, larger ones in batches
+            if self._stale and (
+                self._stale >= self._refresh_every or len(self._sorted) < self._refresh_every
+            ):
+                self._sorted = sorted(self._samples)
+                self._stale = 0
+            ordered = self._sorted
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, max(math.ceil(q * len(ordered)) - 1, 0))]
+
+
+class LatencyTracker:
+    """
+    Per-endpoint latency windows of a client: non-5xx responses, plus timed-out attempts
+    counted as the time they waited.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self._window = window
+        self._lock = threading.Lock()
+        self._windows: Dict[str, LatencyWindow] = {}
+
+    def window(self, endpoint: str) -> LatencyWindow:
+        window = self._windows.get(endpoint)
+        if window is None:
+            with self._lock:
+                window = self._windows.setdefault(endpoint, LatencyWindow(self._window))
+        return window
+
+    def observe(self, endpoint: str, seconds: float) -> None:
+        self.window(endpoint).observe(seconds)
+
+    def percentile(self, endpoint: str, q: float) -> Optional[float]:
+        window = self._windows.get(endpoint)
+        return window.percentile(q) if window is not None else None
+
+    def endpoints(self) -> List[str]:
+        return sorted(self._windows)
+
+
+@dataclass(frozen=True)
+class AdaptiveTimeout:
+    """
+    Derive each endpoint's timeout from its recent latency (``IuguConfig.adaptive_timeout``).
+
+    The timeout is ``percentile`` latency times ``multiplier``, clamped to
+    ``[min_timeout, max_timeout]``. ``max_timeout`` defaults to ``IuguConfig.timeout``,
+    which is also used until an endpoint has ``min_samples`` observations. A timeout
+    passed explicitly to ``request()`` always wins.
+
+    Attributes:
+        percentile: Latency quantile the timeout is based on (0 < percentile <= 1).
+        multiplier: Headroom applied to that latency.
+        min_timeout: Lower bound in seconds.
+        max_timeout: Upper bound in seconds, or None for ``IuguConfig.timeout``.
+        min_samples: Observations needed before the timeout adapts.
+        window: Number of recent latencies kept per endpoint.
+    """
+
+    percentile: float = 0.99
+    multiplier: float = 3.0
+    min_timeout: float = 1.0
+    max_timeout: Optional[float] = None
+    min_samples: int = 50
+    window: int = DEFAULT_WINDOW
+
+    def __post_init__(self) -> None:
+        if not 0 < self.percentile <= 1:
+            raise ValueError("percentile must be in (0, 1]")
+        if self.multiplier <= 0 or self.min_timeout <= 0:
+            raise ValueError("multiplier and min_timeout must be positive")
+
+    def timeout_for(self, window: Optional[LatencyWindow], default: float) -> float:
+        upper = self.max_timeout if self.max_timeout is not None else default
+        if window is None or len(window) < self.min_samples:
+            return upper
+        latency = window.percentile(self.percentile)
+        if latency is None:
+            return upper
+        return min(max(latency * self.multiplier, self.min_timeout), upper)
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .client import IuguClient
+from .errors import IuguValidationError
+from .resources.base import DEFAULT_PAGE_SIZE, BaseResource
+
+
+# Columns copied out of each object so they can be filtered and indexed; the full object
+# is always kept as JSON in `data`.
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "customers": ("email", "name"),
+    "invoices": ("status", "customer_id", "email", "due_date", "total_cents"),
+    "subscriptions": ("customer_id", "plan_identifier", "active", "suspended"),
+    "plans": ("identifier", "name"),
+}
+# Resources whose list endpoint supports `updated_since`; the others are reloaded in
+# full on every sync (plans are few).
+INCREMENTAL = frozenset(("customers", "invoices", "subscriptions"))
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_OVERLAP = 300.0  # seconds re-read before the cursor on each incremental sync
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    resource TEXT PRIMARY KEY,
+    cursor TEXT,
+    synced_at REAL NOT NULL,
+    full_synced_at REAL NOT NULL,
+    generation INTEGER NOT NULL
+)
+"""
+
+
+@dataclass
+class SyncResult:
+    """Outcome of syncing one resource."""
+
+    resource: str
+    full: bool
+    fetched: int = 0
+    deleted: int = 0
+    pages: int = 0
+    cursor: Optional[str] = None
+    elapsed: float = 0.0
+
+
+class Mirror:
+    """
+    Local SQLite copy of an account's customers, invoices, subscriptions and plans.
+
+    The first :meth:`sync` of a resource pages through its whole list endpoint; later
+    ones only request objects changed since the stored cursor (``updated_since``), so
+    repeated reads become local queries instead of paging the API. Rows are upserted in
+    batches of ``batch_size`` per transaction and the database runs in WAL mode, so
+    readers (dashboards, other processes) are never blocked by a sync.
+
+    The cursor is the newest ``updated_at`` seen minus ``overlap`` seconds, so objects
+    updated while a sync was paging are picked up by the next one. Incremental syncs do
+    not see deletions; ``sync(full=True)`` reloads a resource and drops rows that are
+    gone from the API.
+
+    Each resource is a table with ``id``, ``updated_at``, the columns in
+    :data:`COLUMNS` and ``data`` (the object as JSON). :meth:`get`, :meth:`find` and
+    :meth:`count` cover common lookups; :attr:`connection` allows any SQL. Like any
+    ``sqlite3`` connection it belongs to the thread that created the mirror; other
+    threads or processes should open their own connection to the same file.
+    """
+
+    def __init__(
+        self,
+        client: IuguClient,
+        path: Union[str, os.PathLike[str]],
+        *,
+        resources: Sequence[str] = tuple(COLUMNS),
+        page_size: int = DEFAULT_PAGE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        overlap: float = DEFAULT_OVERLAP,
+    ) -> None:
+        unknown = [r for r in resources if r not in COLUMNS]
+        if unknown:
+            raise IuguValidationError(f"cannot mirror {', '.join(unknown)}")
+        if page_size <= 0 or batch_size <= 0:
+            raise IuguValidationError("page_size and batch_size must be positive integers")
+        self.client = client
+        self.resources = tuple(resources)
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.overlap = overlap
+        self._codec = client.codec
+        self._conn = sqlite3.connect(os.fspath(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(_SCHEMA)
+            for resource in self.resources:
+                self._create_table(resource)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self._conn
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "Mirror":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _create_table(self, resource: str) -> None:
+        columns = "".join(f", {c}" for c in COLUMNS[resource])
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {resource} (id TEXT PRIMARY KEY, updated_at TEXT"
+            f"{columns}, data TEXT NOT NULL, generation INTEGER NOT NULL)"
+        )
+        for column in ("updated_at", *COLUMNS[resource]):
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {resource}_{column} ON {resource} ({column})"
+            )
+
+    # ---- Sync ----
+    def sync(
+        self, resources: Optional[Iterable[str]] = None, *, full: bool = False
+    ) -> Dict[str, SyncResult]:
+        """Bring the mirrored resources (or only ``resources``) up to date."""
+        selected = self.resources if resources is None else tuple(resources)
+        unknown = [r for r in selected if r not in self.resources]
+        if unknown:
+            raise IuguValidationError(f"not mirrored: {', '.join(unknown)}")
+        return {resource: self._sync_one(resource, full) for resource in selected}
+
+    def cursor(self, resource: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT cursor FROM sync_state WHERE resource = ?", (resource,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _sync_one(self, resource: str, full: bool) -> SyncResult:
+        started = time.perf_counter()
+        state = self._conn.execute(
+            "SELECT cursor, full_synced_at, generation FROM sync_state WHERE resource = ?",
+            (resource,),
+        ).fetchone()
+        cursor, full_synced_at, generation = state or (None, 0.0, 0)
+        full = full or state is None or resource not in INCREMENTAL
+        if full:
+            # Rows not seen again by a full load (deleted upstream) keep the old generation
+            generation += 1
+        params = {} if full or not cursor else {"updated_since": cursor}
+
+        result = SyncResult(resource, full)
+        newest: Optional[str] = None
+        upsert = self._upsert_sql(resource)
+        batch: List[Tuple[Any, ...]] = []
+        for page in self._pages(getattr(self.client, resource), params):
+            result.pages += 1
+            for item in page:
+                if not isinstance(item, Mapping) or not item.get("id"):
+                    continue
+                result.fetched += 1
+                updated_at = item.get("updated_at")
+                if isinstance(updated_at, str) and (newest is None or updated_at > newest):
+                    newest = updated_at
+                batch.append(self._row(resource, item, generation))
+                if len(batch) >= self.batch_size:
+                    self._write(upsert, batch)
+        if batch:
+            self._write(upsert, batch)
+
+        now = time.time()
+        if newest is not None:
+            cursor = self._next_cursor(newest)
+        with self._conn:
+            if full:
+                result.deleted = self._conn.execute(
+                    f"DELETE FROM {resource} WHERE generation != ?", (generation,)
+                ).rowcount
+                full_synced_at = now
+            self._conn.execute(
+                "INSERT INTO sync_state (resource, cursor, synced_at, full_synced_at, generation)"
+                " VALUES (?, ?, ?, ?, ?) ON CONFLICT(resource) DO UPDATE SET"
+                " cursor = excluded.cursor, synced_at = excluded.synced_at,"
+                " full_synced_at = excluded.full_synced_at, generation = excluded.generation",
+                (resource, cursor, now, full_synced_at, generation),
+            )
+        result.cursor = cursor
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def _pages(self, resource: BaseResource, params: Mapping[str, Any]) -> Iterator[List[Any]]:
+        start = 0
+        while True:
+            page = resource._list_page(params, start, self.page_size, raw=True)
+            items, more = resource._split_page(page, self.page_size, start)
+            yield items
+            if not more:
+                return
+            start += len(items)
+
+    def _upsert_sql(self, resource: str) -> str:
+        columns = ("id", "updated_at", *COLUMNS[resource], "data", "generation")
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns[1:])
+        return (
+            f"INSERT INTO {resource} ({', '.join(columns)})"
+            f" VALUES ({', '.join('?' * len(columns))})"
+            f" ON CONFLICT(id) DO UPDATE SET {updates}"
+        )
+
+    def _row(self, resource: str, item: Mapping[str, Any], generation: int) -> Tuple[Any, ...]:
+        values = [item.get(c) for c in COLUMNS[resource]]
+        # SQLite only stores scalars; nested values stay in `data`
+        values = [v if v is None or isinstance(v, (str, int, float)) else None for v in values]
+        data = self._codec.dumps(item).decode("utf-8")
+        return (str(item["id"]), item.get("updated_at"), *values, data, generation)
+
+    def _write(self, sql: str, batch: List[Tuple[Any, ...]]) -> None:
+        with self._conn:
+            self._conn.executemany(sql, batch)
+        batch.clear()
+
+    def _next_cursor(self, newest: str) -> str:
+        try:
+            moment = datetime.fromisoformat(newest)
+        except ValueError:
+            return newest
+        return (moment - timedelta(seconds=self.overlap)).isoformat(timespec="seconds")
+
+    # ---- Reads ----
+    def get(self, resource: str, object_id: str) -> Optional[Any]:
+        """The mirrored object, or None when it is not in the mirror."""
+        self._check(resource)
+        row = self._conn.execute(
+            f"SELECT data FROM {resource} WHERE id = ?", (object_id,)
+        ).fetchone()
+        return self._codec.loads(row[0].encode("utf-8")) if row else None
+
+    def find(
+        self, resource: str, *, limit: Optional[int] = None, order_by: str = "id", **filters: Any
+    ) -> List[Any]:
+        """Mirrored objects whose indexed columns equal ``filters`` (e.g. ``status="paid"``)."""
+        where, args = self._where(resource, filters)
+        if order_by.lstrip("-") not in ("id", "updated_at", *COLUMNS[resource]):
+            raise IuguValidationError(f"cannot order {resource} by {order_by!r}")
+        direction = " DESC" if order_by.startswith("-") else ""
+        sql = f"SELECT data FROM {resource}{where} ORDER BY {order_by.lstrip('-')}{direction}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        loads = self._codec.loads
+        return [loads(row[0].encode("utf-8")) for row in self._conn.execute(sql, args)]
+
+    def count(self, resource: str, **filters: Any) -> int:
+        where, args = self._where(resource, filters)
+        return self._conn.execute(f"SELECT COUNT(*) FROM {resource}{where}", args).fetchone()[0]
+
+    def _check(self, resource: str) -> None:
+        if resource not in self.resources:
+            raise IuguValidationError(f"not mirrored: {resource}")
+
+    def _where(self, resource: str, filters: Mapping[str, Any]) -> Tuple[str, List[Any]]:
+        self._check(resource)
+        allowed = ("id", *COLUMNS[resource])
+        bad = [name for name in filters if name not in allowed]
+        if bad:
+            raise IuguValidationError(
+                f"cannot filter {resource} by {', '.join(bad)} (indexed: {', '.join(allowed)})"
+            )
+        if not filters:
+            return "", []
+        return " WHERE " + " AND ".join(f"{name} = ?" for name in filters), list(filters.values())
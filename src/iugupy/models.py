@@ -0,0 +1,316 @@
+"""
+Compact typed response models.
+
+Enabled with ``IuguConfig(typed_responses=True)``; dicts remain the default. Models use
+``__slots__`` (no per-instance ``__dict__``), keep API fields they do not declare in a
+small ``extra`` mapping, and decode nested lists such as invoice ``items`` only when the
+attribute is first read.
+"""
+
+from __future__ import annotations
+
+from typing import Any, ClassVar, Dict, Generic, List, Mapping, Optional, Tuple, Type, TypeVar
+
+M = TypeVar("M", bound="Model")
+
+
+class _LazyList(Generic[M]):
+    """
+    Descriptor for a nested list of models decoded on first access.
+
+    The raw list of dicts is kept in a slot until the attribute is read; it is then
+    replaced by a tuple of models (the tuple type marks the slot as decoded).
+    """
+
+    def __init__(self, model: Type[M]) -> None:
+        self._model = model
+        self._slot = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._slot = f"_{name}"
+
+    def __get__(self, obj: Optional[Model], objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        value = getattr(obj, self._slot)
+        if isinstance(value, list):
+            value = tuple(self._model.from_dict(v) if isinstance(v, Mapping) else v for v in value)
+            setattr(obj, self._slot, value)
+        return value
+
+    def __set__(self, obj: Model, value: Any) -> None:
+        setattr(obj, self._slot, value)
+
+
+class Model:
+    """
+    Base class for response models.
+
+    Subclasses list the API fields they store in ``_fields`` (one slot each, or a
+    ``_LazyList`` descriptor backed by a ``_<name>`` slot). Declared fields missing from
+    the response read as None; unknown keys are kept in ``extra`` and are also readable
+    as attributes.
+    """
+
+    __slots__ = ("extra",)
+    _fields: ClassVar[Tuple[str, ...]] = ()
+    _field_set: ClassVar[frozenset[str]] = frozenset()
+    _lazy: ClassVar[frozenset[str]] = frozenset()
+    _storage: ClassVar[Tuple[Tuple[str, str], ...]] = ()  # (api field, slot) pairs
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls._fields)
+        cls._lazy = frozenset(
+            name for name in cls._fields if isinstance(cls.__dict__.get(name), _LazyList)
+        )
+        cls._storage = tuple(
+            (name, f"_{name}" if name in cls._lazy else name) for name in cls._fields
+        )
+
+    @classmethod
+    def from_dict(cls: Type[M], data: Mapping[str, Any]) -> M:
+        obj = cls.__new__(cls)
+        setter = object.__setattr__
+        for name, slot in cls._storage:
+            setter(obj, slot, data.get(name))
+        fields = cls._field_set
+        obj.extra = {k: v for k, v in data.items() if k not in fields} or None
+        return obj
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called when normal lookup fails: expose undeclared API fields
+        extra = object.__getattribute__(self, "extra")
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """dict-style access, convenient when migrating code written for dict responses."""
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict (nested models included), e.g. for serialization."""
+        out: Dict[str, Any] = {}
+        for name, slot in self._storage:
+            value = getattr(self, slot)
+            if isinstance(value, tuple):
+                value = [v.to_dict() if isinstance(v, Model) else v for v in value]
+            out[name] = value
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()  # type: ignore[attr-defined]
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r})"
+
+
+class Variable(Model):
+    __slots__ = ("id", "variable", "value")
+    _fields = __slots__
+
+
+class CustomVariable(Model):
+    __slots__ = ("id", "name", "value")
+    _fields = __slots__
+
+
+class Log(Model):
+    __slots__ = ("id", "description", "notes", "created_at")
+    _fields = __slots__
+
+
+class InvoiceItem(Model):
+    __slots__ = (
+        "id",
+        "description",
+        "quantity",
+        "price_cents",
+        "price",
+        "created_at",
+        "updated_at",
+    )
+    _fields = __slots__
+
+
+class Invoice(Model):
+    __slots__ = (
+        "id",
+        "status",
+        "due_date",
+        "currency",
+        "email",
+        "customer_id",
+        "customer_name",
+        "total_cents",
+        "total",
+        "items_total_cents",
+        "paid_cents",
+        "discount_cents",
+        "tax_cents",
+        "paid_at",
+        "payable_with",
+        "secure_id",
+        "secure_url",
+        "notification_url",
+        "return_url",
+        "order_id",
+        "created_at",
+        "created_at_iso",
+        "updated_at",
+        "_items",
+        "_variables",
+        "_custom_variables",
+        "_logs",
+    )
+    _fields = tuple(name.lstrip("_") for name in __slots__)
+    items: _LazyList[InvoiceItem] = _LazyList(InvoiceItem)
+    variables: _LazyList[Variable] = _LazyList(Variable)
+    custom_variables: _LazyList[CustomVariable] = _LazyList(CustomVariable)
+    logs: _LazyList[Log] = _LazyList(Log)
+
+
+class Customer(Model):
+    __slots__ = (
+        "id",
+        "email",
+        "name",
+        "notes",
+        "cpf_cnpj",
+        "cc_emails",
+        "phone_prefix",
+        "phone",
+        "zip_code",
+        "street",
+        "number",
+        "complement",
+        "district",
+        "city",
+        "state",
+        "default_payment_method_id",
+        "proxy_payments_from_customer_id",
+        "created_at",
+        "updated_at",
+        "_custom_variables",
+    )
+    _fields = tuple(name.lstrip("_") for name in __slots__)
+    custom_variables: _LazyList[CustomVariable] = _LazyList(CustomVariable)
+
+
+class PlanPrice(Model):
+    __slots__ = ("id", "currency", "value_cents", "plan_id", "created_at", "updated_at")
+    _fields = __slots__
+
+
+class PlanFeature(Model):
+    __slots__ = ("id", "identifier", "name", "value", "created_at", "updated_at")
+    _fields = __slots__
+
+
+class Plan(Model):
+    __slots__ = (
+        "id",
+        "name",
+        "identifier",
+        "interval",
+        "interval_type",
+        "payable_with",
+        "created_at",
+        "updated_at",
+        "_prices",
+        "_features",
+    )
+    _fields = tuple(name.lstrip("_") for name in __slots__)
+    prices: _LazyList[PlanPrice] = _LazyList(PlanPrice)
+    features: _LazyList[PlanFeature] = _LazyList(PlanFeature)
+
+
+class SubscriptionItem(Model):
+    __slots__ = ("id", "description", "quantity", "price_cents", "recurrent", "total")
+    _fields = __slots__
+
+
+class RecentInvoice(Model):
+    __slots__ = ("id", "due_date", "status", "total", "secure_url")
+    _fields = __slots__
+
+
+class Subscription(Model):
+    __slots__ = (
+        "id",
+        "customer_id",
+        "customer_name",
+        "customer_email",
+        "plan_identifier",
+        "plan_name",
+        "price_cents",
+        "currency",
+        "active",
+        "suspended",
+        "in_trial",
+        "expires_at",
+        "cycled_at",
+        "credits",
+        "credits_based",
+        "payable_with",
+        "created_at",
+        "updated_at",
+        "_subitems",
+        "_recent_invoices",
+        "_custom_variables",
+        "_logs",
+    )
+    _fields = tuple(name.lstrip("_") for name in __slots__)
+    subitems: _LazyList[SubscriptionItem] = _LazyList(SubscriptionItem)
+    recent_invoices: _LazyList[RecentInvoice] = _LazyList(RecentInvoice)
+    custom_variables: _LazyList[CustomVariable] = _LazyList(CustomVariable)
+    logs: _LazyList[Log] = _LazyList(Log)
+
+
+class PaymentMethod(Model):
+    __slots__ = ("id", "description", "item_type", "customer_id", "data")
+    _fields = __slots__
+
+
+class ListPage(Generic[M]):
+    """One page of a list endpoint: ``totalItems`` and the page's items as models."""
+
+    __slots__ = ("total_items", "items")
+
+    def __init__(self, total_items: Optional[int], items: List[M]) -> None:
+        self.total_items = total_items
+        self.items = items
+
+    def __iter__(self) -> Any:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __repr__(self) -> str:
+        return f"ListPage(total_items={self.total_items!r}, items={len(self.items)})"
+
+
+def to_model(model: Type[M], data: Any) -> Any:
+    """Convert a decoded response into ``model`` instances, leaving other shapes as-is."""
+    if isinstance(data, Mapping):
+        if "items" in data and ("totalItems" in data or len(data) == 1):
+            items = data["items"] or []
+            return ListPage(
+                data.get("totalItems"),
+                [model.from_dict(v) if isinstance(v, Mapping) else v for v in items],
+            )
+        return model.from_dict(data)
+    if isinstance(data, list):
+        return [model.from_dict(v) if isinstance(v, Mapping) else v for v in data]
+    return data
@@ -0,0 +1,344 @@
+"""
+Streaming reconciliation of IUGU invoices against a local ledger.
+
+Both sides are read as streams sorted by invoice id and merged in one pass, so memory
+stays constant however many invoices there are::
+
+    for record in reconcile(iter_invoices(client), csv_ledger("ledger.csv")):
+        if record.kind != MATCHED:
+            print(record.kind, record.id, record.fields)
+
+Large accounts are split into date partitions reconciled in parallel by
+:func:`reconcile_partitions`, each with its own slice of the ledger.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+import queue
+import threading
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .client import IuguClient
+from .errors import IuguValidationError
+from .resources.base import DEFAULT_PAGE_SIZE
+
+
+MATCHED = "matched"
+MISSING = "missing"  # in the ledger, not in IUGU
+EXTRA = "extra"  # in IUGU, not in the ledger
+MISMATCH = "mismatch"  # in both, with different compared fields
+DUPLICATE = "duplicate"  # a further ledger row with an id already seen
+
+# IUGU invoice field -> ledger field compared for every matched pair
+DEFAULT_FIELDS: Mapping[str, str] = {"total_cents": "total_cents", "status": "status"}
+
+
+@dataclass(frozen=True)
+class Partition:
+    """Invoices created from ``start`` up to, but excluding, ``end``."""
+
+    start: date
+    end: date
+
+    def contains(self, value: Any) -> bool:
+        """Whether a ``YYYY-MM-DD...`` date or timestamp falls in the partition."""
+        day = str(value)[:10]
+        return self.start.isoformat() <= day < self.end.isoformat()
+
+    def params(self) -> Dict[str, str]:
+        """List filters selecting the partition's invoices."""
+        return {
+            "created_at_from": self.start.isoformat(),
+            "created_at_to": (self.end - timedelta(days=1)).isoformat(),
+        }
+
+
+def date_partitions(start: date, end: date, days: int = 1) -> List[Partition]:
+    """Consecutive partitions of ``days`` days covering ``[start, end)``."""
+    if days <= 0:
+        raise IuguValidationError("days must be a positive integer")
+    partitions = []
+    while start < end:
+        stop = min(start + timedelta(days=days), end)
+        partitions.append(Partition(start, stop))
+        start = stop
+    return partitions
+
+
+@dataclass(frozen=True)
+class ReconRecord:
+    """
+    One reconciliation outcome. ``invoice`` and ``ledger`` are the rows from each side
+    (None for the side the id is absent from); ``fields`` lists the IUGU fields that
+    differ for a mismatch. A duplicate carries only the repeated ledger row.
+    """
+
+    kind: str
+    id: str
+    invoice: Optional[Mapping[str, Any]] = None
+    ledger: Optional[Mapping[str, Any]] = None
+    fields: Tuple[str, ...] = ()
+    partition: Optional[Partition] = None
+
+
+@dataclass
+class ReconSummary:
+    matched: int = 0
+    missing: int = 0
+    extra: int = 0
+    mismatch: int = 0
+    duplicate: int = 0
+    mismatched_fields: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, record: ReconRecord) -> None:
+        setattr(self, record.kind, getattr(self, record.kind) + 1)
+        for name in record.fields:
+            self.mismatched_fields[name] = self.mismatched_fields.get(name, 0) + 1
+
+    @property
+    def clean(self) -> bool:
+        return not (self.missing or self.extra or self.mismatch or self.duplicate)
+
+
+# ---- Sources ----
+def iter_invoices(
+    client: IuguClient,
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    partition: Optional[Partition] = None,
+    **params: Any,
+) -> Iterator[Mapping[str, Any]]:
+    """
+    Stream invoices sorted by id (``sortBy[id]=asc``), one page in memory at a time.
+
+    Pages are offset-based: invoices created while a partition is read can shift its
+    pages, so reconcile closed periods (partitions in the past).
+    """
+    resource = client.invoices
+    params = {**params, "sortBy[id]": "asc"}
+    if partition is not None:
+        params.update(partition.params())
+    start = 0
+    while True:
+        page = resource._list_page(params, start, page_size, raw=True)
+        items, more = resource._split_page(page, page_size, start)
+        yield from items
+        if not more:
+            return
+        start += len(items)
+
+
+def csv_ledger(
+    path: Union[str, os.PathLike[str]],
+    *,
+    where: Optional[Callable[[Mapping[str, str]], bool]] = None,
+    **reader_options: Any,
+) -> Iterator[Mapping[str, str]]:
+    """
+    Stream the rows of a CSV ledger with a header line, sorted by invoice id. ``where``
+    keeps only matching rows, e.g. those of a partition.
+    """
+    with open(path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh, **reader_options):
+            if where is None or where(row):
+                yield row
+
+
+def sql_ledger(cursor: Any, *, batch_size: int = 1000) -> Iterator[Mapping[str, Any]]:
+    """
+    Stream the rows of an executed DB-API cursor (``... ORDER BY id``) as dicts, fetching
+    ``batch_size`` rows at a time.
+    """
+    names = [column[0] for column in cursor.description]
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        for row in rows:
+            yield dict(zip(names, row))
+
+
+# ---- Merge ----
+def _normalize(value: Any) -> Optional[str]:
+    # Ledgers read from CSV hold strings: compare "1990" and 1990, "Paid" and "paid" alike
+    return None if value is None else str(value).strip().lower()
+
+
+def _sorted_by_id(
+    rows: Iterable[Mapping[str, Any]], key: str, side: str, skip_repeats: bool
+) -> Iterator[Any]:
+    """(id, row) pairs, rejecting out-of-order input; ``skip_repeats`` drops repeated ids."""
+    previous: Optional[str] = None
+    for row in rows:
+        row_id = row.get(key)
+        if row_id is None:
+            continue
+        row_id = str(row_id)
+        if previous is not None:
+            if row_id == previous and skip_repeats:
+                continue
+            if row_id < previous:
+                raise IuguValidationError(
+                    f"{side} is not sorted by {key}: {row_id!r} after {previous!r}"
+                )
+        previous = row_id
+        yield row_id, row
+
+
+def reconcile(
+    invoices: Iterable[Mapping[str, Any]],
+    ledger: Iterable[Mapping[str, Any]],
+    *,
+    fields: Mapping[str, str] = DEFAULT_FIELDS,
+    invoice_key: str = "id",
+    ledger_key: str = "id",
+    include_matched: bool = True,
+    partition: Optional[Partition] = None,
+) -> Iterator[ReconRecord]:
+    """
+    Merge two streams sorted by invoice id and yield a :class:`ReconRecord` per id.
+
+    ``fields`` maps IUGU invoice fields to the ledger fields they are compared with;
+    values are compared as trimmed, case-insensitive strings. Ids are compared as
+    strings, so both sides must be sorted the same way (the API sorts ids as strings).
+
+    Repeated invoice ids are skipped (offset pagination can repeat an item across pages);
+    each further ledger row with an id already seen is reported as a duplicate.
+    """
+    left = _sorted_by_id(invoices, invoice_key, "invoices", skip_repeats=True)
+    right = _sorted_by_id(ledger, ledger_key, "ledger", skip_repeats=False)
+    inv_id, invoice = next(left, (None, None))
+    led_id, row = next(right, (None, None))
+    seen_id: Optional[str] = None  # id of the last ledger row consumed
+    while inv_id is not None or led_id is not None:
+        if led_id is not None and led_id == seen_id:
+            yield ReconRecord(DUPLICATE, led_id, ledger=row, partition=partition)
+            led_id, row = next(right, (None, None))
+        elif led_id is None or (inv_id is not None and inv_id < led_id):
+            yield ReconRecord(EXTRA, inv_id, invoice=invoice, partition=partition)
+            inv_id, invoice = next(left, (None, None))
+        elif inv_id is None or led_id < inv_id:
+            yield ReconRecord(MISSING, led_id, ledger=row, partition=partition)
+            seen_id = led_id
+            led_id, row = next(right, (None, None))
+        else:
+            differ = tuple(
+                name
+                for name, ledger_name in fields.items()
+                if _normalize(invoice.get(name)) != _normalize(row.get(ledger_name))
+            )
+            if differ:
+                yield ReconRecord(MISMATCH, inv_id, invoice, row, differ, partition)
+            elif include_matched:
+                yield ReconRecord(MATCHED, inv_id, invoice, row, partition=partition)
+            seen_id = led_id
+            inv_id, invoice = next(left, (None, None))
+            led_id, row = next(right, (None, None))
+
+
+_DONE = object()
+
+
+def reconcile_partitions(
+    client: IuguClient,
+    partitions: Sequence[Partition],
+    ledger_for: Callable[[Partition], Iterable[Mapping[str, Any]]],
+    *,
+    workers: int = 4,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    buffer: int = 1000,
+    **options: Any,
+) -> Iterator[ReconRecord]:
+    """
+    Reconcile ``partitions`` on up to ``workers`` threads and yield their records as
+    they are produced (records of different partitions interleave).
+
+    ``ledger_for(partition)`` returns that partition's ledger rows sorted by id, e.g.
+    ``sql_ledger(conn.execute("... WHERE day >= ? AND day < ? ORDER BY id", ...))`` or
+    ``csv_ledger(path, where=lambda row: partition.contains(row["created_at"]))``; open
+    one connection per call if the driver is not thread-safe. At most ``buffer``
+    records wait to be consumed, so memory does not grow with the account size.
+    ``options`` are passed to :func:`reconcile`.
+    """
+    if workers <= 0:
+        raise IuguValidationError("workers must be a positive integer")
+    out: "queue.Queue[Any]" = queue.Queue(maxsize=buffer)
+    pending: "queue.SimpleQueue[Partition]" = queue.SimpleQueue()
+    for partition in partitions:
+        pending.put(partition)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def work() -> None:
+        try:
+            while not stop.is_set():
+                try:
+                    partition = pending.get_nowait()
+                except queue.Empty:
+                    return
+                records = reconcile(
+                    iter_invoices(client, page_size=page_size, partition=partition),
+                    ledger_for(partition),
+                    partition=partition,
+                    **options,
+                )
+                for record in records:
+                    if not put(record):
+                        return
+        except BaseException as exc:
+            put(exc)
+        finally:
+            put(_DONE)
+
+    threads = [
+        threading.Thread(target=work, name=f"iugupy-reconcile-{i}", daemon=True)
+        for i in range(min(workers, len(partitions)))
+    ]
+    for thread in threads:
+        thread.start()
+    running = len(threads)
+    try:
+        while running:
+            item = out.get()
+            if item is _DONE:
+                running -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def summarize(records: Iterable[ReconRecord]) -> ReconSummary:
+    """Count records by kind (consumes the stream)."""
+    summary = ReconSummary()
+    for record in records:
+        summary.add(record)
+    return summary
@@ -1,11 +1,48 @@
-from .plans import Plans
-from .customers import Customers
-from .subscriptions import Subscriptions
-from .invoices import Invoices
-
-__all__ = [
-    "Plans",
-    "Customers",
-    "Subscriptions",
-    "Invoices",
-]
+from __future__ import annotations
+
+import importlib
+from typing import Any, Dict
+
+# Resource class -> module defining it; modules are imported on first use
+_MODULES: Dict[str, str] = {
+    "Plans": "plans",
+    "AsyncPlans": "plans",
+    "Customers": "customers",
+    "AsyncCustomers": "customers",
+    "Subscriptions": "subscriptions",
+    "AsyncSubscriptions": "subscriptions",
+    "Invoices": "invoices",
+    "AsyncInvoices": "invoices",
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{module}", __name__), name)
+
+
+class LazyResource:
+    """
+    Client attribute that builds its resource (and imports its module) on first access.
+
+    The resource is then stored on the client instance, so later lookups are plain
+    attribute reads.
+    """
+
+    def __init__(self, class_name: str) -> None:
+        self._class_name = class_name
+        self._attr = class_name.lower()
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._attr = name
+
+    def __get__(self, client: Any, owner: type | None = None) -> Any:
+        if client is None:
+            return self
+        resource = __getattr__(self._class_name)(client)
+        # Two threads racing on first access agree on whichever resource was stored first
+        return client.__dict__.setdefault(self._attr, resource)
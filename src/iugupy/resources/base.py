@@ -1,24 +1,74 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, Mapping, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, ClassVar, Iterable, Iterator, List, Mapping, Optional, Type
 
 from typing import TYPE_CHECKING
 
+from ..cache import CacheStats, ResourceCache
+from ..codec import JSONCodec
 from ..errors import IuguAPIError, IuguValidationError
+from ..idempotency import IDEMPOTENCY_HEADER, request_fingerprint
+from ..latency import endpoint_key
+from ..models import ListPage, Model, to_model
+from ..singleflight import request_key
+
+DEFAULT_PAGE_SIZE = 100
+_END: Any = object()  # end of a streamed page
+RESOURCE_MODEL: Any = object()  # sentinel: use the resource's own model
 
 if TYPE_CHECKING:
+    from ..aio import AsyncIuguClient
     from ..client import IuguClient
 
 
 class BaseResource:
+    # Model returned for this resource's objects when IuguConfig.typed_responses is set
+    _model: ClassVar[Optional[Type[Model]]] = None
+
     def __init__(self, client: IuguClient, resource_path: str) -> None:
         self._client = client
         self._resource_path = resource_path.strip("/")
+        self._prefix = f"{self._resource_path}/"
+        self._cache = self._build_cache(client)
+        self._typed = client.config.typed_responses
+
+    def _rel_path(self, path: str) -> str:
+        path = path.strip("/")
+        return f"{self._prefix}{path}" if path else self._resource_path
 
     @property
     def client(self) -> IuguClient:
         return self._client
 
+    # ---- Read-through cache ----
+    def _build_cache(self, client: Any) -> Optional[ResourceCache]:
+        config = client.config
+        ttl = config.cache_ttl.get(self._resource_path) if config.cache_ttl else None
+        if not ttl or client.cache is None:
+            return None
+        return ResourceCache(client.cache, ttl, config.api_token)
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        """Hit/miss counters of this resource's ``get()`` cache (None when not cached)."""
+        return self._cache.stats if self._cache is not None else None
+
+    def _cache_path(
+        self, method: str, path: str, params: Optional[Mapping[str, Any]]
+    ) -> Optional[str]:
+        """
+        Cache path for a ``get(id)`` call, or the entry to invalidate for a write.
+
+        Only parameterless ``GET <resource>/<id>`` responses are cached. Any other method
+        on ``<resource>/<id>[/...]`` (update, delete, subscription actions, payment method
+        changes) invalidates the ``<resource>/<id>`` entry.
+        """
+        head, sep, _rest = path.strip("/").partition("/")
+        if not head or (method == "GET" and (sep or params)):
+            return None
+        return f"{self._resource_path}/{head}"
+
     # ---- Validation helpers ----
     @staticmethod
     def _require_non_empty_payload(data: Optional[Mapping[str, Any]], *, where: str = "payload") -> Mapping[str, Any]:
@@ -52,6 +102,132 @@ class BaseResource:
             raise IuguValidationError(f"{name} must be a non-empty string")
         return identifier
 
+    # ---- Pagination ----
+    def iter_all(
+        self,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = False,
+        stream: bool = False,
+        **params: Any,
+    ) -> Iterator[Any]:
+        """
+        Yield every item of the list endpoint, one at a time, across pages.
+
+        Pages are requested with ``limit``/``start`` and only the current page is kept in
+        memory. With ``prefetch=True`` the next page is fetched on a background thread
+        while the current one is consumed, so at most two pages are held at once.
+
+        With ``stream=True`` each page is decoded incrementally as it is read from the
+        socket (see :class:`~iugupy.streaming.ListStream`): items are yielded before their
+        page has fully arrived and only one item is held in memory, which suits large
+        ``page_size`` values. Streamed pages bypass single-flight and hedging.
+        """
+        if page_size <= 0:
+            raise IuguValidationError("page_size must be a positive integer")
+        start = int(params.pop("start", 0))
+        if stream:
+            if prefetch:
+                raise IuguValidationError("prefetch and stream cannot be combined")
+            yield from self._iter_streamed(params, start, page_size)
+            return
+        if not prefetch:
+            while True:
+                page = self._list_page(params, start, page_size)
+                items, more = self._split_page(page, page_size, start)
+                yield from items
+                if not more:
+                    return
+                start += len(items)
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="iugupy-prefetch") as pool:
+            pending = pool.submit(self._list_page, params, start, page_size)
+            try:
+                while True:
+                    items, more = self._split_page(pending.result(), page_size, start)
+                    start += len(items)
+                    if more:
+                        pending = pool.submit(self._list_page, params, start, page_size)
+                    yield from items
+                    if not more:
+                        return
+            finally:
+                pending.cancel()
+
+    def _iter_streamed(
+        self, params: Mapping[str, Any], start: int, page_size: int
+    ) -> Iterator[Any]:
+        from ..streaming import DEFAULT_CHUNK_SIZE, ListStream
+
+        client = self._client
+        model = self._model if self._typed else None
+        while True:
+            page_params = {**params, "start": start, "limit": page_size}
+            resp = client.request("GET", self._resource_path, params=page_params, stream=True)
+            try:
+                if not 200 <= resp.status_code < 300:
+                    self._handle_response(resp, "GET", client.codec)  # raises IuguAPIError
+                page = ListStream(resp.iter_content(DEFAULT_CHUNK_SIZE))
+                records = iter(page)
+                while True:
+                    try:
+                        record = next(records, _END)
+                    except ValueError as exc:  # malformed or truncated body
+                        raise IuguAPIError(
+                            resp.status_code,
+                            f"invalid list response: {exc}",
+                            url=getattr(resp, "url", None),
+                            method="GET",
+                        ) from exc
+                    if record is _END:
+                        break
+                    if model is not None and isinstance(record, Mapping):
+                        record = model.from_dict(record)
+                    yield record
+            finally:
+                resp.close()
+            if not self._has_more(page.count, page.total, page_size, start):
+                return
+            start += page.count
+
+    def _list_page(
+        self, params: Mapping[str, Any], start: int, limit: int, *, raw: bool = False
+    ) -> Any:
+        page_params = {**params, "start": start, "limit": limit}
+        if raw:
+            return self._request_data("GET", params=page_params)
+        return self._request("GET", params=page_params)
+
+    @staticmethod
+    def _split_page(page: Any, page_size: int, start: int) -> tuple[List[Any], bool]:
+        """Return the page items and whether another page should be requested."""
+        if isinstance(page, list):
+            items = page
+            total = None
+        elif isinstance(page, ListPage):
+            items = page.items
+            total = page.total_items
+        elif isinstance(page, Mapping):
+            items = page.get("items") or []
+            total = page.get("totalItems")
+        else:
+            return [], False
+        return items, BaseResource._has_more(len(items), total, page_size, start)
+
+    @staticmethod
+    def _has_more(count: int, total: Any, page_size: int, start: int) -> bool:
+        """
+        Whether a page of ``count`` items starting at ``start`` is followed by another.
+
+        ``totalItems`` decides when the server reports it, since a server capping ``limit``
+        returns short pages before the last one; otherwise only a full page has a successor.
+        """
+        if count == 0:
+            return False
+        if isinstance(total, int):
+            return start + count < total
+        return count >= page_size
+
     # ---- Request wrapper ----
     def _request(
         self,
@@ -60,25 +236,115 @@ class BaseResource:
         *,
         params: Optional[Mapping[str, Any]] = None,
         json: Optional[Any] = None,
+        model: Any = RESOURCE_MODEL,
+        idempotency_key: Optional[str] = None,
+    ) -> Any:
+        result = self._request_data(
+            method, path, params=params, json=json, idempotency_key=idempotency_key
+        )
+        return self._as_model(result, model) if self._typed else result
+
+    def _as_model(self, result: Any, model: Any) -> Any:
+        # `model` is a Model subclass, None for responses without a model (e.g. a
+        # plan change simulation), or RESOURCE_MODEL for the resource's own model.
+        if model is RESOURCE_MODEL:
+            model = self._model
+        return result if model is None else to_model(model, result)
+
+    def _request_data(
+        self,
+        method: str,
+        path: str = "",
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Optional[Any] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Any:
+        cache_path = self._cache_path(method, path, params) if self._cache is not None else None
+        generation = None
+        if cache_path is not None and method == "GET":
+            generation = self._cache.generation(cache_path)  # type: ignore[union-attr]
+            cached = self._cache.lookup(cache_path)  # type: ignore[union-attr]
+            if cached is not None:
+                return cached
+        rel = self._rel_path(path)
+        flight = self._client.single_flight if method == "GET" else None
+        try:
+            if flight is not None:
+                result = flight.do(
+                    request_key(rel, params), lambda: self._fetch(method, rel, params, json)
+                )
+            elif method == "POST" and (
+                idempotency_key is not None or self._client.idempotency is not None
+            ):
+                result = self._fetch_idempotent(rel, params, json, idempotency_key)
+            else:
+                result = self._fetch(method, rel, params, json)
+        finally:
+            if cache_path is not None and method != "GET":
+                self._cache.invalidate(cache_path)  # type: ignore[union-attr]
+        if cache_path is not None and method == "GET":
+            self._cache.store(cache_path, result, generation)  # type: ignore[union-attr]
+        return result
+
+    def _fetch(
+        self,
+        method: str,
+        rel: str,
+        params: Optional[Mapping[str, Any]],
+        json: Optional[Any],
+        headers: Optional[Mapping[str, str]] = None,
     ) -> Any:
-        rel = "/".join([p for p in (self._resource_path, path.strip("/")) if p])
-        resp = self._client.request(method, rel, params=params, json=json)
-        return self._handle_response(resp, method)
+        client = self._client
+        if method == "GET" and client.hedger is not None:
+            # Slow GETs are raced against an identical second request
+            resp = client.hedger.run(
+                endpoint_key(method, rel), lambda: client.request(method, rel, params=params)
+            )
+        elif headers:
+            resp = client.request(method, rel, params=params, json=json, headers=headers)
+        else:
+            resp = client.request(method, rel, params=params, json=json)
+        return self._handle_response(resp, method, client.codec)
+
+    def _fetch_idempotent(
+        self,
+        rel: str,
+        params: Optional[Mapping[str, Any]],
+        json: Optional[Any],
+        key: Optional[str],
+    ) -> Any:
+        # An explicit key is the caller's to track; otherwise the client journal picks
+        # the key, reusing the one of an earlier attempt that ended without an answer.
+        if key is not None:
+            return self._fetch("POST", rel, params, json, {IDEMPOTENCY_HEADER: key})
+        fingerprint = request_fingerprint("POST", rel, params, json)
+        with self._client.idempotency.attempt(fingerprint) as key:  # type: ignore[union-attr]
+            return self._fetch("POST", rel, params, json, {IDEMPOTENCY_HEADER: key})
+
+    @staticmethod
+    def _decode(resp: Any, codec: Optional[JSONCodec]) -> Any:
+        # Decode the raw body bytes with the client's codec; objects without bytes
+        # content (or no codec) fall back to resp.json(). Raises on empty/invalid bodies.
+        content = getattr(resp, "content", None) if codec is not None else None
+        if isinstance(content, (bytes, bytearray)):
+            return codec.loads(content)  # type: ignore[union-attr]
+        return resp.json()
 
     @staticmethod
-    def _handle_response(resp: Any, method: str) -> Any:
+    def _handle_response(resp: Any, method: str, codec: Optional[JSONCodec] = None) -> Any:
         # Success
         if 200 <= resp.status_code < 300:
             # Some endpoints may return 204 No Content
             try:
-                return resp.json()
+                return BaseResource._decode(resp, codec)
             except Exception:
                 return None
         # Error path: build message from payload if possible
         payload = None
         message = "HTTP error"
         try:
-            payload = resp.json()
+            payload = BaseResource._decode(resp, codec)
             # IUGU commonly returns {'errors': {...}} or {'message': '...'}
             if isinstance(payload, dict):
                 if "message" in payload and isinstance(payload["message"], str):
@@ -96,3 +362,135 @@ class BaseResource:
         req = getattr(resp, "request", None)
         req_method = getattr(req, "method", method)
         raise IuguAPIError(resp.status_code, message, payload=payload, url=url, method=req_method)
+
+
+class AsyncBaseResource(BaseResource):
+    """
+    Awaitable counterpart of :class:`BaseResource`, bound to an ``AsyncIuguClient``.
+
+    Resource classes combine it with their synchronous definition, e.g.
+    ``class AsyncPlans(AsyncBaseResource, Plans)``, so every public method keeps its
+    validation (raised eagerly, before anything is awaited) and returns a coroutine
+    instead of the decoded payload.
+    """
+
+    _client: AsyncIuguClient  # type: ignore[assignment]
+
+    async def iter_all(  # type: ignore[override]
+        self, *, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = False, **params: Any
+    ) -> AsyncIterator[Any]:
+        """
+        Async generator over every item of the list endpoint, one page in memory at a time.
+
+        With ``prefetch=True`` the next page request runs as a task while the current
+        page is being consumed.
+        """
+        import asyncio  # imported here so the sync client does not load asyncio
+
+        if page_size <= 0:
+            raise IuguValidationError("page_size must be a positive integer")
+        if params.pop("stream", False):
+            raise IuguValidationError("stream=True is only supported by the sync client")
+        start = int(params.pop("start", 0))
+        pending: Optional[asyncio.Future[Any]] = None
+        try:
+            page = await self._list_page(params, start, page_size)
+            while True:
+                items, more = self._split_page(page, page_size, start)
+                start += len(items)
+                if more and prefetch:
+                    pending = asyncio.ensure_future(self._list_page(params, start, page_size))
+                for item in items:
+                    yield item
+                if not more:
+                    return
+                if pending is not None:
+                    page, pending = await pending, None
+                else:
+                    page = await self._list_page(params, start, page_size)
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def _request(  # type: ignore[override]
+        self,
+        method: str,
+        path: str = "",
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Optional[Any] = None,
+        model: Any = RESOURCE_MODEL,
+        idempotency_key: Optional[str] = None,
+    ) -> Any:
+        result = await self._request_data(
+            method, path, params=params, json=json, idempotency_key=idempotency_key
+        )
+        return self._as_model(result, model) if self._typed else result
+
+    async def _request_data(  # type: ignore[override]
+        self,
+        method: str,
+        path: str = "",
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Optional[Any] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Any:
+        cache_path = self._cache_path(method, path, params) if self._cache is not None else None
+        generation = None
+        if cache_path is not None and method == "GET":
+            generation = self._cache.generation(cache_path)  # type: ignore[union-attr]
+            cached = self._cache.lookup(cache_path)  # type: ignore[union-attr]
+            if cached is not None:
+                return cached
+        rel = self._rel_path(path)
+        flight = self._client.single_flight if method == "GET" else None
+        try:
+            if flight is not None:
+                result = await flight.do(
+                    request_key(rel, params), lambda: self._fetch(method, rel, params, json)
+                )
+            elif method == "POST" and (
+                idempotency_key is not None or self._client.idempotency is not None
+            ):
+                result = await self._fetch_idempotent(rel, params, json, idempotency_key)
+            else:
+                result = await self._fetch(method, rel, params, json)
+        finally:
+            if cache_path is not None and method != "GET":
+                self._cache.invalidate(cache_path)  # type: ignore[union-attr]
+        if cache_path is not None and method == "GET":
+            self._cache.store(cache_path, result, generation)  # type: ignore[union-attr]
+        return result
+
+    async def _fetch(  # type: ignore[override]
+        self,
+        method: str,
+        rel: str,
+        params: Optional[Mapping[str, Any]],
+        json: Optional[Any],
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Any:
+        client = self._client
+        if method == "GET" and client.hedger is not None:
+            resp = await client.hedger.run(
+                endpoint_key(method, rel), lambda: client.request(method, rel, params=params)
+            )
+        elif headers:
+            resp = await client.request(method, rel, params=params, json=json, headers=headers)
+        else:
+            resp = await client.request(method, rel, params=params, json=json)
+        return self._handle_response(resp, method, client.codec)
+
+    async def _fetch_idempotent(  # type: ignore[override]
+        self,
+        rel: str,
+        params: Optional[Mapping[str, Any]],
+        json: Optional[Any],
+        key: Optional[str],
+    ) -> Any:
+        if key is not None:
+            return await self._fetch("POST", rel, params, json, {IDEMPOTENCY_HEADER: key})
+        fingerprint = request_fingerprint("POST", rel, params, json)
+        with self._client.idempotency.attempt(fingerprint) as key:  # type: ignore[union-attr]
+            return await self._fetch("POST", rel, params, json, {IDEMPOTENCY_HEADER: key})
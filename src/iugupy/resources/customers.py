@@ -1,21 +1,24 @@
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Mapping, Optional
 
-from .base import BaseResource
+from ..models import Customer, PaymentMethod
+from .base import AsyncBaseResource, BaseResource
 
 
 class Customers(BaseResource):
+    _model = Customer
+
     def __init__(self, client) -> None:  # type: ignore[no-untyped-def]
         super().__init__(client, "customers")
 
     def list(self, **params: Any) -> Any:
         return self._request("GET", params=params)
 
-    def create(self, data: Mapping[str, Any]) -> Any:
+    def create(self, data: Mapping[str, Any], *, idempotency_key: Optional[str] = None) -> Any:
         self._require_non_empty_payload(data)
         self._require_fields(data, ("email",))
-        return self._request("POST", json=data)
+        return self._request("POST", json=data, idempotency_key=idempotency_key)
 
     def get(self, customer_id: str) -> Any:
         self._require_id(customer_id, name="customer_id")
@@ -33,23 +36,31 @@ class Customers(BaseResource):
     # ---- Payment Methods ----
     def list_payment_methods(self, customer_id: str, **params: Any) -> Any:
         self._require_id(customer_id, name="customer_id")
-        return self._request("GET", f"{customer_id}/payment_methods", params=params)
+        return self._request(
+            "GET", f"{customer_id}/payment_methods", params=params, model=PaymentMethod
+        )
 
     def create_payment_method(self, customer_id: str, data: Mapping[str, Any]) -> Any:
         self._require_id(customer_id, name="customer_id")
         self._require_non_empty_payload(data)
         self._require_fields(data, ("token", "description"))
-        return self._request("POST", f"{customer_id}/payment_methods", json=data)
+        return self._request(
+            "POST", f"{customer_id}/payment_methods", json=data, model=PaymentMethod
+        )
 
     def get_payment_method(self, customer_id: str, payment_method_id: str) -> Any:
         self._require_id(customer_id, name="customer_id")
         self._require_id(payment_method_id, name="payment_method_id")
-        return self._request("GET", f"{customer_id}/payment_methods/{payment_method_id}")
+        return self._request(
+            "GET", f"{customer_id}/payment_methods/{payment_method_id}", model=PaymentMethod
+        )
 
     def delete_payment_method(self, customer_id: str, payment_method_id: str) -> Any:
         self._require_id(customer_id, name="customer_id")
         self._require_id(payment_method_id, name="payment_method_id")
-        return self._request("DELETE", f"{customer_id}/payment_methods/{payment_method_id}")
+        return self._request(
+            "DELETE", f"{customer_id}/payment_methods/{payment_method_id}", model=PaymentMethod
+        )
 
     def update_payment_method(
         self, customer_id: str, payment_method_id: str, data: Mapping[str, Any]
@@ -59,4 +70,13 @@ class Customers(BaseResource):
         self._require_id(payment_method_id, name="payment_method_id")
         self._require_non_empty_payload(data)
         self._require_any_of(data, ("description", "set_as_default"))
-        return self._request("PUT", f"{customer_id}/payment_methods/{payment_method_id}", json=data)
+        return self._request(
+            "PUT",
+            f"{customer_id}/payment_methods/{payment_method_id}",
+            json=data,
+            model=PaymentMethod,
+        )
+
+
+class AsyncCustomers(AsyncBaseResource, Customers):
+    """Awaitable variant of :class:`Customers` for ``AsyncIuguClient``."""
@@ -1,24 +1,31 @@
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Mapping, Optional
 
-from .base import BaseResource
+from ..models import Invoice
+from .base import AsyncBaseResource, BaseResource
 
 
 class Invoices(BaseResource):
+    _model = Invoice
+
     def __init__(self, client) -> None:  # type: ignore[no-untyped-def]
         super().__init__(client, "invoices")
 
     def list(self, **params: Any) -> Any:
         return self._request("GET", params=params)
 
-    def create(self, data: Mapping[str, Any]) -> Any:
+    def create(self, data: Mapping[str, Any], *, idempotency_key: Optional[str] = None) -> Any:
+        self._validate_create(data)
+        return self._request("POST", json=data, idempotency_key=idempotency_key)
+
+    @classmethod
+    def _validate_create(cls, data: Mapping[str, Any]) -> None:
         # Required by IUGU: due_date, items (non-empty list), and one of email or customer_id
-        self._require_non_empty_payload(data)
-        self._require_fields(data, ("due_date",))
-        self._require_list_non_empty(data, "items")
-        self._require_any_of(data, ("email", "customer_id"))
-        return self._request("POST", json=data)
+        cls._require_non_empty_payload(data)
+        cls._require_fields(data, ("due_date",))
+        cls._require_list_non_empty(data, "items")
+        cls._require_any_of(data, ("email", "customer_id"))
 
     def get(self, invoice_id: str) -> Any:
         self._require_id(invoice_id, name="invoice_id")
@@ -32,3 +39,7 @@ class Invoices(BaseResource):
     def delete(self, invoice_id: str) -> Any:
         self._require_id(invoice_id, name="invoice_id")
         return self._request("DELETE", invoice_id)
+
+
+class AsyncInvoices(AsyncBaseResource, Invoices):
+    """Awaitable variant of :class:`Invoices` for ``AsyncIuguClient``."""
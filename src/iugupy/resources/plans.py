@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Mapping, Optional
 
-from .base import BaseResource
+from ..models import Plan
+from .base import AsyncBaseResource, BaseResource
 
 
 class Plans(BaseResource):
+    _model = Plan
+
     def __init__(self, client) -> None:  # type: ignore[no-untyped-def]
         super().__init__(client, "plans")
 
@@ -13,11 +16,11 @@ class Plans(BaseResource):
     def list(self, **params: Any) -> Any:
         return self._request("GET", params=params)
 
-    def create(self, data: Mapping[str, Any]) -> Any:
+    def create(self, data: Mapping[str, Any], *, idempotency_key: Optional[str] = None) -> Any:
         # Required by IUGU: name, interval, interval_type
         self._require_non_empty_payload(data)
         self._require_fields(data, ("name", "interval", "interval_type"))
-        return self._request("POST", json=data)
+        return self._request("POST", json=data, idempotency_key=idempotency_key)
 
     def get(self, plan_id: str) -> Any:
         self._require_id(plan_id, name="plan_id")
@@ -31,3 +34,7 @@ class Plans(BaseResource):
     def delete(self, plan_id: str) -> Any:
         self._require_id(plan_id, name="plan_id")
         return self._request("DELETE", plan_id)
+
+
+class AsyncPlans(AsyncBaseResource, Plans):
+    """Awaitable variant of :class:`Plans` for ``AsyncIuguClient``."""
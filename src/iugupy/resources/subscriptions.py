@@ -1,22 +1,26 @@
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping, Optional
 
-from .base import BaseResource
+from ..bulk import DEFAULT_BULK_CONCURRENCY, BulkReport, arun_bulk, run_bulk
+from ..models import Subscription
+from .base import AsyncBaseResource, BaseResource
 
 
 class Subscriptions(BaseResource):
+    _model = Subscription
+
     def __init__(self, client) -> None:  # type: ignore[no-untyped-def]
         super().__init__(client, "subscriptions")
 
     def list(self, **params: Any) -> Any:
         return self._request("GET", params=params)
 
-    def create(self, data: Mapping[str, Any]) -> Any:
+    def create(self, data: Mapping[str, Any], *, idempotency_key: Optional[str] = None) -> Any:
         # Required by IUGU: plan_identifier and customer_id (simplified rule)
         self._require_non_empty_payload(data)
         self._require_fields(data, ("plan_identifier", "customer_id"))
-        return self._request("POST", json=data)
+        return self._request("POST", json=data, idempotency_key=idempotency_key)
 
     def get(self, subscription_id: str) -> Any:
         self._require_id(subscription_id, name="subscription_id")
@@ -52,4 +56,76 @@ class Subscriptions(BaseResource):
         """Simulate changing the plan of a subscription. Requires 'plan_identifier' in payload."""
         self._require_id(subscription_id, name="subscription_id")
         self._require_id(plan_identifier, name="plan_identifier")
-        return self._request("POST", f"{subscription_id}/change_plan_simulation/{plan_identifier}")
+        return self._request(
+            "POST", f"{subscription_id}/change_plan_simulation/{plan_identifier}", model=None
+        )
+
+    # Bulk actions
+    # Calls run on a thread pool; size IuguConfig.pool_maxsize to at least `concurrency`
+    # so every worker keeps its own pooled connection.
+    def bulk_activate(
+        self, subscription_ids: Iterable[str], *, concurrency: int = DEFAULT_BULK_CONCURRENCY
+    ) -> BulkReport:
+        """Activate many subscriptions concurrently; returns a per-item report."""
+        return run_bulk("activate", self.activate, subscription_ids, concurrency=concurrency)
+
+    def bulk_suspend(
+        self, subscription_ids: Iterable[str], *, concurrency: int = DEFAULT_BULK_CONCURRENCY
+    ) -> BulkReport:
+        """Suspend many subscriptions concurrently; returns a per-item report."""
+        return run_bulk("suspend", self.suspend, subscription_ids, concurrency=concurrency)
+
+    def bulk_change_plan(
+        self,
+        subscription_ids: Iterable[str],
+        plan_identifier: str,
+        *,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        dry_run: bool = False,
+    ) -> BulkReport:
+        """
+        Move many subscriptions to ``plan_identifier`` concurrently; returns a per-item
+        report. With ``dry_run=True`` only ``simulate_change_plan`` is called and each
+        item's result holds the simulation.
+        """
+        self._require_id(plan_identifier, name="plan_identifier")
+        action = self.simulate_change_plan if dry_run else self.change_plan
+        return run_bulk(
+            "change_plan",
+            lambda subscription_id: action(subscription_id, plan_identifier),
+            subscription_ids,
+            concurrency=concurrency,
+            dry_run=dry_run,
+        )
+
+
+class AsyncSubscriptions(AsyncBaseResource, Subscriptions):
+    """Awaitable variant of :class:`Subscriptions` for ``AsyncIuguClient``."""
+
+    async def bulk_activate(  # type: ignore[override]
+        self, subscription_ids: Iterable[str], *, concurrency: int = DEFAULT_BULK_CONCURRENCY
+    ) -> BulkReport:
+        return await arun_bulk("activate", self.activate, subscription_ids, concurrency=concurrency)
+
+    async def bulk_suspend(  # type: ignore[override]
+        self, subscription_ids: Iterable[str], *, concurrency: int = DEFAULT_BULK_CONCURRENCY
+    ) -> BulkReport:
+        return await arun_bulk("suspend", self.suspend, subscription_ids, concurrency=concurrency)
+
+    async def bulk_change_plan(  # type: ignore[override]
+        self,
+        subscription_ids: Iterable[str],
+        plan_identifier: str,
+        *,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        dry_run: bool = False,
+    ) -> BulkReport:
+        self._require_id(plan_identifier, name="plan_identifier")
+        action = self.simulate_change_plan if dry_run else self.change_plan
+        return await arun_bulk(
+            "change_plan",
+            lambda subscription_id: action(subscription_id, plan_identifier),
+            subscription_ids,
+            concurrency=concurrency,
+            dry_run=dry_run,
+        )
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, FrozenSet, Mapping, Optional
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+@dataclass(frozen=True)
+class RetryEvent:
+    """Describes a failed attempt that is about to be retried (passed to ``on_retry``)."""
+
+    attempt: int  # 1-based number of the attempt that failed
+    method: str
+    url: str
+    delay: float  # seconds slept before the next attempt
+    elapsed: float  # seconds since the first attempt started
+    status_code: Optional[int] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry policy for ``IuguClient``/``AsyncIuguClient`` (set ``IuguConfig.retry``).
+
+    Attempts of idempotent methods are retried on connection errors, timeouts and the
+    statuses in ``retry_statuses``. Delays follow "decorrelated jitter" backoff
+    (``min(max_delay, uniform(base_delay, previous * 3))``) so concurrent clients spread
+    out instead of retrying in lockstep; a ``Retry-After`` header, when present, is used
+    as the delay instead, up to ``max_retry_after``. ``total_timeout`` bounds the whole
+    call, sleeps included: the per-attempt timeout is shortened to the remaining budget
+    and no retry starts once the budget would be exceeded.
+
+    Attributes:
+        max_attempts: Maximum number of attempts, including the first one.
+        base_delay: Minimum backoff delay in seconds.
+        max_delay: Maximum backoff delay in seconds.
+        total_timeout: Time budget in seconds for all attempts, or None for no budget.
+        retry_statuses: HTTP statuses that trigger a retry.
+        retry_methods: HTTP methods that may be retried.
+        retry_keyed_requests: Also retry requests of other methods (POST) that carry an
+            ``Idempotency-Key`` header, since the API deduplicates them.
+        respect_retry_after: Honour the ``Retry-After`` response header.
+        max_retry_after: Longest ``Retry-After`` delay honoured, in seconds; longer ones
+            are shortened to it.
+        on_retry: Callback invoked with a :class:`RetryEvent` before each retry.
+    """
+
+    max_attempts: int = 4
+    base_delay: float = 0.2
+    max_delay: float = 10.0
+    total_timeout: Optional[float] = 60.0
+    retry_statuses: FrozenSet[int] = RETRY_STATUSES
+    retry_methods: FrozenSet[str] = IDEMPOTENT_METHODS
+    retry_keyed_requests: bool = True
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+    on_retry: Optional[Callable[[RetryEvent], None]] = field(default=None, compare=False)
+
+    def allows(self, method: str, headers: Optional[Mapping[str, str]] = None) -> bool:
+        if self.max_attempts <= 1:
+            return False
+        if method.upper() in self.retry_methods:
+            return True
+        return (
+            self.retry_keyed_requests
+            and headers is not None
+            and any(name.lower() == "idempotency-key" for name in headers)
+        )
+
+    def backoff(self, previous: float) -> float:
+        """Next decorrelated-jitter delay given the previous one."""
+        upper = max(self.base_delay, previous * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+    def start(self, method: str, url: str) -> RetryState:
+        return RetryState(self, method, url)
+
+
+class RetryState:
+    """Book-keeping for one logical call; shared by the sync and async clients."""
+
+    def __init__(self, policy: RetryPolicy, method: str, url: str) -> None:
+        self.policy = policy
+        self.method = method
+        self.url = url
+        self.attempt = 0
+        self._started = time.monotonic()
+        self._delay = policy.base_delay
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    def attempt_timeout(self, timeout: Optional[float]) -> Optional[float]:
+        """Per-attempt timeout capped to the remaining budget; counts the new attempt."""
+        self.attempt += 1
+        if self.policy.total_timeout is None:
+            return timeout
+        remaining = max(self.policy.total_timeout - self.elapsed(), 0.001)
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def retry_delay(
+        self,
+        *,
+        status_code: Optional[int] = None,
+        headers: Optional[Mapping[str, Any]] = None,
+        error: Optional[BaseException] = None,
+    ) -> Optional[float]:
+        """
+        Delay before the next attempt, or None when the failure must be surfaced (not
+        retryable, attempts exhausted or time budget exceeded).
+        """
+        policy = self.policy
+        if status_code is not None and status_code not in policy.retry_statuses:
+            return None
+        if self.attempt >= policy.max_attempts:
+            return None
+
+        delay = self._delay = policy.backoff(self._delay)
+        if policy.respect_retry_after and headers is not None:
+            retry_after = parse_retry_after(
+                headers.get("Retry-After") or headers.get("retry-after")
+            )
+            if retry_after is not None:
+                delay = min(retry_after, policy.max_retry_after)
+        elapsed = self.elapsed()
+        if policy.total_timeout is not None and elapsed + delay >= policy.total_timeout:
+            return None
+
+        if policy.on_retry is not None:
+            policy.on_retry(
+                RetryEvent(
+                    attempt=self.attempt,
+                    method=self.method,
+                    url=self.url,
+                    delay=delay,
+                    elapsed=elapsed,
+                    status_code=status_code,
+                    error=error,
+                )
+            )
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header (delta-seconds or HTTP-date) into seconds; None when it
+    is missing or not a finite delay ("nan" and "inf" parse as floats but are not).
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(seconds, 0.0) if math.isfinite(seconds) else None
+    from email.utils import parsedate_to_datetime
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
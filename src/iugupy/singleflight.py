@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import copy
+import threading
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+def request_key(path: str, params: Optional[Mapping[str, Any]]) -> Tuple[str, str]:
+    """Coalescing key for a GET: the path plus a canonical form of its query params."""
+    if not params:
+        return path, ""
+    return path, repr(sorted(params.items(), key=lambda kv: kv[0]))
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls made from different threads.
+
+    While a call for ``key`` is running, other callers with the same key block until it
+    finishes and receive a deep copy of its result (or the same exception) instead of
+    running ``fn`` themselves. Nothing is cached once the call completes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class _LeaderCancelled(Exception):
+    """Set on a call whose leader was cancelled; its followers run the call instead."""
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of :class:`SingleFlight` for callers on one event loop.
+
+    Cancelling the caller running the shared call only cancels that caller: the first
+    waiting caller to resume runs the call again and the others wait for it.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future[Any]] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        import asyncio  # imported here so the sync client does not load asyncio
+
+        while True:
+            pending = self._calls.get(key)
+            if pending is None:
+                break
+            self.shared += 1
+            try:
+                # shield: a cancelled follower must not cancel the leader's request
+                return copy.deepcopy(await asyncio.shield(pending))
+            except _LeaderCancelled:
+                self.shared -= 1  # take over (or follow whoever took over first)
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.executed += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # Not future.cancel(): that would cancel every follower along with the leader
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so an exception nobody waited for is not logged as lost
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
@@ -0,0 +1,141 @@
+"""
+Incremental decoding of list responses.
+
+:class:`ListStream` reads a list response body chunk by chunk (e.g. from
+``Response.iter_content``) and yields the records of its ``items`` array as soon as each
+one is complete, instead of decoding the whole page first::
+
+    page = ListStream(resp.iter_content(DEFAULT_CHUNK_SIZE))
+    for invoice in page:
+        ...
+    page.total  # totalItems, wherever it appears in the body
+
+Only the unparsed tail of the body is buffered, so memory is bounded by one record plus
+one chunk rather than by the page. Records are decoded with the stdlib ``json`` module.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class ListStream:
+    """
+    Records of a ``{"items": [...], ...}`` (or bare ``[...]``) JSON body, parsed
+    incrementally from ``chunks`` of UTF-8 bytes.
+
+    Other top-level members (``totalItems``, facets) are collected in ``fields`` as they
+    are read; members after the array are only known once iteration is complete.
+    Malformed or truncated bodies raise ``json.JSONDecodeError``.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], *, key: str = "items") -> None:
+        self.fields: Dict[str, Any] = {}
+        self.count = 0
+        self._key = key
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    @property
+    def total(self) -> Optional[int]:
+        """``totalItems`` from the body, if it had one (and it has been read)."""
+        total = self.fields.get("totalItems")
+        return total if isinstance(total, int) else None
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._expect("{[") == "[":
+            yield from self._array()
+        else:
+            yield from self._object()
+        if self._peek():
+            raise self._error("Extra data")
+
+    # ---- Structure ----
+    def _object(self) -> Iterator[Any]:
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self._peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            name = self._value()
+            self._expect(":")
+            if name == self._key and self._peek() == "[":
+                self._pos += 1
+                yield from self._array()
+            else:
+                self.fields[name] = self._value()
+            if self._expect(",}") == "}":
+                return
+
+    def _array(self) -> Iterator[Any]:
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            record = self._value()
+            self.count += 1
+            yield record
+            if self._expect(",]") == "]":
+                return
+
+    # ---- Tokens ----
+    def _value(self) -> Any:
+        """Decode the next complete JSON value, reading more of the body as needed."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number (or literal) ending the buffer may continue in the next chunk
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _peek(self) -> str:
+        """The next non-whitespace character ("" at the end of the body), not consumed."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if not char or char not in chars:
+            raise self._error(f"Expecting one of {' '.join(chars)}")
+        self._pos += 1
+        return char
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the unparsed tail; False once the body is exhausted."""
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            text = self._utf8.decode(b"", final=True)
+        else:
+            text = self._utf8.decode(chunk)
+        self._buf = self._buf[self._pos :] + text
+        self._pos = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buf, self._pos)
@@ -0,0 +1,205 @@
+"""
+Per-tenant clients (one per API token) sharing a single connection pool.
+
+A marketplace talking to many IUGU sub-accounts would otherwise create one
+``requests.Session``, pool and set of sockets per token. :class:`ClientRegistry` keeps
+one session for all of them and hands out lightweight :class:`TenantClient` objects that
+send their token with each request::
+
+    registry = ClientRegistry(IuguConfig(api_token="", client_id="marketplace"))
+    registry.get(sub_account_token).invoices.list()
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, List, Optional
+
+import requests
+
+from .client import IuguClient
+from .config import IuguConfig
+from .errors import IuguTenantBusyError, IuguValidationError
+from .transport import build_session, warm_up
+
+
+class TenantClient(IuguClient):
+    """
+    An :class:`IuguClient` over a shared session that runs at most ``max_concurrency``
+    requests at a time, so one busy tenant cannot take every pooled connection.
+
+    Callers over the limit wait for a slot, or get :class:`IuguTenantBusyError` after
+    ``acquire_timeout`` seconds when one is set.
+    """
+
+    def __init__(
+        self,
+        config: IuguConfig,
+        *,
+        session: requests.Session,
+        max_concurrency: int,
+        acquire_timeout: Optional[float] = None,
+    ) -> None:
+        super().__init__(config, session=session)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._acquire_timeout = acquire_timeout
+        self._lock = threading.Lock()
+        self._active = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def active(self) -> int:
+        """Requests running (or waiting for a slot) right now."""
+        return self._active
+
+    def request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        with self._lock:
+            self._active += 1
+            self.last_used = time.monotonic()
+        try:
+            if not self._slots.acquire(timeout=self._acquire_timeout):
+                raise IuguTenantBusyError(self._config.client_id, self._acquire_timeout or 0.0)
+            try:
+                return super().request(method, path, **kwargs)
+            finally:
+                self._slots.release()
+        finally:
+            with self._lock:
+                self._active -= 1
+                self.last_used = time.monotonic()
+
+
+@dataclass
+class RegistryStats:
+    created: int = 0
+    hits: int = 0
+    evicted: int = 0
+
+
+class ClientRegistry:
+    """
+    Hands out one :class:`TenantClient` per API token, all over one shared session.
+
+    ``config`` is the template for every tenant: its pool settings size the shared pool
+    (raise ``pool_maxsize`` accordingly) and every other setting applies to each tenant,
+    with ``api_token`` (and optionally ``client_id``) replaced. Tenant clients are kept
+    in LRU order; past ``max_clients``, the least recently used idle ones are evicted,
+    as are those idle for more than ``idle_ttl`` seconds. A client with requests in
+    flight is never evicted; evicting one closes it (see :meth:`IuguClient.close`), and
+    :meth:`get` builds a new one (with fresh caches and breakers) the next time. A
+    ``cache_backend`` in ``config`` is shared by every tenant; entries are namespaced by
+    API token. The shared session keeps no cookies, so none pass between tenants.
+    """
+
+    def __init__(
+        self,
+        config: IuguConfig,
+        *,
+        max_clients: int = 1000,
+        max_concurrency: int = 8,
+        acquire_timeout: Optional[float] = None,
+        idle_ttl: Optional[float] = None,
+    ) -> None:
+        if max_clients <= 0:
+            raise IuguValidationError("max_clients must be a positive integer")
+        if max_concurrency <= 0:
+            raise IuguValidationError("max_concurrency must be a positive integer")
+        # Tenants share the pool, so it is warmed once here rather than per client
+        self._config = replace(config, warm_up_connections=0)
+        self._max_clients = max_clients
+        self._max_concurrency = max_concurrency
+        self._acquire_timeout = acquire_timeout
+        self._idle_ttl = idle_ttl
+        self._session = build_session(config)
+        # One cookie jar would carry one tenant's cookies (e.g. a load balancer's) onto
+        # every other tenant's requests, so the shared session stores none
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self._clients: "OrderedDict[str, TenantClient]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = RegistryStats()
+        if config.warm_up_connections > 0:
+            warm_up(self._session, config.base_url.rstrip("/") + "/", config.warm_up_connections)
+
+    @property
+    def session(self) -> requests.Session:
+        return self._session
+
+    def get(self, api_token: str, client_id: Optional[str] = None) -> TenantClient:
+        """The client for ``api_token``, created on first use."""
+        if not api_token:
+            raise IuguValidationError("api_token is required")
+        with self._lock:
+            client = self._clients.get(api_token)
+            if client is not None:
+                self._clients.move_to_end(api_token)
+                self.stats.hits += 1
+                return client
+            config = replace(
+                self._config, api_token=api_token, client_id=client_id or self._config.client_id
+            )
+            client = TenantClient(
+                config,
+                session=self._session,
+                max_concurrency=self._max_concurrency,
+                acquire_timeout=self._acquire_timeout,
+            )
+            self._clients[api_token] = client
+            self.stats.created += 1
+            self._evict_locked()
+            return client
+
+    def evict(self, api_token: str) -> bool:
+        """Drop the client for ``api_token``; returns whether there was one."""
+        with self._lock:
+            client = self._clients.pop(api_token, None)
+        if client is None:
+            return False
+        client.close()
+        return True
+
+    def prune(self) -> int:
+        """Evict idle clients past ``idle_ttl`` or ``max_clients``; returns how many."""
+        with self._lock:
+            return self._evict_locked()
+
+    def _evict_locked(self) -> int:
+        now = time.monotonic()
+        doomed: List[str] = []
+        excess = len(self._clients) - self._max_clients
+        for token, client in self._clients.items():  # least recently used first
+            if client.active:
+                continue
+            expired = self._idle_ttl is not None and now - client.last_used > self._idle_ttl
+            if excess > len(doomed) or expired:
+                doomed.append(token)
+            elif self._idle_ttl is None:
+                break
+        for token in doomed:
+            self._clients.pop(token).close()
+        self.stats.evicted += len(doomed)
+        return len(doomed)
+
+    def close(self) -> None:
+        """Close every client and the shared session's connections."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+        self._session.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __contains__(self, api_token: object) -> bool:
+        return api_token in self._clients
+
+    def __enter__(self) -> "ClientRegistry":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
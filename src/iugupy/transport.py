@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import requote_uri
+
+from .clientbase import encode_query
+from .config import IuguConfig
+
+
+SocketOption = Tuple[int, int, int]
+
+# Transport failures that count as retryable and as circuit-breaker failures
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+# Start probing after 60s idle, every 20s, give up after 5 unanswered probes
+TCP_KEEPALIVE_IDLE = 60
+TCP_KEEPALIVE_INTERVAL = 20
+TCP_KEEPALIVE_COUNT = 5
+
+
+def keepalive_socket_options() -> List[SocketOption]:
+    """TCP keep-alive options supported by the running platform."""
+    options: List[SocketOption] = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    for name, value in (
+        ("TCP_KEEPIDLE", TCP_KEEPALIVE_IDLE),
+        ("TCP_KEEPINTVL", TCP_KEEPALIVE_INTERVAL),
+        ("TCP_KEEPCNT", TCP_KEEPALIVE_COUNT),
+    ):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+def socket_options_for(config: IuguConfig) -> List[SocketOption]:
+    """Socket options for new connections: urllib3 defaults plus keep-alive/user options."""
+    from urllib3.connection import HTTPConnection
+
+    options = list(HTTPConnection.default_socket_options)  # TCP_NODELAY
+    if config.tcp_keepalive:
+        options.extend(keepalive_socket_options())
+    if config.socket_options:
+        options.extend(tuple(opt) for opt in config.socket_options)  # type: ignore[misc]
+    return options
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    ``HTTPAdapter`` that applies custom socket options to every pooled connection.
+
+    Socket options are re-applied whenever the pool manager is rebuilt (including after
+    unpickling), and also to proxy managers.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["_socket_options"]
+
+    def __init__(
+        self, *, socket_options: Optional[Sequence[SocketOption]] = None, **kwargs: Any
+    ) -> None:
+        self._socket_options = list(socket_options) if socket_options else None
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **pool_kwargs: Any) -> None:
+        if self._socket_options:
+            pool_kwargs.setdefault("socket_options", self._socket_options)
+        super().init_poolmanager(*args, **pool_kwargs)
+
+    def proxy_manager_for(self, proxy: str, **proxy_kwargs: Any) -> Any:
+        if self._socket_options:
+            proxy_kwargs.setdefault("socket_options", self._socket_options)
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+
+def build_session(config: IuguConfig) -> requests.Session:
+    """Create a ``requests.Session`` whose HTTP(S) adapters follow the pool settings."""
+    session = requests.Session()
+    adapter = PooledHTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=config.pool_block,
+        socket_options=socket_options_for(config),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def warm_up(session: requests.Session, url: str, connections: int) -> int:
+    """
+    Open up to ``connections`` connections (DNS, TCP and TLS handshake) to ``url`` and
+    park them in the session's pool, so the first requests reuse them.
+
+    Returns the number of connections opened. Failures are not raised: a warm-up that
+    cannot connect simply leaves the pool cold.
+    """
+    adapter = session.get_adapter(url)
+    if not isinstance(adapter, HTTPAdapter) or connections <= 0:
+        return 0
+    prepared = requests.Request("GET", url).prepare()
+    # Resolve verify/cert/proxies exactly like Session.request does (env CA bundles
+    # included): they are part of the pool key, so any mismatch warms an unused pool.
+    settings = session.merge_environment_settings(url, {}, None, None, None)
+    try:
+        pool = adapter.get_connection_with_tls_context(
+            prepared,
+            verify=settings["verify"],
+            proxies=settings["proxies"],
+            cert=settings["cert"],
+        )
+    except Exception:
+        return 0
+    count = min(connections, pool.pool.maxsize if pool.pool is not None else connections)
+
+    def open_one() -> Any:
+        conn = pool._get_conn()
+        try:
+            conn.connect()
+        except Exception:
+            conn.close()
+            pool._put_conn(conn)
+            return None
+        return conn
+
+    # Connections are checked out all at once so each handshake gets its own socket
+    with ThreadPoolExecutor(max_workers=count, thread_name_prefix="iugupy-warmup") as executor:
+        opened = list(executor.map(lambda _: open_one(), range(count)))
+    for conn in opened:
+        if conn is not None:
+            pool._put_conn(conn)
+    return sum(1 for conn in opened if conn is not None)
+
+
+class DirectSend:
+    """
+    Sends requests straight to the session's pooled adapter.
+
+    ``Session.request`` re-merges session headers, auth, cookies, hooks and environment
+    settings (proxies, CA bundle) on every call. Here they are resolved once: the headers
+    (Authorization included) are frozen into a template and the environment settings
+    looked up for ``base_url``. The adapter is looked up on the first request, so adapters
+    mounted right after the client is created are honoured. Redirects and cookies are not
+    handled.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        base_url: str,
+        extra_headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        headers = CaseInsensitiveDict(session.headers)
+        if extra_headers:
+            headers.update(extra_headers)
+        template = requests.Request("GET", base_url, headers=headers, auth=session.auth).prepare()
+        self._headers = template.headers
+        settings = session.merge_environment_settings(base_url, {}, None, None, None)
+        self._send_kwargs = {
+            "verify": settings["verify"],
+            "cert": settings["cert"],
+            "proxies": settings["proxies"],
+            "stream": False,
+        }
+        self._session = session
+        self._base_url = base_url
+        self._adapter: Optional[BaseAdapter] = None
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        body: Optional[bytes],
+        headers: Optional[Mapping[str, str]],
+        timeout: Optional[float],
+        stream: bool = False,
+    ) -> requests.Response:
+        if params:
+            query = encode_query(params)
+            if query:
+                url += ("&" if "?" in url else "?") + query
+        prepared = requests.PreparedRequest()
+        prepared.method = method
+        prepared.url = requote_uri(url)
+        prepared.headers = self._headers.copy()
+        if headers:
+            for name, value in headers.items():
+                if value is None:
+                    prepared.headers.pop(name, None)
+                else:
+                    prepared.headers[name] = value
+        prepared.body = body
+        if body is not None:
+            prepared.headers["Content-Length"] = str(len(body))
+        elif method in ("POST", "PUT", "PATCH"):
+            prepared.headers["Content-Length"] = "0"
+        prepared.hooks = {"response": []}
+        adapter = self._adapter
+        if adapter is None:
+            adapter = self._adapter = self._session.get_adapter(self._base_url)
+        if stream:
+            return adapter.send(prepared, timeout=timeout, **{**self._send_kwargs, "stream": True})
+        resp = adapter.send(prepared, timeout=timeout, **self._send_kwargs)
+        resp.content  # read the body so the connection returns to the pool
+        return resp
@@ -0,0 +1,410 @@
+"""
+Receiver for IUGU webhook notifications ("gatilhos").
+
+IUGU posts each event form-encoded (``event=invoice.status_changed&data[id]=...``).
+:class:`WebhookReceiver` is a WSGI application (and, through :attr:`WebhookReceiver.asgi`,
+an ASGI one) that checks the shared token, parses the body into a typed event, drops
+redeliveries and acknowledges at once, leaving the processing to a background batching
+queue::
+
+    def handle(events: list[WebhookEvent]) -> None: ...
+
+    receiver = WebhookReceiver(token=os.environ["IUGU_WEBHOOK_TOKEN"], handler=handle)
+    app.mount("/iugu/webhooks", WSGIMiddleware(receiver))  # or receiver.asgi
+
+When the queue is full the receiver answers 503, so IUGU delivers the event again later
+instead of the process buffering without bound.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Type
+from urllib.parse import parse_qsl
+
+from .cache import TTLCache
+from .errors import IuguValidationError
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN_HEADER = "Authorization"
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_DEDUPE_TTL = 24 * 60 * 60.0
+DEFAULT_DEDUPE_SIZE = 100_000
+DEFAULT_MAX_BODY = 64 * 1024
+RETRY_AFTER = "5"  # seconds, sent with 503 while the queue is full
+
+
+# ---- Events ----
+@dataclass(frozen=True, slots=True)
+class WebhookEvent:
+    """
+    One notification: the event name (``invoice.status_changed``) and its ``data``
+    fields, nested as posted (``data[a][b]`` becomes ``data["a"]["b"]``).
+    """
+
+    event: str
+    data: Mapping[str, Any]
+    received_at: float = field(default=0.0, compare=False)
+
+    @property
+    def resource(self) -> str:
+        """The object kind the event is about, e.g. ``invoice``."""
+        return self.event.partition(".")[0]
+
+    @property
+    def action(self) -> str:
+        """What happened, e.g. ``status_changed``."""
+        return self.event.partition(".")[2]
+
+    @property
+    def id(self) -> Optional[str]:
+        return self.data.get("id")
+
+    @property
+    def account_id(self) -> Optional[str]:
+        return self.data.get("account_id")
+
+    @property
+    def key(self) -> str:
+        """Deduplication key: a digest of the event name and data."""
+        canonical = repr((self.event, sorted(_flatten(self.data))))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class InvoiceEvent(WebhookEvent):
+    """``invoice.*`` events (created, status_changed, payment_failed, ...)."""
+
+    @property
+    def invoice_id(self) -> Optional[str]:
+        return self.data.get("id")
+
+    @property
+    def status(self) -> Optional[str]:
+        return self.data.get("status")
+
+    @property
+    def subscription_id(self) -> Optional[str]:
+        return self.data.get("subscription_id")
+
+
+@dataclass(frozen=True, slots=True)
+class SubscriptionEvent(WebhookEvent):
+    """``subscription.*`` events (created, renewed, suspended, expired, ...)."""
+
+    @property
+    def subscription_id(self) -> Optional[str]:
+        return self.data.get("id")
+
+    @property
+    def plan_identifier(self) -> Optional[str]:
+        return self.data.get("plan_identifier")
+
+    @property
+    def customer_email(self) -> Optional[str]:
+        return self.data.get("customer_email")
+
+
+EVENT_TYPES: Dict[str, Type[WebhookEvent]] = {
+    "invoice": InvoiceEvent,
+    "subscription": SubscriptionEvent,
+}
+
+
+def _flatten(data: Mapping[str, Any], prefix: str = "") -> Iterable[Tuple[str, str]]:
+    for name, value in data.items():
+        if isinstance(value, Mapping):
+            yield from _flatten(value, f"{prefix}{name}.")
+        else:
+            yield f"{prefix}{name}", str(value)
+
+
+def parse_event(body: bytes, received_at: Optional[float] = None) -> WebhookEvent:
+    """Parse a form-encoded notification body; raises IuguValidationError if malformed."""
+    try:
+        pairs = parse_qsl(body.decode("utf-8"), keep_blank_values=True, strict_parsing=True)
+    except (UnicodeDecodeError, ValueError):
+        raise IuguValidationError("webhook body is not form-encoded") from None
+    event = None
+    data: Dict[str, Any] = {}
+    for name, value in pairs:
+        if name == "event":
+            event = value
+        elif name.startswith("data[") and name.endswith("]"):
+            path = name[len("data[") : -1].split("][")
+            node = data
+            for part in path[:-1]:
+                child = node.setdefault(part, {})
+                if not isinstance(child, dict):
+                    raise IuguValidationError(f"conflicting webhook field {name!r}")
+                node = child
+            node[path[-1]] = value
+    if not event:
+        raise IuguValidationError("webhook body has no event")
+    cls = EVENT_TYPES.get(event.partition(".")[0], WebhookEvent)
+    return cls(event, data, time.time() if received_at is None else received_at)
+
+
+# ---- Batching ----
+@dataclass
+class ReceiverStats:
+    received: int = 0
+    accepted: int = 0
+    duplicates: int = 0
+    unauthorized: int = 0
+    invalid: int = 0
+    overloaded: int = 0  # answered 503 because the queue was full
+    batches: int = 0
+    handled: int = 0
+    handler_errors: int = 0
+    # Request threads and batcher workers count concurrently
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def add(self, **counts: int) -> None:
+        """Increment the named counters atomically."""
+        with self._lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
+
+
+class EventBatcher:
+    """
+    Bounded queue drained by worker threads that call ``handler`` with batches of up to
+    ``batch_size`` events, waiting at most ``max_wait`` seconds to fill a batch.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[WebhookEvent]], None],
+        *,
+        batch_size: int = 100,
+        max_wait: float = 0.05,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        workers: int = 1,
+        stats: Optional[ReceiverStats] = None,
+    ) -> None:
+        if batch_size <= 0 or queue_size <= 0 or workers <= 0:
+            raise ValueError("batch_size, queue_size and workers must be positive")
+        self.handler = handler
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.stats = stats if stats is not None else ReceiverStats()
+        self._queue: "queue.Queue[Optional[WebhookEvent]]" = queue.Queue(queue_size)
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._run, name=f"iugupy-webhooks-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def offer(self, event: WebhookEvent) -> bool:
+        """Enqueue without blocking; False when the queue is full or closed."""
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            return False
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting events, process what is queued and stop the workers."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        get = self._queue.get
+        while True:
+            first = get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    event = get(timeout=remaining) if remaining > 0 else get(block=False)
+                except queue.Empty:
+                    break
+                if event is None:
+                    stop = True
+                    break
+                batch.append(event)
+            self._deliver(batch)
+            if stop:
+                return
+
+    def _deliver(self, batch: List[WebhookEvent]) -> None:
+        try:
+            self.handler(batch)
+        except Exception:
+            self.stats.add(handler_errors=1, batches=1)
+            logger.exception("webhook handler failed on a batch of %d events", len(batch))
+        else:
+            self.stats.add(handled=len(batch), batches=1)
+
+
+# ---- Receiver ----
+class WebhookReceiver:
+    """
+    WSGI/ASGI endpoint for IUGU webhooks.
+
+    Each POST is checked against ``token`` (the ``Authorization`` header configured on
+    the IUGU trigger, compared in constant time), parsed, deduplicated against the
+    events seen in the last ``dedupe_ttl`` seconds (at most ``dedupe_size`` keys) and
+    handed to an :class:`EventBatcher`. Responses: 200 accepted or duplicate, 400
+    malformed, 401 bad token, 405 not a POST, 413 body over ``max_body`` bytes, 503
+    queue full (with ``Retry-After``). Events are acknowledged before ``handler`` runs,
+    so the handler must persist or process them reliably on its own.
+
+    An empty ``token`` (e.g. an unset environment variable) raises ``ValueError``;
+    accepting unauthenticated webhooks takes ``token=None`` together with
+    ``allow_unauthenticated=True``.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str],
+        handler: Callable[[List[WebhookEvent]], None],
+        *,
+        allow_unauthenticated: bool = False,
+        batch_size: int = 100,
+        max_wait: float = 0.05,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        workers: int = 1,
+        dedupe_ttl: float = DEFAULT_DEDUPE_TTL,
+        dedupe_size: int = DEFAULT_DEDUPE_SIZE,
+        max_body: int = DEFAULT_MAX_BODY,
+    ) -> None:
+        if token is None:
+            if not allow_unauthenticated:
+                raise ValueError("token is required unless allow_unauthenticated=True")
+        elif not token:
+            raise ValueError("token must not be empty")
+        self._token = None if token is None else token.encode("utf-8")
+        self.stats = ReceiverStats()
+        self.batcher = EventBatcher(
+            handler,
+            batch_size=batch_size,
+            max_wait=max_wait,
+            queue_size=queue_size,
+            workers=workers,
+            stats=self.stats,
+        )
+        self.dedupe_ttl = dedupe_ttl
+        self.max_body = max_body
+        self._seen = TTLCache(dedupe_size)
+        self._lock = threading.Lock()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        self.batcher.close(timeout)
+
+    def handle(
+        self, method: str, headers: Mapping[str, str], body: bytes
+    ) -> Tuple[int, List[Tuple[str, str]]]:
+        """Process one request; returns the status code and extra response headers."""
+        stats = self.stats
+        stats.add(received=1)
+        if method != "POST":
+            return 405, [("Allow", "POST")]
+        if self._token is not None:
+            sent = headers.get(TOKEN_HEADER.lower(), "").encode("utf-8")
+            if not hmac.compare_digest(sent, self._token):
+                stats.add(unauthorized=1)
+                return 401, []
+        if len(body) > self.max_body:
+            stats.add(invalid=1)
+            return 413, []
+        try:
+            event = parse_event(body)
+        except IuguValidationError:
+            stats.add(invalid=1)
+            return 400, []
+        key = event.key
+        with self._lock:
+            if key in self._seen:
+                stats.add(duplicates=1)
+                return 200, []
+            if not self.batcher.offer(event):
+                stats.add(overloaded=1)
+                return 503, [("Retry-After", RETRY_AFTER)]
+            # Marked only once queued, so an event refused with 503 is accepted on retry
+            self._seen.set(key, True, self.dedupe_ttl)
+        stats.add(accepted=1)
+        return 200, []
+
+    def _too_large(self) -> Tuple[int, List[Tuple[str, str]]]:
+        self.stats.add(received=1, invalid=1)
+        return 413, []
+
+    # ---- WSGI ----
+    def __call__(self, environ: Mapping[str, Any], start_response: Callable[..., Any]) -> Any:
+        try:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            length = 0
+        if length > self.max_body:
+            status, headers = self._too_large()
+        else:
+            body = environ["wsgi.input"].read(length) if length > 0 else b""
+            auth = environ.get("HTTP_AUTHORIZATION", "")
+            status, headers = self.handle(
+                environ.get("REQUEST_METHOD", "GET"), {"authorization": auth}, body
+            )
+        start_response(_STATUS_LINES[status], [("Content-Length", "0"), *headers])
+        return [b""]
+
+    # ---- ASGI ----
+    async def asgi(self, scope: Mapping[str, Any], receive: Any, send: Any) -> None:
+        """ASGI 3 application (``http`` scope)."""
+        if scope["type"] != "http":
+            return
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        chunks = []
+        size = 0
+        more = True
+        while more:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size <= self.max_body:
+                chunks.append(chunk)
+            more = message.get("more_body", False)
+        if size > self.max_body:
+            status, extra = self._too_large()
+        else:
+            status, extra = self.handle(scope["method"], headers, b"".join(chunks))
+        response_headers = [(b"content-length", b"0")]
+        response_headers += [(k.lower().encode(), v.encode()) for k, v in extra]
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": b""})
+
+
+_STATUS_LINES = {
+    200: "200 OK",
+    400: "400 Bad Request",
+    401: "401 Unauthorized",
+    405: "405 Method Not Allowed",
+    413: "413 Payload Too Large",
+    503: "503 Service Unavailable",
+}
@@ -1,8 +1,63 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure src/ is on sys.path for local test runs without installation
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
+
+import iugupy  # noqa: E402
+
+BASE_URL = "https://api.example.com/v1"
+
+
+class FakeResp:
+    """
+    Stand-in for ``requests.Response``: ``json()`` returns ``payload`` (or raises
+    without one), ``method`` sets ``request.method`` and ``close()`` is recorded.
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        payload=None,
+        *,
+        headers=None,
+        url: str | None = None,
+        method: str | None = None,
+    ):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = headers or {}
+        self.url = url
+        self.request = type("R", (), {"method": method}) if method else None
+        self.text = None if payload is None else str(payload)
+        self.closed = False
+
+    def json(self):
+        if self._payload is None:
+            raise ValueError("no payload")
+        return self._payload
+
+    def close(self):
+        self.closed = True
+
+
+def make_config(**config) -> iugupy.IuguConfig:
+    """Test config against ``BASE_URL``; keyword arguments override any field."""
+    return iugupy.IuguConfig(
+        **{"api_token": "tok", "client_id": "cid", "base_url": BASE_URL, **config}
+    )
+
+
+def make_client(**config) -> iugupy.IuguClient:
+    return iugupy.IuguClient(make_config(**config))
+
+
+@pytest.fixture
+def client() -> iugupy.IuguClient:
+    """An ``IuguClient`` with the default test config, for tests that stub its transport."""
+    return make_client()
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import iugupy
+from conftest import FakeResp, make_config
+
+
+def test_async_resources_paths_and_payload(monkeypatch):
+    c = iugupy.AsyncIuguClient(make_config())
+    calls: list[tuple] = []
+
+    async def fake_request(method, path, **kwargs):
+        calls.append((method, path, kwargs))
+        return FakeResp(200, {"ok": True})
+
+    monkeypatch.setattr(c, "request", fake_request)
+
+    async def run():
+        assert await c.plans.list(limit=5) == {"ok": True}
+        assert calls[-1][0] == "GET" and calls[-1][1] == "plans"
+        assert calls[-1][2]["params"] == {"limit": 5}
+
+        await c.customers.get_payment_method("cus_1", "pm_1")
+        assert calls[-1][1] == "customers/cus_1/payment_methods/pm_1"
+
+        await c.subscriptions.change_plan("sub_1", "pro")
+        assert calls[-1][0] == "POST" and calls[-1][1] == "subscriptions/sub_1/change_plan/pro"
+
+        await c.invoices.create(
+            {"email": "a@b.com", "due_date": "2025-12-31", "items": [{"price_cents": 1}]}
+        )
+        assert calls[-1][0] == "POST" and calls[-1][1] == "invoices"
+
+    asyncio.run(run())
+
+
+def test_async_validation_is_eager_and_errors_are_mapped(monkeypatch):
+    c = iugupy.AsyncIuguClient(make_config())
+
+    async def fake_request(method, path, **kwargs):
+        return FakeResp(422, {"errors": {"email": "invalid"}}, url=f"https://x/{path}")
+
+    monkeypatch.setattr(c, "request", fake_request)
+
+    with pytest.raises(iugupy.IuguValidationError):
+        c.customers.create({})
+
+    async def run():
+        with pytest.raises(iugupy.IuguAPIError) as exc:
+            await c.customers.create({"email": "bad"})
+        assert exc.value.status_code == 422
+        assert "invalid" in exc.value.message
+
+    asyncio.run(run())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    seen: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.seen.append((self.command, self.path, self.headers.get("Authorization")))
+        self._reply(200, {"id": self.path.rsplit("/", 1)[-1]})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        data = json.loads(self.rfile.read(length))
+        self.seen.append((self.command, self.path, data))
+        self._reply(400, {"errors": {"email": "is invalid"}})
+
+
+def test_async_client_round_trips_over_keep_alive_pool():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _Handler.seen = []
+    try:
+
+        async def run():
+            base = f"http://127.0.0.1:{server.server_address[1]}/v1"
+            async with iugupy.AsyncIuguClient(
+                iugupy.IuguConfig(api_token="tok", client_id="cid", base_url=base),
+                max_connections=4,
+            ) as c:
+                results = await asyncio.gather(*(c.plans.get(f"p{i}") for i in range(20)))
+                assert [r["id"] for r in results] == [f"p{i}" for i in range(20)]
+                assert len(c._get_pool()._idle) <= 4
+
+                with pytest.raises(iugupy.IuguAPIError) as exc:
+                    await c.customers.create({"email": "bad"})
+                assert exc.value.status_code == 400
+                assert exc.value.url.endswith("/v1/customers")
+
+        asyncio.run(run())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert _Handler.seen[0][1].startswith("/v1/plans/")
+    assert _Handler.seen[0][2] == "Basic dG9rOg=="  # base64("tok:")
+    assert _Handler.seen[-1] == ("POST", "/v1/customers", {"email": "bad"})
+
+
+async def _serve_one_request_per_connection(seen: list):
+    """Server that answers the first request on a connection and drops any later one."""
+
+    async def handle(reader, writer):
+        answered = False
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                length = next(
+                    (
+                        int(v)
+                        for k, _, v in (l.partition(": ") for l in lines)
+                        if k == "Content-Length"
+                    ),
+                    0,
+                )
+                await reader.readexactly(length)
+                seen.append(lines[0].split(" ")[0])
+                if answered:
+                    break  # the server has seen (and may have applied) the request
+                answered = True
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 11\r\n\r\n{"id":"x"}\n')
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            pass
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+@pytest.mark.parametrize(
+    "method,headers,resent",
+    [("GET", None, True), ("POST", None, False), ("POST", {"Idempotency-Key": "k1"}, True)],
+)
+def test_async_client_resends_on_dropped_keep_alive_only_when_safe(method, headers, resent):
+    seen: list = []
+
+    async def run():
+        server = await _serve_one_request_per_connection(seen)
+        base = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/v1"
+        try:
+            async with iugupy.AsyncIuguClient(
+                iugupy.IuguConfig(api_token="tok", client_id="cid", base_url=base)
+            ) as c:
+                assert (await c.get("plans")).status_code == 200
+                if resent:
+                    resp = await c.request(method, "plans", json={}, headers=headers)
+                    assert resp.status_code == 200
+                else:
+                    with pytest.raises(EOFError):
+                        await c.request(method, "plans", json={}, headers=headers)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(run())
+    assert seen == ["GET", method, method] if resent else ["GET", method]
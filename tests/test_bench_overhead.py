@@ -0,0 +1,31 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+BENCH = Path(__file__).resolve().parents[1] / "benchmarks" / "bench_overhead.py"
+
+
+def load_bench():
+    spec = importlib.util.spec_from_file_location("bench_overhead", BENCH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = load_bench()
+adapter = bench.MemoryAdapter()
+CASES = bench.all_cases(adapter)
+
+
+@pytest.mark.parametrize("name,status,payload,call", CASES, ids=[case[0] for case in CASES])
+def test_benchmark_case_runs_against_memory_adapter(name, status, payload, call):
+    # Smoke test only: keeps the benchmark cases working as the SDK evolves
+    adapter.reply(status, payload)
+    call()
+
+
+def test_every_case_has_a_baseline():
+    baseline = json.loads((BENCH.parent / "baseline.json").read_text())["cases"]
+    assert sorted(baseline) == sorted(case[0] for case in CASES)
@@ -0,0 +1,156 @@
+import json
+
+import pytest
+
+import iugupy
+from iugupy.__main__ import main
+from iugupy.billing import InvoiceSpec, load_specs, read_journal, run_billing, validate_specs
+from iugupy.emulator import IuguEmulator
+from conftest import make_client
+
+CSV = """ref,email,due_date,description,quantity,price_cents
+acme,billing@acme.example,2025-12-31,Gold plan,1,4990
+acme,,,Extra seats,3,1000
+,solo@example.com,2025-12-31,Basic plan,1,1990
+,solo@example.com,2025-12-31,Basic plan,1,1990
+"""
+
+
+def make_specs(count: int):
+    return [
+        InvoiceSpec(
+            f"cust-{n}",
+            {
+                "email": f"c{n}@example.com",
+                "due_date": "2025-12-31",
+                "items": [{"description": "Plan", "quantity": 1, "price_cents": 100 + n}],
+            },
+            n + 1,
+        )
+        for n in range(count)
+    ]
+
+
+def read_output(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_load_csv_groups_items_by_ref(tmp_path):
+    path = tmp_path / "run.csv"
+    path.write_text(CSV)
+    specs = load_specs(path)
+    assert len(specs) == 3 and validate_specs(specs) == []
+    acme = specs[0]
+    assert acme.ref == "acme" and acme.line == 2
+    assert acme.payload == {
+        "email": "billing@acme.example",
+        "due_date": "2025-12-31",
+        "items": [
+            {"description": "Gold plan", "quantity": 1, "price_cents": 4990},
+            {"description": "Extra seats", "quantity": 3, "price_cents": 1000},
+        ],
+    }
+    # Rows without a ref are keyed by payload; identical rows stay distinct
+    assert specs[1].ref != specs[2].ref and specs[2].ref.startswith(specs[1].ref)
+    assert load_specs(path)[1].ref == specs[1].ref  # stable across reads
+
+    path.write_text("email,due_date,description,quantity,price_cents\na@b.c,2025-12-31,x,one,1\n")
+    with pytest.raises(iugupy.IuguValidationError, match="quantity must be an integer"):
+        load_specs(path)
+
+
+def test_load_ndjson(tmp_path):
+    path = tmp_path / "run.ndjson"
+    path.write_text('{"ref": 7, "customer_id": "C1"}\n\n{"email": "x@y.z"}\n')
+    specs = load_specs(path)
+    assert [(s.ref, s.line) for s in specs][0] == ("7", 1)
+    assert specs[0].payload == {"customer_id": "C1"} and specs[1].line == 3
+    path.write_text("[1, 2]\n")
+    with pytest.raises(iugupy.IuguValidationError, match="expected a JSON object"):
+        load_specs(path)
+    with pytest.raises(iugupy.IuguValidationError, match="unknown spec format"):
+        load_specs(path, format="xml")
+
+
+def test_invalid_specs_abort_before_any_request(tmp_path):
+    specs = make_specs(3)
+    del specs[1].payload["due_date"]
+    specs[2].payload["items"] = []
+    specs.append(InvoiceSpec("cust-0", dict(specs[0].payload), 9))
+    problems = validate_specs(specs)
+    assert len(problems) == 3
+    assert "due_date" in problems[0] and "'items'" in problems[1] and "duplicate" in problems[2]
+
+    with IuguEmulator() as emu:
+        with pytest.raises(iugupy.IuguValidationError, match="3 invalid invoice spec"):
+            run_billing(make_client(base_url=emu.base_url).invoices, specs, tmp_path / "out.ndjson")
+        assert emu.stats.requests == 0
+    assert not (tmp_path / "out.ndjson").exists()
+
+
+def test_run_creates_and_resumes_from_the_journal(tmp_path):
+    specs = make_specs(40)
+    out = tmp_path / "out.ndjson"
+    with IuguEmulator() as emu:
+        invoices = make_client(base_url=emu.base_url).invoices
+        first = run_billing(invoices, specs[:15], out, concurrency=4)
+        assert (first.created, first.skipped, first.failed, first.ok) == (15, 0, 0, True)
+
+        seen = []
+        second = run_billing(
+            invoices, specs, out, concurrency=8, progress=lambda r: seen.append(r.done)
+        )
+        assert (second.created, second.skipped, second.total) == (25, 15, 40)
+        assert sorted(seen) == list(range(1, 41))
+        assert len(emu.state.list("invoices", 0, 1000)["items"]) == 40
+
+        rows = read_output(out)
+        assert sorted(r["ref"] for r in rows) == sorted(s.ref for s in specs)
+        assert {r["status"] for r in rows} == {"created", "skipped"}
+        journal = read_journal(first.journal)
+        assert first.journal == tmp_path / "out.ndjson.journal" and len(journal) == 40
+        assert all(journal[r["ref"]] == r["id"] for r in rows)
+
+
+def test_lost_journal_entries_are_deduplicated_by_idempotency_key(tmp_path):
+    specs = make_specs(10)
+    out, journal = tmp_path / "out.ndjson", tmp_path / "run.journal"
+    with IuguEmulator() as emu:
+        invoices = make_client(base_url=emu.base_url).invoices
+        run_billing(invoices, specs, out, journal_path=journal)
+        # A crash after the create but before (or while) journaling it
+        lines = journal.read_text().splitlines()
+        journal.write_text("\n".join(lines[:6]) + "\n" + lines[6][:10])
+        again = run_billing(invoices, specs, out, journal_path=journal)
+        assert (again.created, again.skipped) == (4, 6)
+        assert len(emu.state.list("invoices", 0, 1000)["items"]) == 10
+        assert emu.stats.replayed == 4 and len(read_journal(journal)) == 10
+
+
+def test_api_errors_are_recorded_and_retried_by_a_rerun(tmp_path):
+    specs = make_specs(5)
+    out = tmp_path / "out.ndjson"
+    with IuguEmulator(error_rate=1.0) as emu:
+        result = run_billing(make_client(base_url=emu.base_url).invoices, specs, out)
+        assert (result.failed, result.ok) == (5, False)
+        assert all(r["status"] == "failed" and r["code"] >= 500 for r in read_output(out))
+        assert read_journal(result.journal) == {}
+        emu.error_rate = 0.0
+        assert run_billing(make_client(base_url=emu.base_url).invoices, specs, out).created == 5
+
+
+def test_cli(tmp_path, capsys):
+    specs = tmp_path / "run.csv"
+    specs.write_text(CSV)
+    with IuguEmulator() as emu:
+        argv = ["--token", "tok", "--base-url", emu.base_url, "billing-run", str(specs)]
+        assert main(argv + ["--validate-only"]) == 0
+        assert main(argv + ["-q", "--concurrency", "2"]) == 0
+        assert "created 3, skipped 0, failed 0 of 3" in capsys.readouterr().err
+        assert len(read_output(tmp_path / "run.results.ndjson")) == 3
+        assert main(argv + ["-q"]) == 0
+        assert "created 0, skipped 3" in capsys.readouterr().err
+
+    specs.write_text("ref,email,description,quantity,price_cents\nx,a@b.c,Plan,1,100\n")
+    assert main(["billing-run", str(specs), "--validate-only"]) == 1
+    assert "due_date" in capsys.readouterr().err
@@ -0,0 +1,261 @@
+import asyncio
+
+import pytest
+import requests
+
+import iugupy
+from iugupy import breaker as breaker_module
+from iugupy.breaker import CircuitBreaker, CircuitBreakerPolicy
+from iugupy.emulator import IuguEmulator, Latency
+from iugupy.latency import AdaptiveTimeout, LatencyWindow, endpoint_key
+from conftest import FakeResp, make_client
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(breaker_module.time, "monotonic", clock.monotonic)
+    return clock
+
+
+POLICY = CircuitBreakerPolicy(failure_rate=0.5, min_calls=4, window=10, open_seconds=5)
+
+
+def test_endpoint_key_templates_ids():
+    assert endpoint_key("GET", "invoices") == "GET invoices"
+    assert endpoint_key("GET", "/invoices/ABC?x=1") == "GET invoices/:id"
+    assert endpoint_key("POST", "subscriptions/S1/suspend") == "POST subscriptions/:id/suspend"
+    assert (
+        endpoint_key("DELETE", "customers/C1/payment_methods/PM1")
+        == "DELETE customers/:id/payment_methods/:id"
+    )
+
+
+def test_breaker_opens_at_failure_rate_and_recovers(clock):
+    b = CircuitBreaker("GET invoices/:id", POLICY)
+    for failed in (False, True, False):
+        b.record(failed, b.before())
+    assert b.state == "closed"  # below min_calls
+    b.record(True, b.before())  # 2 of 4 failed
+    assert b.state == "open" and b.opened == 1
+
+    with pytest.raises(iugupy.IuguCircuitOpenError) as exc:
+        b.before()
+    assert exc.value.retry_in == pytest.approx(5.0)
+    assert b.rejected == 1
+
+    clock.now += 5
+    probe = b.before()
+    assert probe is True and b.state == "half_open"
+    with pytest.raises(iugupy.IuguCircuitOpenError):
+        b.before()  # only one probe at a time
+    b.record(False, probe)
+    assert b.state == "closed"
+    assert b.before() is False
+
+
+def test_failed_probe_reopens_and_cancelled_probe_is_released(clock):
+    b = CircuitBreaker("GET invoices", POLICY)
+    for _ in range(4):
+        b.record(True, b.before())
+    clock.now += 5
+    b.cancel(b.before())
+    probe = b.before()  # the slot freed by cancel() can be used again
+    b.record(True, probe)
+    assert b.state == "open" and b.opened == 2
+
+
+def test_client_fails_fast_per_endpoint(monkeypatch, clock):
+    c = make_client(circuit_breaker=POLICY)
+    sent = []
+
+    def fake_send(method, url, params, body, headers, timeout, stream=False):
+        sent.append(url)
+        if "invoices" in url:
+            raise requests.ConnectionError("down")
+        return FakeResp(200, {"id": "C1"})
+
+    monkeypatch.setattr(c, "_send", fake_send)
+    for _ in range(4):
+        with pytest.raises(requests.ConnectionError):
+            c.invoices.get("I1")
+    with pytest.raises(iugupy.IuguCircuitOpenError) as exc:
+        c.invoices.get("I2")
+    assert exc.value.endpoint == "GET invoices/:id"
+    assert len(sent) == 4
+
+    # Other endpoints are unaffected
+    assert c.customers.get("C1") == {"id": "C1"}
+    states = {s["endpoint"]: s["state"] for s in c.circuit_breakers.snapshot()}
+    assert states == {"GET customers/:id": "closed", "GET invoices/:id": "open"}
+
+
+def test_server_errors_count_but_client_errors_do_not(monkeypatch, clock):
+    c = make_client(circuit_breaker=POLICY)
+    statuses = [404, 404, 404, 404, 503, 503, 503, 503]
+    monkeypatch.setattr(c, "_send", lambda *a: FakeResp(statuses.pop(0), {"errors": "x"}))
+    for _ in range(4):
+        with pytest.raises(iugupy.IuguAPIError):
+            c.plans.get("P1")
+    assert c.circuit_breakers.get("GET plans/:id").state == "closed"
+    for _ in range(4):
+        with pytest.raises(iugupy.IuguAPIError):
+            c.plans.get("P1")
+    assert c.circuit_breakers.get("GET plans/:id").state == "open"
+
+
+def test_retries_stop_once_the_circuit_opens(monkeypatch, clock):
+    policy = iugupy.RetryPolicy(max_attempts=10, base_delay=0, max_delay=0)
+    c = make_client(circuit_breaker=POLICY, retry=policy)
+    calls = []
+
+    def fake_send(*args):
+        calls.append(args)
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(c, "_send", fake_send)
+    with pytest.raises(iugupy.IuguCircuitOpenError):
+        c.plans.list()
+    assert len(calls) == 4
+
+
+def test_latency_window_percentiles():
+    w = LatencyWindow(size=100, refresh_every=1)
+    assert w.percentile(0.5) is None
+    for ms in range(1, 201):
+        w.observe(ms / 1000)
+    assert len(w) == 100  # oldest samples were replaced
+    assert w.percentile(0.5) == pytest.approx(0.150)
+    assert w.percentile(0.99) == pytest.approx(0.199)
+    assert w.percentile(1.0) == pytest.approx(0.200)
+
+
+def test_adaptive_timeout_bounds():
+    adaptive = AdaptiveTimeout(percentile=0.9, multiplier=2, min_timeout=0.5, min_samples=5)
+    w = LatencyWindow(refresh_every=1)
+    assert adaptive.timeout_for(w, 30.0) == 30.0  # not enough samples yet
+    for _ in range(10):
+        w.observe(1.0)
+    assert adaptive.timeout_for(w, 30.0) == 2.0
+    for _ in range(500):
+        w.observe(0.01)
+    assert adaptive.timeout_for(w, 30.0) == 0.5
+    assert AdaptiveTimeout(max_timeout=5, min_samples=1).timeout_for(None, 30.0) == 5
+
+
+def test_client_derives_timeout_from_latency(monkeypatch):
+    adaptive = AdaptiveTimeout(percentile=0.99, multiplier=3, min_timeout=0.1, min_samples=3)
+    c = make_client(adaptive_timeout=adaptive, timeout=30)
+    timeouts = []
+
+    def fake_send(method, url, params, body, headers, timeout, stream=False):
+        timeouts.append(timeout)
+        return FakeResp(200, {"id": "P1"})
+
+    monkeypatch.setattr(c, "_send", fake_send)
+    for _ in range(3):
+        c.plans.get("P1")
+    assert timeouts == [30, 30, 30]
+    for sample in (0.2, 0.2, 0.2):
+        c.latency.observe("GET plans/:id", sample)
+
+    c.plans.get("P1")
+    assert timeouts[-1] == pytest.approx(0.6)
+    c.request("GET", "plans/P1", timeout=7)
+    assert timeouts[-1] == 7  # explicit timeouts win
+    assert c.latency.endpoints() == ["GET plans/:id"]
+
+
+def test_async_client_breaker(monkeypatch, clock):
+    cfg = iugupy.IuguConfig(
+        api_token="tok",
+        client_id="cid",
+        base_url="https://api.example.com/v1",
+        circuit_breaker=POLICY,
+        adaptive_timeout=AdaptiveTimeout(),
+    )
+    c = iugupy.AsyncIuguClient(cfg)
+    sent = []
+
+    async def fake_exchange(method, target, url, headers, body):
+        sent.append(target)
+        raise ConnectionResetError("down")
+
+    monkeypatch.setattr(c, "_exchange", fake_exchange)
+
+    async def run():
+        for _ in range(4):
+            with pytest.raises(ConnectionResetError):
+                await c.subscriptions.suspend("S1")
+        with pytest.raises(iugupy.IuguCircuitOpenError):
+            await c.subscriptions.suspend("S2")
+
+    asyncio.run(run())
+    assert len(sent) == 4
+    assert c.circuit_breakers.get("POST subscriptions/:id/suspend").state == "open"
+
+
+RECOVERING = AdaptiveTimeout(
+    percentile=0.9, multiplier=4, min_timeout=0.02, min_samples=10, window=20
+)
+
+
+# Far above the fast timeout even on a loaded machine; calls stop once 5 in a row succeed
+SLOW = "fixed:150"
+
+
+def recovered(outcomes):
+    return outcomes[-5:] == [200] * 5
+
+
+def test_adaptive_timeout_grows_back_when_latency_shifts_up():
+    with IuguEmulator(latency="fixed:2") as emu:
+        cfg = iugupy.IuguConfig(
+            api_token="tok", client_id="cid", base_url=emu.base_url, adaptive_timeout=RECOVERING
+        )
+        c = iugupy.IuguClient(cfg)
+        for _ in range(20):
+            c.request("GET", "plans")
+        fast = RECOVERING.timeout_for(c.latency.window("GET plans"), 30)
+        assert fast < 0.1
+
+        emu.latency = Latency(SLOW)
+        outcomes = []
+        while len(outcomes) < 100 and not recovered(outcomes):
+            try:
+                outcomes.append(c.request("GET", "plans").status_code)
+            except requests.Timeout:
+                outcomes.append("timeout")
+        assert "timeout" in outcomes  # the shift is felt first...
+        assert recovered(outcomes)  # ...then the timeout has grown past it
+        assert RECOVERING.timeout_for(c.latency.window("GET plans"), 30) > 0.15
+
+
+def test_async_adaptive_timeout_grows_back_when_latency_shifts_up():
+    async def run(emu):
+        cfg = iugupy.IuguConfig(
+            api_token="tok", client_id="cid", base_url=emu.base_url, adaptive_timeout=RECOVERING
+        )
+        async with iugupy.AsyncIuguClient(cfg) as c:
+            for _ in range(20):
+                await c.request("GET", "plans")
+            emu.latency = Latency(SLOW)
+            outcomes = []
+            while len(outcomes) < 100 and not recovered(outcomes):
+                try:
+                    outcomes.append((await c.request("GET", "plans")).status_code)
+                except TimeoutError:
+                    outcomes.append("timeout")
+            return outcomes
+
+    with IuguEmulator(latency="fixed:2") as emu:
+        outcomes = asyncio.run(run(emu))
+    assert "timeout" in outcomes and recovered(outcomes)
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import iugupy
+from iugupy.bulk import arun_bulk, run_bulk
+from conftest import FakeResp, make_config
+
+
+class Server:
+    """Fake request handler that fails for ids containing 'bad' and tracks concurrency."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.paths: list[str] = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, method, path, **kwargs):
+        with self.lock:
+            self.paths.append(path)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if "bad" in path:
+            return FakeResp(404, {"errors": "not found"})
+        return FakeResp(200, {"path": path})
+
+
+def test_bulk_change_plan_reports_partial_failures_in_order(monkeypatch):
+    c = iugupy.IuguClient(make_config())
+    server = Server(delay=0.01)
+    monkeypatch.setattr(c, "request", server)
+    ids = [f"sub_{i}" for i in range(20)] + ["sub_bad", " "]
+
+    report = c.subscriptions.bulk_change_plan(iter(ids), "pro", concurrency=4)
+
+    assert [r.id for r in report.results] == ids
+    assert len(report.succeeded) == 20 and not report.ok
+    assert report.failed_ids == ["sub_bad", " "]
+    assert isinstance(report.failed[0].error, iugupy.IuguAPIError)
+    assert isinstance(report.failed[1].error, iugupy.IuguValidationError)
+    assert report.results[0].result == {"path": "subscriptions/sub_0/change_plan/pro"}
+    assert 1 < server.peak <= 4
+
+
+def test_bulk_change_plan_dry_run_uses_simulation(monkeypatch):
+    c = iugupy.IuguClient(make_config())
+    server = Server()
+    monkeypatch.setattr(c, "request", server)
+
+    report = c.subscriptions.bulk_change_plan(["sub_1", "sub_2"], "pro", dry_run=True)
+
+    assert report.dry_run and report.ok
+    assert sorted(server.paths) == [
+        "subscriptions/sub_1/change_plan_simulation/pro",
+        "subscriptions/sub_2/change_plan_simulation/pro",
+    ]
+
+
+def test_bulk_suspend_and_activate(monkeypatch):
+    c = iugupy.IuguClient(make_config())
+    server = Server()
+    monkeypatch.setattr(c, "request", server)
+
+    assert c.subscriptions.bulk_suspend(["sub_1"]).ok
+    assert c.subscriptions.bulk_activate(["sub_1"]).ok
+    assert server.paths == ["subscriptions/sub_1/suspend", "subscriptions/sub_1/activate"]
+
+
+def test_bulk_validates_arguments():
+    c = iugupy.IuguClient(make_config())
+    with pytest.raises(iugupy.IuguValidationError):
+        c.subscriptions.bulk_change_plan(["sub_1"], "")
+    with pytest.raises(iugupy.IuguValidationError):
+        c.subscriptions.bulk_suspend(["sub_1"], concurrency=0)
+
+
+def test_async_bulk_change_plan(monkeypatch):
+    c = iugupy.AsyncIuguClient(make_config())
+    state = {"active": 0, "peak": 0}
+
+    async def fake_request(method, path, **kwargs):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.001)
+        state["active"] -= 1
+        return FakeResp(404, {}) if "bad" in path else FakeResp(200, {"path": path})
+
+    monkeypatch.setattr(c, "request", fake_request)
+    ids = [f"sub_{i}" for i in range(50)] + ["sub_bad"]
+
+    report = asyncio.run(c.subscriptions.bulk_change_plan(ids, "pro", concurrency=10))
+
+    assert [r.id for r in report.results] == ids
+    assert report.failed_ids == ["sub_bad"]
+    assert state["peak"] == 10
+
+
+def test_async_bulk_records_cancelled_items_in_order():
+    async def fn(item_id):
+        await asyncio.sleep(0.001)
+        if item_id == "b":
+            raise asyncio.CancelledError()
+        return item_id
+
+    report = asyncio.run(arun_bulk("x", fn, ["a", "b", "c", "d"], concurrency=2))
+
+    assert [r.id for r in report.results] == ["a", "b", "c", "d"]
+    assert report.failed_ids == ["b"]
+    assert isinstance(report.failed[0].error, asyncio.CancelledError)
+    assert [r.result for r in report.succeeded] == ["a", "c", "d"]
+
+
+def test_cancelling_an_async_bulk_run_cancels_calls_in_flight():
+    started = []
+
+    async def fn(item_id):
+        started.append(item_id)
+        await asyncio.sleep(10)
+
+    async def main():
+        run = asyncio.ensure_future(arun_bulk("x", fn, ["a", "b", "c"], concurrency=2))
+        await asyncio.sleep(0.01)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        await asyncio.sleep(0)
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(main()) == []
+    assert started == ["a", "b"]
+
+
+def test_bulk_records_base_exceptions_per_item():
+    class Stop(BaseException):
+        pass
+
+    def fn(item_id):
+        if item_id == "b":
+            raise Stop()
+        return item_id
+
+    report = run_bulk("x", fn, iter(["a", "b", "c"]), concurrency=2)
+
+    assert [r.id for r in report.results] == ["a", "b", "c"]
+    assert report.failed_ids == ["b"] and isinstance(report.failed[0].error, Stop)
@@ -0,0 +1,130 @@
+import time
+
+from iugupy.cache import MAX_TRACKED_GENERATIONS, ResourceCache, TTLCache
+from conftest import FakeResp, make_client
+
+
+def recording(monkeypatch, c):
+    calls: list = []
+
+    def fake_request(method, path, **kwargs):
+        calls.append((method, path))
+        return FakeResp(200, {"id": path.rpartition("/")[2], "n": len(calls)})
+
+    monkeypatch.setattr(c, "request", fake_request)
+    return calls
+
+
+def test_get_is_cached_per_resource_ttl(monkeypatch):
+    c = make_client(cache_ttl={"plans": 60})
+    calls = recording(monkeypatch, c)
+
+    first = c.plans.get("gold")
+    first["n"] = "mutated by caller"
+    assert c.plans.get("gold") == {"id": "gold", "n": 1}
+    assert calls == [("GET", "plans/gold")]
+    assert c.plans.cache_stats.hits == 1 and c.plans.cache_stats.misses == 1
+
+    # Resources without a TTL are not cached
+    c.customers.get("cus_1")
+    c.customers.get("cus_1")
+    assert len(calls) == 3
+    assert c.customers.cache_stats is None
+
+    # list() and parameterised GETs bypass the cache
+    c.plans.list()
+    c.plans.list()
+    assert len(calls) == 5
+
+
+def test_writes_invalidate_the_cached_entry(monkeypatch):
+    c = make_client(cache_ttl={"subscriptions": 60, "customers": 60})
+    calls = recording(monkeypatch, c)
+
+    c.subscriptions.get("sub_1")
+    c.subscriptions.suspend("sub_1")
+    c.subscriptions.get("sub_1")
+    assert [m for m, _ in calls] == ["GET", "POST", "GET"]
+
+    c.customers.get("cus_1")
+    c.customers.update("cus_1", {"name": "Alice"})
+    c.customers.get("cus_1")
+    c.customers.update_payment_method("cus_1", "pm_1", {"description": "d"})
+    c.customers.get("cus_1")
+    assert [m for m, _ in calls[3:]] == ["GET", "PUT", "GET", "PUT", "GET"]
+
+
+def test_get_racing_a_write_does_not_cache_the_stale_result(monkeypatch):
+    c = make_client(cache_ttl={"customers": 60})
+    server = {"name": "Alice"}
+    calls: list = []
+
+    def fake_request(method, path, json=None, **kwargs):
+        calls.append(method)
+        if method == "PUT":
+            server.update(json)
+            return FakeResp(200, dict(server))
+        snapshot = dict(server)
+        if len(calls) == 1:
+            # The update lands while the GET's (now stale) response is in flight
+            c.customers.update("cus_1", {"name": "Bob"})
+        return FakeResp(200, snapshot)
+
+    monkeypatch.setattr(c, "request", fake_request)
+
+    assert c.customers.get("cus_1") == {"name": "Alice"}
+    assert c.customers.get("cus_1") == {"name": "Bob"}
+    assert calls == ["GET", "PUT", "GET"]
+    assert c.customers.get("cus_1") == {"name": "Bob"}
+    assert len(calls) == 3
+
+
+def test_generations_survive_resetting_the_tracked_paths():
+    cache = ResourceCache(TTLCache(), 60, "tok")
+    generation = cache.generation("plans/gold")
+    cache.invalidate("plans/gold")
+    # Forgets "plans/gold" was invalidated; its generation must still differ
+    for i in range(MAX_TRACKED_GENERATIONS):
+        cache.invalidate(f"plans/{i}")
+    cache.store("plans/gold", {"id": "gold"}, generation)
+    assert cache.lookup("plans/gold") is None
+
+    generation = cache.generation("plans/gold")
+    cache.store("plans/gold", {"id": "gold"}, generation)
+    assert cache.lookup("plans/gold") == {"id": "gold"}
+
+
+def test_entries_expire_and_lru_evicts():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == 1  # "a" becomes most recently used
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None and cache.evictions == 1
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    cache.set("short", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+
+
+def test_pluggable_backend_shared_between_clients(monkeypatch):
+    backend = TTLCache()
+    a = make_client(cache_ttl={"plans": 60}, cache_backend=backend)
+    b = make_client(cache_ttl={"plans": 60}, cache_backend=backend)
+    calls_a = recording(monkeypatch, a)
+    calls_b = recording(monkeypatch, b)
+
+    a.plans.get("gold")
+    b.plans.get("gold")
+    assert len(calls_a) == 1 and calls_b == []
+
+    b.plans.delete("gold")
+    a.plans.get("gold")
+    assert len(calls_a) == 2
+
+    # Clients with another API token do not see the entries
+    other = make_client(api_token="other", cache_ttl={"plans": 60}, cache_backend=backend)
+    calls_other = recording(monkeypatch, other)
+    other.plans.get("gold")
+    assert len(calls_other) == 1
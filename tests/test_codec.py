@@ -0,0 +1,126 @@
+import pytest
+
+import iugupy
+from iugupy.codec import StdlibCodec, get_codec
+from conftest import make_client
+
+
+class BytesResp:
+    """Response exposing raw bytes like requests.Response; json() must not be used."""
+
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        self.content = content
+        self.url = "https://api.example.com/v1/invoices"
+        self.request = None
+        self.text = content.decode()
+
+    def json(self):
+        raise AssertionError("body should be decoded by the client codec")
+
+
+def available_codecs() -> list:
+    names = ["json"]
+    for name in ("orjson", "msgspec"):
+        try:
+            get_codec(name)
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+
+@pytest.mark.parametrize("name", available_codecs())
+def test_body_encoded_once_and_response_decoded_with_codec(monkeypatch, name):
+    c = make_client(json_codec=name)
+    assert c.codec.name == name
+    sent = []
+
+    def fake_send(method, url, params, body, headers, timeout, stream=False):
+        sent.append(body)
+        return BytesResp(200, b'{"id":"inv_1","items":[{"price_cents":1000}]}')
+
+    monkeypatch.setattr(c, "_send", fake_send)
+    data = {"email": "a@b.com", "due_date": "2025-12-31", "items": [{"price_cents": 1000}]}
+
+    assert c.invoices.create(data) == {"id": "inv_1", "items": [{"price_cents": 1000}]}
+    assert isinstance(sent[0], bytes)
+    assert StdlibCodec().loads(sent[0]) == data
+
+
+@pytest.mark.parametrize("name", available_codecs())
+def test_error_and_empty_bodies(monkeypatch, name):
+    c = make_client(json_codec=name)
+    responses = [BytesResp(422, b'{"errors":{"email":"invalid"}}'), BytesResp(204, b"")]
+    monkeypatch.setattr(c, "_send", lambda *args: responses.pop(0))
+
+    with pytest.raises(iugupy.IuguAPIError) as exc:
+        c.customers.create({"email": "bad"})
+    assert exc.value.payload == {"errors": {"email": "invalid"}}
+    assert c.customers.delete("cus_1") is None
+
+
+def test_get_codec_selection():
+    assert get_codec("json").name == "json"
+    assert get_codec("auto").name in {"json", "orjson", "msgspec"}
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+@pytest.mark.parametrize("name", available_codecs())
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf")])
+def test_codecs_reject_nan_like_requests(name, value):
+    codec = get_codec(name)
+    for payload in ({"price_cents": value}, {"items": [{"price_cents": value}], "x": None}):
+        with pytest.raises(ValueError):
+            codec.dumps(payload)
+    assert codec.loads(codec.dumps({"price_cents": 1.5, "x": None})) == {
+        "price_cents": 1.5,
+        "x": None,
+    }
+
+
+@pytest.mark.parametrize("name", available_codecs())
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"custom_variables": {1: "int key"}},  # orjson: "Dict key must be str"
+        {"total_cents": 2**70},  # orjson: "Integer exceeds 64-bit range"
+    ],
+    ids=["int-key", "wide-int"],
+)
+def test_codecs_accept_what_the_stdlib_accepts(monkeypatch, name, payload):
+    c = make_client(json_codec=name)
+    sent = []
+    monkeypatch.setattr(c, "_send", lambda *args, **kwargs: sent.append(args[3]))
+    c.request("POST", "invoices", json=payload)
+    assert StdlibCodec().loads(sent[0]) == StdlibCodec().loads(StdlibCodec().dumps(payload))
+
+
+@pytest.mark.parametrize("name", available_codecs())
+def test_codecs_still_reject_unencodable_payloads(name):
+    with pytest.raises(TypeError):
+        get_codec(name).dumps({"when": object()})
+
+
+@pytest.mark.parametrize("name", available_codecs())
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"total_cents": 1180591620717411303424, "items": [-9223372036854775809]}',
+        b'{"ratio": NaN, "digitable_line": "23790123456789012345678901234567890"}',
+        b"[1e400]",
+    ],
+    ids=["wide-int", "nan", "overflow"],
+)
+def test_codecs_decode_what_the_stdlib_decodes(monkeypatch, name, body):
+    c = make_client(json_codec=name)
+    monkeypatch.setattr(c, "_send", lambda *args: BytesResp(200, body))
+    assert c.invoices.get("inv_1") == StdlibCodec().loads(body)
+    assert get_codec(name).loads(body.decode()) == StdlibCodec().loads(body)
+
+
+@pytest.mark.parametrize("name", available_codecs())
+def test_codecs_reject_invalid_bodies(name):
+    with pytest.raises(ValueError):
+        get_codec(name).loads(b'{"id": ')
@@ -0,0 +1,139 @@
+import asyncio
+import gzip
+import importlib.util
+import json
+import sys
+import zlib
+from pathlib import Path
+
+import pytest
+
+import iugupy
+from iugupy.compression import CompressionPolicy, CompressionStats, decode
+from iugupy.emulator import IuguEmulator
+from conftest import make_config
+
+BENCH = Path(__file__).resolve().parents[1] / "benchmarks" / "bench_compression.py"
+
+CREATE = {
+    "email": "a@example.com",
+    "due_date": "2025-12-31",
+    "items": [
+        {"description": f"Service #{n}", "quantity": 1, "price_cents": 100} for n in range(80)
+    ],
+}
+
+
+def test_policy_validation_and_accept_encoding():
+    with pytest.raises(ValueError):
+        CompressionPolicy(request_threshold=-1)
+    with pytest.raises(ValueError):
+        CompressionPolicy(level=0)
+    policy = CompressionPolicy()
+    assert policy.accept_encoding({"gzip", "deflate"}) == "gzip"
+    assert policy.accept_encoding({"gzip", "br", "zstd"}) == "zstd, br, gzip"
+    assert CompressionPolicy(encodings=()).accept_encoding({"gzip"}) == "identity"
+
+
+def test_request_bodies_are_gzipped_above_the_threshold():
+    body = json.dumps(CREATE).encode()
+    assert CompressionPolicy().compress(body) is None  # requests are not compressed by default
+    assert CompressionPolicy(request_threshold=len(body) + 1).compress(body) is None
+    compressed = CompressionPolicy(request_threshold=0).compress(body)
+    assert gzip.decompress(compressed) == body and len(compressed) < len(body)
+    assert CompressionPolicy(request_threshold=0).compress(body) == compressed  # stable
+    assert CompressionPolicy(request_threshold=0).compress(b"{}") is None  # would grow
+
+
+def test_decode():
+    data = b'{"items": []}' * 10
+    assert decode(gzip.compress(data), "gzip") == data
+    assert decode(zlib.compress(data), "deflate") == data
+    raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    assert decode(raw.compress(data) + raw.flush(), "deflate") == data
+    assert decode(gzip.compress(zlib.compress(data)), "deflate, gzip") == data
+    assert decode(data, "identity") == data
+    with pytest.raises(ValueError, match="unsupported"):
+        decode(data, "x-unknown")
+
+
+def test_stats():
+    stats = CompressionStats()
+    assert stats.response_ratio == 1.0
+    stats.record_request(1000, 200)
+    stats.record_response(500, 100, True)
+    stats.record_response(50, 50, False)
+    assert stats.bytes_saved == 1200
+    assert stats.response_ratio == pytest.approx(150 / 550)
+    assert stats.snapshot()["responses_compressed"] == 1
+
+
+@pytest.mark.parametrize("direct_send", [False, True])
+def test_sync_client_end_to_end(direct_send):
+    policy = CompressionPolicy(request_threshold=256)
+    with IuguEmulator(compress=True, api_token="tok") as emu:
+        emu.state.seed(invoices=30)
+        client = iugupy.IuguClient(
+            make_config(base_url=emu.base_url, compression=policy, direct_send=direct_send)
+        )
+        page = client.invoices.list(limit=30)
+        assert len(page["items"]) == 30
+        created = client.invoices.create(CREATE)
+        assert created["total_cents"] == 8000
+
+        stats = client.compression_stats
+        assert stats.requests_compressed == 1 and stats.responses_compressed == 2
+        assert stats.bytes_saved > 0 and stats.response_ratio < 0.5
+
+        plain = iugupy.IuguClient(make_config(base_url=emu.base_url))
+        assert plain.compression_stats is None
+        assert plain.invoices.list(limit=30)["items"][:30] == page["items"]
+        resp = plain.request("GET", "invoices", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in resp.headers
+
+
+def test_async_client_end_to_end():
+    policy = CompressionPolicy(request_threshold=256)
+
+    async def run(config):
+        async with iugupy.AsyncIuguClient(config) as client:
+            page = await client.invoices.list(limit=30)
+            created = await client.invoices.create(CREATE)
+            return client.compression_stats, page, created
+
+    with IuguEmulator(compress=True) as emu:
+        emu.state.seed(invoices=30)
+        stats, page, created = asyncio.run(
+            run(make_config(base_url=emu.base_url, compression=policy))
+        )
+        assert len(page["items"]) == 30 and created["total_cents"] == 8000
+        assert stats.requests_compressed == 1 and stats.responses_compressed == 2
+        assert stats.bytes_saved > 0
+
+        stats, plain, _ = asyncio.run(run(make_config(base_url=emu.base_url)))
+        assert stats is None and plain["items"][:30] == page["items"]
+
+
+def test_emulator_rejects_unknown_request_encodings():
+    with IuguEmulator() as emu:
+        client = iugupy.IuguClient(make_config(base_url=emu.base_url))
+        resp = client.request("POST", "plans", json={}, headers={"Content-Encoding": "br"})
+        assert resp.status_code == 415
+        resp = client.request(
+            "POST", "plans", json={"name": "x"}, headers={"Content-Encoding": "gzip"}
+        )
+        assert resp.status_code == 400  # not actually gzip
+    with pytest.raises(ValueError):
+        IuguEmulator(bandwidth=0)
+
+
+def test_bench_smoke():
+    spec = importlib.util.spec_from_file_location("bench_compression", BENCH)
+    bench = sys.modules[spec.name] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bench)
+    rows = bench.run(None, page_size=10, items=50, repeat=1)
+    assert {(row["case"], row["mode"]) for row in rows} == {
+        (case, mode) for case in bench.cases(10, 50) for mode in bench.MODES
+    }
+    saved = {row["mode"]: row["saved_bytes"] for row in rows}
+    assert saved["off"] == 0 and saved["gzip"] > 0
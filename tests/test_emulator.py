@@ -0,0 +1,231 @@
+import asyncio
+import json
+import socket
+import struct
+import threading
+import time
+
+import pytest
+
+import iugupy
+from iugupy.emulator import MAX_PAGE_SIZE, IuguEmulator, Latency
+from iugupy.export import export_ndjson
+from iugupy.mirror import Mirror
+from iugupy.reconcile import iter_invoices
+from iugupy.retry import RetryPolicy
+from conftest import make_client, make_config
+
+
+def test_resources_round_trip_against_emulator():
+    with IuguEmulator() as emu:
+        c = make_client(base_url=emu.base_url)
+        plan = c.plans.create(
+            {"name": "Gold", "identifier": "gold", "interval": 1, "interval_type": "months"}
+        )
+        customer = c.customers.create({"email": "a@b.com", "name": "Alice"})
+        pm = c.customers.create_payment_method(customer["id"], {"token": "t", "description": "d"})
+        assert c.customers.get(customer["id"])["default_payment_method_id"] == pm["id"]
+        assert [m["id"] for m in c.customers.list_payment_methods(customer["id"])] == [pm["id"]]
+
+        sub = c.subscriptions.create({"customer_id": customer["id"], "plan_identifier": "gold"})
+        assert sub["plan_name"] == "Gold" and sub["active"] is True
+        assert c.subscriptions.suspend(sub["id"])["suspended"] is True
+        assert c.subscriptions.activate(sub["id"])["active"] is True
+
+        invoice = c.invoices.create(
+            {
+                "email": "a@b.com",
+                "due_date": "2030-01-31",
+                "items": [{"description": "Service", "quantity": 2, "price_cents": 1500}],
+            }
+        )
+        assert invoice["total_cents"] == 3000 and invoice["status"] == "pending"
+        assert c.plans.update(plan["id"], {"name": "Gold+"})["name"] == "Gold+"
+        c.invoices.delete(invoice["id"])
+
+        with pytest.raises(iugupy.IuguAPIError) as exc:
+            c.invoices.get(invoice["id"])
+        assert exc.value.status_code == 404
+        with pytest.raises(iugupy.IuguAPIError) as exc:
+            c.subscriptions.create({"customer_id": "missing", "plan_identifier": "gold"})
+        assert exc.value.status_code == 422
+        assert emu.stats.requests == 13
+
+
+def test_invoices_accept_a_customer_id_instead_of_an_email():
+    with IuguEmulator() as emu:
+        c = make_client(base_url=emu.base_url)
+        customer = c.customers.create({"email": "a@example.com"})
+        items = [{"description": "Plan", "quantity": 1, "price_cents": 990}]
+        invoice = c.invoices.create(
+            {"customer_id": customer["id"], "due_date": "2025-12-31", "items": items}
+        )
+        assert invoice["customer_id"] == customer["id"] and invoice["email"] == "a@example.com"
+
+        # Neither is still rejected, as by the SDK's own validation
+        resp = c.request("POST", "invoices", json={"due_date": "2025-12-31", "items": items})
+        assert resp.status_code == 422 and "email" in resp.json()["errors"]
+
+
+def test_pagination_with_seeded_data():
+    with IuguEmulator() as emu:
+        emu.state.seed(invoices=230)
+        c = make_client(base_url=emu.base_url)
+        page = c.invoices.list(start=200, limit=50)
+        assert page["totalItems"] == 230 and len(page["items"]) == 30
+        ids = [inv["id"] for inv in c.invoices.iter_all(page_size=100)]
+        assert len(ids) == len(set(ids)) == 230
+
+
+def test_pages_capped_by_the_server_are_not_mistaken_for_the_last(tmp_path):
+    total = MAX_PAGE_SIZE + 500
+    page_size = 2 * MAX_PAGE_SIZE
+    with IuguEmulator() as emu:
+        emu.state.seed(invoices=total)
+        c = make_client(base_url=emu.base_url)
+
+        for options in ({}, {"prefetch": True}, {"stream": True}):
+            ids = [inv["id"] for inv in c.invoices.iter_all(page_size=page_size, **options)]
+            assert len(ids) == len(set(ids)) == total, options
+
+        async def async_ids():
+            cfg = make_config(base_url=emu.base_url)
+            async with iugupy.AsyncIuguClient(cfg) as ac:
+                return [inv["id"] async for inv in ac.invoices.iter_all(page_size=page_size)]
+
+        assert len(set(asyncio.run(async_ids()))) == total
+
+        result = export_ndjson(c.invoices, tmp_path / "out.ndjson", page_size=page_size)
+        assert result.records == total
+        exported = [json.loads(line)["id"] for line in open(tmp_path / "out.ndjson")]
+        assert len(set(exported)) == total
+
+        assert len({inv["id"] for inv in iter_invoices(c, page_size=page_size)}) == total
+
+        with Mirror(c, tmp_path / "iugu.db", page_size=page_size) as m:
+            assert m.sync(["invoices"])["invoices"].fetched == total
+            assert m.count("invoices") == total
+
+
+def test_injected_faults_are_retried():
+    with IuguEmulator(error_rate=0.3, throttle_rate=0.2, retry_after=0, seed=7) as emu:
+        emu.state.seed(plans=1)
+        c = make_client(
+            base_url=emu.base_url, retry=RetryPolicy(max_attempts=20, base_delay=0, max_delay=0)
+        )
+        for _ in range(20):
+            assert c.plans.list()["totalItems"] == 1
+        assert emu.stats.injected > 0
+        assert set(emu.stats.statuses) - {200} <= {429, 500, 502, 503}
+
+
+def test_rate_limit_and_auth():
+    with IuguEmulator(rate_limit=5, api_token="tok") as emu:
+        c = make_client(base_url=emu.base_url)
+        statuses = [c.request("GET", "plans").status_code for _ in range(10)]
+        assert statuses[:5] == [200] * 5 and 429 in statuses
+
+    with IuguEmulator(api_token="other") as emu:
+        with pytest.raises(iugupy.IuguAPIError) as exc:
+            make_client(base_url=emu.base_url).plans.list()
+        assert exc.value.status_code == 401
+
+
+def test_only_the_most_recent_idempotency_keys_are_replayed():
+    with IuguEmulator(max_replays=2) as emu:
+        c = make_client(base_url=emu.base_url)
+
+        def create(key):
+            body = {"email": f"{key}@example.com"}
+            return c.request("POST", "customers", json=body, headers={"Idempotency-Key": key})
+
+        for key in ("k1", "k2", "k3", "k3", "k1"):
+            assert create(key).status_code == 200
+        assert len(emu._replays) == 2
+        assert emu.stats.replayed == 1
+        assert emu.state.list("customers", 0, 10)["totalItems"] == 4
+
+
+def test_sorting_by_a_field_some_rows_lack():
+    emu = IuguEmulator()
+    emu.state.seed(invoices=4)
+    rows = list(emu.state.invoices.values())
+    rows[0]["discount_cents"], rows[1]["discount_cents"] = 5, 0
+    for row in rows[2:]:
+        row.pop("discount_cents", None)
+
+    for direction, expected in (("asc", [0, 5, None, None]), ("desc", [None, None, 5, 0])):
+        page = emu.state.list("invoices", 0, 10, {"sortBy[discount_cents]": direction})
+        assert [row.get("discount_cents") for row in page["items"]] == expected
+
+
+def test_idempotency_keys_are_serialized_per_key():
+    emu = IuguEmulator()
+    started, release = threading.Event(), threading.Event()
+    results = {}
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return 200, {"id": "first"}
+
+    def call(name, key, run):
+        results[name] = emu._replay_or_run(key, run)
+
+    first = threading.Thread(target=call, args=("first", "k1", slow))
+    first.start()
+    started.wait(5)
+    # Another key goes through while k1 is still running; a repeat of k1 waits for it
+    call("other", "k2", lambda: (200, {"id": "other"}))
+    repeat = threading.Thread(target=call, args=("repeat", "k1", lambda: (200, {"id": "x"})))
+    repeat.start()
+    assert results == {"other": (200, {"id": "other"})}
+    release.set()
+    first.join(5)
+    repeat.join(5)
+
+    assert results["first"] == results["repeat"] == (200, {"id": "first"})
+    assert emu.stats.replayed == 1 and not emu._key_locks
+
+
+def hang_up_mid_response(emu):
+    host, port = emu.base_url.split("//")[1].split("/")[0].split(":")
+    for _ in range(3):
+        sock = socket.create_connection((host, int(port)))
+        sock.sendall(b"GET /v1/plans HTTP/1.1\r\nHost: emulator\r\n\r\n")
+        # Close with a reset before the (delayed) response is written
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        sock.close()
+    time.sleep(0.2)
+
+
+@pytest.mark.parametrize("verbose", [False, True])
+def test_clients_hanging_up_are_only_logged_when_verbose(capfd, verbose):
+    with IuguEmulator(latency="fixed:50", verbose=verbose) as emu:
+        hang_up_mid_response(emu)
+    assert ("ConnectionResetError" in capfd.readouterr().err) is verbose
+
+
+def test_async_client_against_emulator():
+    async def run(base_url):
+        cfg = make_config(base_url=base_url)
+        async with iugupy.AsyncIuguClient(cfg, max_connections=8) as c:
+            created = await asyncio.gather(
+                *(c.customers.create({"email": f"c{i}@example.com"}) for i in range(40))
+            )
+            return created, await c.customers.list(limit=100)
+
+    with IuguEmulator(latency="uniform:1,3") as emu:
+        created, page = asyncio.run(run(emu.base_url))
+    assert page["totalItems"] == 40 and {c["id"] for c in created} == {
+        c["id"] for c in page["items"]
+    }
+
+
+def test_latency_specs():
+    assert Latency("0").sample() == 0
+    assert Latency("fixed:20").sample() == 0.02
+    assert all(0.005 <= Latency("uniform:5,10").sample() <= 0.01 for _ in range(100))
+    assert Latency("lognormal:20,0.5").sample() > 0
+    with pytest.raises(ValueError):
+        Latency("gaussian:1")
@@ -0,0 +1,118 @@
+import gzip
+import json
+import threading
+
+import pytest
+
+import iugupy
+from iugupy.__main__ import main
+from iugupy.export import export_ndjson
+from conftest import FakeResp, make_client
+
+
+class Paged:
+    def __init__(self, total: int, fail_at: int | None = None):
+        self.total = total
+        self.fail_at = fail_at
+        self.starts: list[int] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, method, path, params=None, **kwargs):
+        start, limit = params["start"], params["limit"]
+        with self.lock:
+            self.starts.append(start)
+        if self.fail_at is not None and start >= self.fail_at:
+            return FakeResp(503, {"message": "unavailable"})
+        items = [{"id": f"inv_{i}"} for i in range(start, min(start + limit, self.total))]
+        return FakeResp(200, {"totalItems": self.total, "items": items})
+
+
+def read_ids(path) -> list[str]:
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt") as fh:
+        return [json.loads(line)["id"] for line in fh]
+
+
+@pytest.mark.parametrize("name", ["out.ndjson", "out.ndjson.gz"])
+def test_export_streams_all_pages_in_order(monkeypatch, tmp_path, name):
+    c = make_client()
+    monkeypatch.setattr(c, "request", Paged(95))
+    seen = []
+
+    result = export_ndjson(
+        c.invoices, tmp_path / name, page_size=10, concurrency=3, progress=seen.append
+    )
+
+    assert read_ids(tmp_path / name) == [f"inv_{i}" for i in range(95)]
+    assert result.records == result.exported == 95
+    assert result.pages == 10
+    assert not (tmp_path / f"{name}.checkpoint").exists()
+    assert seen and seen[-1].records == 95
+
+
+@pytest.mark.parametrize("name", ["out.ndjson", "out.ndjson.gz"])
+def test_export_resumes_from_checkpoint(monkeypatch, tmp_path, name):
+    c = make_client()
+    out = tmp_path / name
+    monkeypatch.setattr(c, "request", Paged(95, fail_at=40))
+    with pytest.raises(iugupy.IuguAPIError):
+        export_ndjson(c.invoices, out, page_size=10, concurrency=2)
+
+    checkpoint = json.loads((tmp_path / f"{name}.checkpoint").read_text())
+    assert checkpoint["start"] == 40 and checkpoint["records"] == 40
+
+    resumed = Paged(95)
+    monkeypatch.setattr(c, "request", resumed)
+    result = export_ndjson(c.invoices, out, page_size=10, concurrency=2)
+
+    assert result.resumed and result.records == 95 and result.exported == 55
+    assert min(resumed.starts) == 40
+    assert read_ids(out) == [f"inv_{i}" for i in range(95)]
+
+
+def test_export_refuses_to_resume_into_a_shortened_file(monkeypatch, tmp_path):
+    c = make_client()
+    out = tmp_path / "out.ndjson"
+    monkeypatch.setattr(c, "request", Paged(95, fail_at=40))
+    with pytest.raises(iugupy.IuguAPIError):
+        export_ndjson(c.invoices, out, page_size=10, concurrency=2)
+    out.write_bytes(out.read_bytes()[:-5])
+
+    monkeypatch.setattr(c, "request", Paged(95))
+    with pytest.raises(iugupy.IuguValidationError, match="shorter than its checkpoint"):
+        export_ndjson(c.invoices, out, page_size=10, concurrency=2)
+    assert b"\0" not in out.read_bytes()
+
+
+def test_export_ignores_checkpoint_of_other_export(monkeypatch, tmp_path):
+    c = make_client()
+    out = tmp_path / "out.ndjson"
+    monkeypatch.setattr(c, "request", Paged(30, fail_at=10))
+    with pytest.raises(iugupy.IuguAPIError):
+        export_ndjson(c.invoices, out, page_size=10, concurrency=1)
+
+    fresh = Paged(30)
+    monkeypatch.setattr(c, "request", fresh)
+    result = export_ndjson(c.invoices, out, page_size=10, concurrency=1, status_filter="paid")
+    assert not result.resumed and min(fresh.starts) == 0
+    assert read_ids(out) == [f"inv_{i}" for i in range(30)]
+
+
+def test_cli_export(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(iugupy.IuguClient, "request", lambda self, *a, **kw: Paged(12)(*a, **kw))
+    out = tmp_path / "customers.ndjson.gz"
+
+    closed = []
+    monkeypatch.setattr(iugupy.IuguClient, "close", lambda self: closed.append(self))
+
+    code = main(["--token", "tok", "export", "customers", "-o", str(out), "--page-size", "5", "-q"])
+
+    assert code == 0 and len(closed) == 1
+    assert len(read_ids(out)) == 12
+    assert "exported 12 customers" in capsys.readouterr().err
+
+
+def test_cli_requires_token(monkeypatch, capsys):
+    monkeypatch.delenv("IUGU_API_TOKEN", raising=False)
+    assert main(["export", "invoices"]) == 1
+    assert "token" in capsys.readouterr().err
@@ -0,0 +1,177 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import iugupy
+from iugupy.hedging import HedgingPolicy
+from conftest import FakeResp, make_config
+
+POLICY = HedgingPolicy(percentile=0.9, min_delay=0, min_samples=5, budget=0.5)
+
+
+def prime(client, endpoint: str, seconds: float = 0.02, n: int = 5) -> None:
+    for _ in range(n):
+        client.latency.observe(endpoint, seconds)
+
+
+def scripted(monkeypatch, client, delays):
+    """
+    client.request sleeps for the next delay (or raises it) and answers its index; a
+    ``(delay, status)`` pair answers with that status instead of 200.
+    """
+    calls = []
+    lock = threading.Lock()
+
+    def fake_request(method, path, **kwargs):
+        with lock:
+            n = len(calls)
+            calls.append(path)
+        outcome = delays[n]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        delay, status = outcome if isinstance(outcome, tuple) else (outcome, 200)
+        time.sleep(delay)
+        resp = FakeResp(status, {"id": f"call-{n}"})
+        sent.append(resp)
+        return resp
+
+    sent = []
+    monkeypatch.setattr(client, "request", fake_request)
+    return calls, sent
+
+
+def test_slow_get_is_hedged_and_hedge_wins(monkeypatch):
+    c = iugupy.IuguClient(make_config(hedging=POLICY))
+    prime(c, "GET customers/:id")
+    calls, sent = scripted(monkeypatch, c, [0.5, 0])
+
+    started = time.perf_counter()
+    assert c.customers.get("C1") == {"id": "call-1"}
+    assert time.perf_counter() - started < 0.4
+    assert calls == ["customers/C1", "customers/C1"]
+    assert c.hedger.snapshot() == [
+        {"endpoint": "GET customers/:id", "calls": 1, "fired": 1, "won": 1, "denied": 0}
+    ]
+    # The losing response is closed once it arrives
+    deadline = time.monotonic() + 2
+    while len(sent) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    assert [r.closed for r in sent] == [False, True]
+
+
+def test_fast_get_and_unprimed_endpoints_are_not_hedged(monkeypatch):
+    c = iugupy.IuguClient(make_config(hedging=POLICY))
+    prime(c, "GET invoices/:id", seconds=0.5)
+    calls, _ = scripted(monkeypatch, c, [0, 0])
+    assert c.invoices.get("I1") == {"id": "call-0"}
+    assert c.plans.get("P1") == {"id": "call-1"}  # no latency samples yet
+    stats = c.hedger.stats("GET invoices/:id")
+    assert (stats.calls, stats.fired, stats.won) == (1, 0, 0)
+    assert [s["endpoint"] for s in c.hedger.snapshot()] == ["GET invoices/:id"]
+    assert len(calls) == 2
+
+
+def test_budget_caps_extra_requests(monkeypatch):
+    c = iugupy.IuguClient(make_config(hedging=POLICY))
+    prime(c, "GET invoices/:id", seconds=0.01)
+    calls, _ = scripted(monkeypatch, c, [0.05, 0, 0.05, 0.05, 0])
+    c.invoices.get("I1")  # hedged: 1 extra for 1 call
+    c.invoices.get("I1")  # denied: 1 extra for 2 calls is the 50% budget
+    c.invoices.get("I1")  # hedged: 2 extra for 3 calls
+    stats = c.hedger.stats("GET invoices/:id")
+    assert (stats.calls, stats.fired, stats.denied) == (3, 2, 1)
+    assert stats.fire_ratio == pytest.approx(2 / 3)
+    assert len(calls) == 5
+
+
+def test_failed_attempt_falls_back_to_the_other(monkeypatch):
+    c = iugupy.IuguClient(make_config(hedging=POLICY))
+    prime(c, "GET plans/:id")
+    scripted(monkeypatch, c, [0.1, ConnectionError("reset")])
+    assert c.plans.get("P1") == {"id": "call-0"}
+    assert c.hedger.stats("GET plans/:id").won == 0
+
+    scripted(monkeypatch, c, [ConnectionError("a"), ConnectionError("b")])
+    with pytest.raises(ConnectionError):
+        c.plans.get("P1")
+
+
+def test_server_error_does_not_win_over_a_healthy_answer(monkeypatch):
+    c = iugupy.IuguClient(make_config(hedging=POLICY))
+    prime(c, "GET plans/:id")
+    _, sent = scripted(monkeypatch, c, [0.2, (0, 503)])
+    assert c.plans.get("P1") == {"id": "call-0"}
+    assert c.hedger.stats("GET plans/:id").won == 0
+    assert [r.closed for r in sent] == [True, False]
+
+    # Both replicas failing still surfaces the 5xx
+    scripted(monkeypatch, c, [(0.1, 503), ConnectionError("reset")])
+    with pytest.raises(iugupy.IuguAPIError) as exc:
+        c.plans.get("P1")
+    assert exc.value.status_code == 503
+
+
+def test_closing_the_client_shuts_down_the_hedging_threads(monkeypatch):
+    session = object()
+    with iugupy.IuguClient(make_config(hedging=POLICY), session=session) as c:
+        prime(c, "GET plans/:id")
+        scripted(monkeypatch, c, [0.1, 0])
+        c.plans.get("P1")
+        executor = c.hedger._executor
+        assert executor is not None
+    assert c.hedger._executor is None and executor._shutdown
+
+
+def test_writes_are_never_hedged(monkeypatch):
+    c = iugupy.IuguClient(make_config(hedging=POLICY))
+    prime(c, "POST plans")
+    calls, _ = scripted(monkeypatch, c, [0.1])
+    c.plans.create({"name": "Gold", "identifier": "gold", "interval": 1, "interval_type": "months"})
+    assert len(calls) == 1
+
+
+def test_async_hedge_cancels_the_loser(monkeypatch):
+    c = iugupy.AsyncIuguClient(make_config(hedging=POLICY))
+    prime(c, "GET customers/:id")
+    cancelled = []
+    delays = [1.0, 0]
+
+    async def fake_request(method, path, **kwargs):
+        n = 2 - len(delays)
+        try:
+            await asyncio.sleep(delays.pop(0))
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+        return FakeResp(200, {"id": f"call-{n}"})
+
+    monkeypatch.setattr(c, "request", fake_request)
+
+    async def run():
+        result = await c.customers.get("C1")
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == {"id": "call-1"}
+    assert cancelled == [0]
+    stats = c.hedger.stats("GET customers/:id")
+    assert (stats.fired, stats.won, stats.win_ratio) == (1, 1, 1.0)
+
+
+def test_async_server_error_does_not_win_over_a_healthy_answer(monkeypatch):
+    c = iugupy.AsyncIuguClient(make_config(hedging=POLICY))
+    prime(c, "GET customers/:id")
+    outcomes = [(0.2, 200), (0, 502)]
+
+    async def fake_request(method, path, **kwargs):
+        n = 2 - len(outcomes)
+        delay, status = outcomes.pop(0)
+        await asyncio.sleep(delay)
+        return FakeResp(status, {"id": f"call-{n}"})
+
+    monkeypatch.setattr(c, "request", fake_request)
+    assert asyncio.run(c.customers.get("C1")) == {"id": "call-0"}
+    assert c.hedger.stats("GET customers/:id").won == 0
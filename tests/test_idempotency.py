@@ -0,0 +1,204 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+import iugupy
+from iugupy import client as client_module
+from iugupy import idempotency as idempotency_module
+from iugupy.emulator import IuguEmulator, Latency
+from iugupy.idempotency import FileIdempotencyJournal, IdempotencyJournal
+from iugupy.retry import RetryPolicy
+from conftest import FakeResp, make_client
+
+INVOICE = {"email": "a@b.com", "due_date": "2030-01-31", "items": [{"price_cents": 100}]}
+
+
+def scripted(monkeypatch, c, outcomes):
+    """Replace client.request; each call records its headers and plays the next outcome."""
+    sent = []
+
+    def fake_request(method, path, **kwargs):
+        sent.append((method, (kwargs.get("headers") or {}).get("Idempotency-Key")))
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(c, "request", fake_request)
+    return sent
+
+
+def test_posts_carry_a_key_and_ambiguous_failures_reuse_it(monkeypatch):
+    c = make_client(idempotency_keys=True)
+    sent = scripted(
+        monkeypatch,
+        c,
+        [
+            requests.Timeout("read timed out"),
+            FakeResp(200, {"id": "inv_1"}),
+            FakeResp(200, {"id": "inv_2"}),
+            FakeResp(200, {"id": "inv_2"}),
+        ],
+    )
+
+    with pytest.raises(requests.Timeout):
+        c.invoices.create(INVOICE)
+    assert len(c.idempotency) == 1
+    # Retrying the same create right away reuses the key, so the API can dedupe it
+    assert c.invoices.create(dict(INVOICE))["id"] == "inv_1"
+    assert sent[0][1] is not None and sent[1][1] == sent[0][1]
+    assert len(c.idempotency) == 0 and c.idempotency.reused == 1
+
+    # Once answered, the same payload is a new request with a new key
+    c.invoices.create(INVOICE)
+    assert sent[2][1] not in (None, sent[0][1])
+    c.invoices.get("inv_2")
+    assert sent[3] == ("GET", None)
+
+
+def test_definitive_errors_release_the_key(monkeypatch):
+    c = make_client(idempotency_keys=True)
+    sent = scripted(
+        monkeypatch,
+        c,
+        [FakeResp(422, {"errors": {"email": "invalid"}}), FakeResp(503), FakeResp(200, {})],
+    )
+    with pytest.raises(iugupy.IuguAPIError):
+        c.customers.create({"email": "bad"})
+    with pytest.raises(iugupy.IuguAPIError):
+        c.customers.create({"email": "bad"})  # new key: the 422 was a definitive answer
+    c.customers.create({"email": "bad"})  # same key: the 503 outcome was unknown
+    assert sent[0][1] != sent[1][1] and sent[2][1] == sent[1][1]
+
+
+def test_explicit_key_and_disabled_by_default(monkeypatch):
+    c = make_client()
+    sent = scripted(monkeypatch, c, [FakeResp(200, {}), FakeResp(200, {})])
+    c.invoices.create(INVOICE)
+    c.invoices.create(INVOICE, idempotency_key="spec-42")
+    assert sent == [("POST", None), ("POST", "spec-42")]
+    assert c.idempotency is None
+
+
+def test_keyed_posts_are_retried_with_the_same_key(monkeypatch):
+    c = make_client(idempotency_keys=True, retry=RetryPolicy(max_attempts=3))
+    keys = []
+    outcomes = [requests.ConnectionError("reset"), FakeResp(503), FakeResp(200, {"id": "s"})]
+
+    def fake_send(method, url, params, body, headers, timeout, stream=False):
+        keys.append(headers["Idempotency-Key"])
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(c, "_send", fake_send)
+    monkeypatch.setattr(client_module.time, "sleep", lambda s: None)
+    assert c.subscriptions.suspend("sub_1") == {"id": "s"}
+    assert len(keys) == 3 and len(set(keys)) == 1
+
+    # Without a key a POST is still attempted once
+    plain = make_client(retry=RetryPolicy(max_attempts=3))
+    calls = []
+    monkeypatch.setattr(plain, "_send", lambda *args: calls.append(args) or FakeResp(503))
+    with pytest.raises(iugupy.IuguAPIError):
+        plain.subscriptions.suspend("sub_1")
+    assert len(calls) == 1
+
+
+def test_concurrent_identical_requests_get_distinct_keys():
+    journal = IdempotencyJournal()
+    first, second = journal.begin("fp"), journal.begin("fp")
+    assert first != second
+    journal.finish(first, definitive=False)
+    journal.finish(second, definitive=True)
+    assert journal.begin("fp") == first
+
+
+def test_file_journal_survives_restart(tmp_path):
+    path = tmp_path / "keys.jsonl"
+    journal = FileIdempotencyJournal(path)
+    crashed = journal.begin("fp-crashed")  # in flight when the process dies
+    unknown = journal.begin("fp-timeout")
+    journal.finish(unknown, definitive=False)
+    done = journal.begin("fp-done")
+    journal.finish(done, definitive=True)
+    journal.close()
+
+    reopened = FileIdempotencyJournal(path)
+    assert reopened.pending() == {crashed: "fp-crashed", unknown: "fp-timeout"}
+    assert reopened.begin("fp-crashed") == crashed
+    assert reopened.begin("fp-done") != done
+    reopened.close()
+    assert len(path.read_text().splitlines()) == 4  # compacted on open, then 2 begins
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+def test_unknown_keys_are_pruned_after_ttl(monkeypatch, tmp_path):
+    clock = FakeClock()
+    monkeypatch.setattr(idempotency_module, "time", clock)
+    journal = FileIdempotencyJournal(tmp_path / "keys.jsonl", ttl=10, compact_after=8)
+    for n in range(20):
+        journal.finish(journal.begin(f"fp-{n}"), definitive=False)
+        clock.now += 1
+    # Each call prunes the keys that timed out more than ttl seconds ago
+    assert len(journal) == 10 and sorted(journal.pending().values())[0] == "fp-10"
+    clock.now += 10
+    journal.finish(journal.begin("fp-last"), definitive=True)
+    assert len(journal) == 0 and journal._unknown == {}
+    journal.close()
+    assert len((tmp_path / "keys.jsonl").read_text().splitlines()) <= 2 * 8
+
+
+def test_async_resources_send_keys(monkeypatch):
+    cfg = iugupy.IuguConfig(
+        api_token="tok",
+        client_id="cid",
+        base_url="https://api.example.com/v1",
+        idempotency_keys=True,
+    )
+    sent = []
+
+    async def run():
+        async with iugupy.AsyncIuguClient(cfg) as c:
+
+            async def fake_request(method, path, **kwargs):
+                sent.append(kwargs.get("headers"))
+                return FakeResp(200, {"id": "cus_1"})
+
+            monkeypatch.setattr(c, "request", fake_request)
+            await c.customers.create({"email": "a@b.com"})
+            return c.idempotency
+
+    journal = asyncio.run(run())
+    assert sent[0]["Idempotency-Key"] and len(journal) == 0
+
+
+def test_timed_out_create_is_not_duplicated_against_emulator():
+    with IuguEmulator(latency="fixed:300") as emu:
+        c = iugupy.IuguClient(
+            iugupy.IuguConfig(
+                api_token="tok",
+                client_id="cid",
+                base_url=emu.base_url,
+                timeout=0.1,
+                idempotency_keys=True,
+            )
+        )
+        with pytest.raises(requests.Timeout):
+            c.customers.create({"email": "a@b.com"})
+        emu.latency = Latency("0")
+        customer = c.customers.create({"email": "a@b.com"})
+        time.sleep(0.4)  # let the timed-out request finish server-side
+
+    assert emu.state.list("customers", 0, 10)["totalItems"] == 1
+    assert emu.stats.replayed == 1 and customer["email"] == "a@b.com"
@@ -0,0 +1,72 @@
+import importlib.util
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+import iugupy
+from iugupy.resources import Invoices, LazyResource
+
+BENCH = Path(__file__).resolve().parents[1] / "benchmarks" / "bench_import.py"
+
+
+def load_bench():
+    spec = importlib.util.spec_from_file_location("bench_import", BENCH)
+    module = sys.modules[spec.name] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = load_bench()
+
+
+@pytest.mark.parametrize(
+    "name,statement,allowed", bench.SCENARIOS, ids=[case[0] for case in bench.SCENARIOS]
+)
+def test_cold_start_defers_heavy_modules(name, statement, allowed):
+    import_us, _, modules = bench.run_once(statement)
+    assert import_us > 0
+    assert [m for m in bench.DEFERRED if m in modules and m not in allowed] == []
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        150 |   iugupy.config\n"
+        "import time:        30 |        180 | iugupy\n"
+    )
+    assert bench.parse_importtime(stderr) == 180.0
+    with pytest.raises(ValueError):
+        bench.parse_importtime(stderr, "requests")
+
+
+def test_resources_are_built_on_first_access():
+    client = iugupy.IuguClient(iugupy.IuguConfig(api_token="tok", client_id="cid"))
+    assert "invoices" not in vars(client) and "_connected" in vars(client)
+    invoices = client.invoices
+    assert isinstance(invoices, Invoices) and client.invoices is invoices
+    assert "plans" not in vars(client)
+    assert isinstance(type(client).plans, LazyResource)
+    assert not client._connected  # no request made, no session built yet
+    assert client.session is client.session and client._connected
+
+
+def test_concurrent_first_access_yields_one_resource():
+    client = iugupy.IuguClient(iugupy.IuguConfig(api_token="tok", client_id="cid"))
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(client.customers)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(resource is client.customers for resource in seen)
+
+
+def test_async_client_is_exported_lazily():
+    from iugupy.aio import AsyncIuguClient
+
+    assert iugupy.AsyncIuguClient is AsyncIuguClient
+    assert "AsyncIuguClient" in iugupy.__all__
+    with pytest.raises(AttributeError):
+        iugupy.NoSuchThing
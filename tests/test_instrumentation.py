@@ -0,0 +1,117 @@
+import asyncio
+
+import requests
+
+import iugupy
+from iugupy import client as client_module
+from iugupy.instrumentation import Hook, LatencyHistogram
+from iugupy.retry import RetryPolicy
+from conftest import FakeResp, make_client
+
+
+class Recorder(Hook):
+    def __init__(self):
+        self.calls = []
+
+    def before_request(self, event):
+        self.calls.append(("before", event.resource, event.method, event.attempt))
+
+    def after_response(self, event, response):
+        self.calls.append(("after", event.status_code, event.response_bytes))
+
+    def on_error(self, event, error):
+        self.calls.append(("error", type(error).__name__))
+
+
+def _next(outcomes):
+    outcome = outcomes.pop(0)
+    if isinstance(outcome, BaseException):
+        raise outcome
+    return outcome
+
+
+def test_hooks_wrap_each_attempt(monkeypatch):
+    outcomes = [requests.ConnectionError("reset"), FakeResp(503), FakeResp(200, {"id": "gold"})]
+    c = make_client(retry=RetryPolicy(max_attempts=3))
+    recorder = Recorder()
+    c.add_hook(recorder)
+    monkeypatch.setattr(c, "_send", lambda *args: _next(outcomes))
+    monkeypatch.setattr(client_module.time, "sleep", lambda s: None)
+
+    assert c.plans.get("gold") == {"id": "gold"}
+    assert recorder.calls == [
+        ("before", "plans", "GET", 1),
+        ("error", "ConnectionError"),
+        ("before", "plans", "GET", 2),
+        ("after", 503, None),
+        ("before", "plans", "GET", 3),
+        ("after", 200, None),
+    ]
+
+
+def test_metrics_collector_aggregates_per_resource_and_method(monkeypatch):
+    metrics = iugupy.MetricsCollector()
+    c = make_client(hooks=[metrics])
+    statuses = iter([200, 200, 404, 201])
+
+    def fake_send(method, url, params, body, headers, timeout, stream=False):
+        return FakeResp(next(statuses), {"id": "x"}, headers={"Content-Length": "12"})
+
+    monkeypatch.setattr(c, "_send", fake_send)
+    c.invoices.get("inv_1")
+    c.invoices.get("inv_2")
+    try:
+        c.invoices.get("missing")
+    except iugupy.IuguAPIError:
+        pass
+    c.plans.create({"name": "Gold", "identifier": "gold", "interval": 1, "interval_type": "months"})
+
+    gets = metrics.get("invoices", "GET")
+    assert gets["calls"] == 3 and gets["errors"] == 1
+    assert gets["statuses"] == {"200": 2, "404": 1}
+    assert gets["response_bytes"] == 36
+    assert gets["p50"] is not None and gets["p50"] <= gets["p99"]
+    posts = metrics.get("plans", "POST")
+    assert posts["calls"] == 1 and posts["request_bytes"] > 0
+
+    text = metrics.to_prometheus()
+    assert 'iugu_requests_total{resource="invoices",method="GET",status="404"} 1' in text
+    assert 'iugu_request_duration_seconds_count{resource="invoices",method="GET"} 3' in text
+    assert 'le="+Inf"} 3' in text
+
+
+def test_async_client_fires_hooks(monkeypatch):
+    metrics = iugupy.MetricsCollector()
+    cfg = iugupy.IuguConfig(
+        api_token="tok", client_id="cid", base_url="https://api.example.com/v1", hooks=[metrics]
+    )
+
+    async def run():
+        async with iugupy.AsyncIuguClient(cfg) as c:
+
+            async def fake_exchange(method, target, url, headers, body):
+                return FakeResp(200, {"id": "gold"}, headers={"content-length": "13"})
+
+            monkeypatch.setattr(c, "_exchange", fake_exchange)
+            await asyncio.gather(*(c.plans.get("gold") for _ in range(3)))
+
+    asyncio.run(run())
+    entry = metrics.get("plans", "GET")
+    assert entry["calls"] == 3 and entry["response_bytes"] == 39
+
+
+def test_no_hooks_uses_plain_send(monkeypatch):
+    c = make_client()
+    monkeypatch.setattr(c, "_send_observed", None)  # would fail if called
+    monkeypatch.setattr(c, "_send", lambda *args: FakeResp(200, {"id": "gold"}))
+    assert c.plans.get("gold") == {"id": "gold"}
+
+
+def test_histogram_percentiles():
+    hist = LatencyHistogram((0.1, 0.2, 0.4))
+    for seconds in [0.05] * 50 + [0.15] * 45 + [0.3] * 4 + [1.0]:
+        hist.observe(seconds)
+    assert hist.percentile(0.5) == 0.1
+    assert 0.1 < hist.percentile(0.95) <= 0.2
+    assert 0.2 < hist.percentile(0.99) <= 0.4
+    assert LatencyHistogram().percentile(0.5) is None
@@ -0,0 +1,105 @@
+import sqlite3
+
+import pytest
+
+import iugupy
+from iugupy.__main__ import main
+from iugupy.emulator import IuguEmulator
+from iugupy.mirror import Mirror
+from conftest import make_client
+
+OLD = "2024-01-01T00:00:00+00:00"
+LATER = "2024-06-01T00:00:00+00:00"
+
+
+def backdate(emu: IuguEmulator, resource: str, when: str = OLD) -> None:
+    for row in getattr(emu.state, resource).values():
+        row["updated_at"] = when
+
+
+def test_full_load_then_incremental_updates(tmp_path):
+    with IuguEmulator() as emu:
+        emu.state.seed(customers=120, invoices=30, plans=2)
+        backdate(emu, "customers")
+        last = list(emu.state.customers)[-1]
+        emu.state.customers[last]["updated_at"] = LATER
+        c = make_client(base_url=emu.base_url)
+
+        with Mirror(c, tmp_path / "iugu.db", page_size=50, batch_size=40, overlap=0) as m:
+            first = m.sync()
+            assert first["customers"].full and first["customers"].fetched == 120
+            assert first["customers"].pages == 3
+            assert first["invoices"].fetched == 30 and first["plans"].fetched == 2
+            assert m.cursor("customers") == LATER
+            assert m.count("customers") == 120
+
+            customer_id = list(emu.state.customers)[0]
+            c.customers.update(customer_id, {"name": "Renamed"})
+            c.customers.create({"email": "new@example.com", "name": "New"})
+
+            second = m.sync(["customers", "plans"])
+            assert not second["customers"].full
+            # The changed and new customers, plus the one at the old cursor (inclusive)
+            assert second["customers"].fetched == 3
+            assert second["plans"].full  # plans have no updated_since filter
+            assert m.count("customers") == 121
+            assert m.get("customers", customer_id)["name"] == "Renamed"
+            assert m.find("customers", email="new@example.com")[0]["name"] == "New"
+            assert m.cursor("customers") > LATER
+
+
+def test_full_sync_drops_deleted_rows(tmp_path):
+    with IuguEmulator() as emu:
+        emu.state.seed(customers=5)
+        c = make_client(base_url=emu.base_url)
+        with Mirror(c, tmp_path / "iugu.db", resources=["customers"]) as m:
+            m.sync()
+            gone = list(emu.state.customers)[0]
+            c.customers.delete(gone)
+
+            assert m.sync()["customers"].deleted == 0  # incremental syncs miss deletions
+            assert m.get("customers", gone) is not None
+            result = m.sync(full=True)["customers"]
+            assert (result.fetched, result.deleted) == (4, 1)
+            assert m.get("customers", gone) is None
+
+
+def test_reads_use_indexed_columns_and_wal(tmp_path):
+    with IuguEmulator() as emu:
+        emu.state.seed(invoices=12)
+        c = make_client(base_url=emu.base_url)
+        for invoice_id in list(emu.state.invoices)[:4]:
+            emu.state.invoices[invoice_id]["status"] = "paid"
+        path = tmp_path / "iugu.db"
+        with Mirror(c, path, resources=["invoices"]) as m:
+            m.sync()
+            assert m.count("invoices", status="paid") == 4
+            assert len(m.find("invoices", status="pending", limit=3)) == 3
+            assert m.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            with pytest.raises(iugupy.IuguValidationError):
+                m.find("invoices", items="x")
+            with pytest.raises(iugupy.IuguValidationError):
+                m.find("invoices", order_by="data")
+            with pytest.raises(iugupy.IuguValidationError):
+                m.get("customers", "C1")
+
+        # Other processes read the file directly
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM invoices").fetchone()[0] == 12
+
+
+def test_rejects_unknown_resources(tmp_path):
+    with IuguEmulator() as emu:
+        with pytest.raises(iugupy.IuguValidationError):
+            Mirror(make_client(base_url=emu.base_url), tmp_path / "x.db", resources=["webhooks"])
+
+
+def test_mirror_command(tmp_path, capsys):
+    with IuguEmulator() as emu:
+        emu.state.seed(customers=3)
+        db = str(tmp_path / "iugu.db")
+        argv = ["--token", "tok", "--base-url", emu.base_url, "mirror", db]
+        assert main(argv + ["--resource", "customers"]) == 0
+        assert "customers: 3 fetched, 0 deleted (full" in capsys.readouterr().err
+        assert main(argv) == 0
+        assert "customers: 3 fetched, 0 deleted (incremental" in capsys.readouterr().err
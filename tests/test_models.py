@@ -0,0 +1,72 @@
+import sys
+
+from iugupy.models import Invoice, InvoiceItem, ListPage, PaymentMethod, Plan, to_model
+from conftest import FakeResp, make_client
+
+INVOICE = {
+    "id": "inv_1",
+    "status": "pending",
+    "total_cents": 3000,
+    "items": [{"id": "it_1", "description": "A", "price_cents": 1000, "quantity": 3}],
+    "bank_slip": {"digitable_line": "123"},
+}
+
+
+def test_dicts_by_default(monkeypatch):
+    c = make_client()
+    monkeypatch.setattr(c, "request", lambda method, path, **kw: FakeResp(200, dict(INVOICE)))
+    assert c.invoices.get("inv_1") == INVOICE
+
+
+def test_typed_get_decodes_nested_lists_lazily(monkeypatch):
+    c = make_client(typed_responses=True)
+    monkeypatch.setattr(c, "request", lambda method, path, **kw: FakeResp(200, dict(INVOICE)))
+
+    inv = c.invoices.get("inv_1")
+    assert isinstance(inv, Invoice)
+    assert inv.id == "inv_1" and inv.total_cents == 3000 and inv.paid_at is None
+    assert isinstance(inv._items, list)  # not decoded yet
+    (item,) = inv.items
+    assert isinstance(item, InvoiceItem) and item.price_cents == 1000
+    assert inv.items is inv.items
+
+    # Undeclared fields survive and round-trip
+    assert inv.bank_slip == {"digitable_line": "123"}
+    assert inv.get("missing", "x") == "x"
+    assert inv.to_dict()["items"] == [
+        dict(INVOICE["items"][0], price=None, created_at=None, updated_at=None)
+    ]
+    assert not hasattr(inv, "__dict__")
+
+
+def test_typed_list_pages_and_iter_all(monkeypatch):
+    c = make_client(typed_responses=True)
+    plans = [{"id": f"p{i}", "identifier": f"plan-{i}"} for i in range(5)]
+
+    def fake_request(method, path, *, params=None, **kw):
+        start, limit = params.get("start", 0), params.get("limit", 100)
+        return FakeResp(200, {"totalItems": 5, "items": plans[start : start + limit]})
+
+    monkeypatch.setattr(c, "request", fake_request)
+    page = c.plans.list()
+    assert isinstance(page, ListPage) and page.total_items == 5 and len(page) == 5
+    assert all(isinstance(p, Plan) for p in page)
+    assert [p.identifier for p in c.plans.iter_all(page_size=2)] == [p["identifier"] for p in plans]
+
+
+def test_sub_resources_use_their_own_model(monkeypatch):
+    c = make_client(typed_responses=True)
+    monkeypatch.setattr(
+        c, "request", lambda method, path, **kw: FakeResp(200, {"id": "pm_1", "item_type": "cc"})
+    )
+    assert isinstance(c.customers.get_payment_method("cus_1", "pm_1"), PaymentMethod)
+    # Responses without a model are returned unchanged
+    assert c.subscriptions.simulate_change_plan("sub_1", "gold") == {
+        "id": "pm_1",
+        "item_type": "cc",
+    }
+
+
+def test_models_are_smaller_than_dicts():
+    inv = to_model(Invoice, dict(INVOICE))
+    assert sys.getsizeof(inv) < sys.getsizeof(dict(INVOICE, **{f: None for f in Invoice._fields}))
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+import iugupy
+from conftest import FakeResp, make_config
+
+
+def paged(total: int, calls: list):
+    def page(method, path, params=None, **kwargs):
+        calls.append((method, path, dict(params)))
+        start, limit = params["start"], params["limit"]
+        items = [{"id": f"inv_{i}"} for i in range(start, min(start + limit, total))]
+        return FakeResp(200, {"totalItems": total, "items": items})
+
+    return page
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_all_walks_every_page(monkeypatch, prefetch):
+    c = iugupy.IuguClient(make_config())
+    calls: list = []
+    monkeypatch.setattr(c, "request", paged(25, calls))
+
+    ids = [
+        item["id"]
+        for item in c.invoices.iter_all(page_size=10, prefetch=prefetch, status_filter="paid")
+    ]
+
+    assert ids == [f"inv_{i}" for i in range(25)]
+    assert [p["start"] for _, _, p in calls] == [0, 10, 20]
+    assert all(p["limit"] == 10 and p["status_filter"] == "paid" for _, _, p in calls)
+    assert all(path == "invoices" for _, path, _ in calls)
+
+
+def test_iter_all_stops_on_exact_page_boundary(monkeypatch):
+    c = iugupy.IuguClient(make_config())
+    calls: list = []
+    monkeypatch.setattr(c, "request", paged(20, calls))
+
+    assert len(list(c.customers.iter_all(page_size=10))) == 20
+    assert len(calls) == 2  # totalItems avoids a trailing empty request
+
+
+def test_iter_all_prefetch_is_lazy(monkeypatch):
+    c = iugupy.IuguClient(make_config())
+    calls: list = []
+    monkeypatch.setattr(c, "request", paged(1000, calls))
+
+    it = c.plans.iter_all(page_size=10, prefetch=True)
+    next(it)
+    it.close()
+    assert len(calls) <= 2  # current page plus at most one prefetched page
+
+
+def test_iter_all_rejects_invalid_page_size():
+    c = iugupy.IuguClient(make_config())
+    with pytest.raises(iugupy.IuguValidationError):
+        next(c.plans.iter_all(page_size=0))
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_async_iter_all_walks_every_page(monkeypatch, prefetch):
+    c = iugupy.AsyncIuguClient(make_config())
+    calls: list = []
+    sync_page = paged(25, calls)
+
+    async def fake_request(method, path, **kwargs):
+        return sync_page(method, path, **kwargs)
+
+    monkeypatch.setattr(c, "request", fake_request)
+
+    async def run():
+        return [
+            item["id"] async for item in c.subscriptions.iter_all(page_size=10, prefetch=prefetch)
+        ]
+
+    assert asyncio.run(run()) == [f"inv_{i}" for i in range(25)]
+    assert [p["start"] for _, _, p in calls] == [0, 10, 20]
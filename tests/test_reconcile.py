@@ -0,0 +1,162 @@
+import csv
+import sqlite3
+from datetime import date
+
+import pytest
+
+import iugupy
+from iugupy.emulator import IuguEmulator
+from iugupy.reconcile import (
+    DUPLICATE,
+    EXTRA,
+    MATCHED,
+    MISMATCH,
+    MISSING,
+    Partition,
+    csv_ledger,
+    date_partitions,
+    iter_invoices,
+    reconcile,
+    reconcile_partitions,
+    sql_ledger,
+    summarize,
+)
+from conftest import make_client
+
+
+def test_merge_emits_every_kind():
+    invoices = [
+        {"id": "A", "total_cents": 100, "status": "paid"},
+        {"id": "B", "total_cents": 200, "status": "pending"},
+        {"id": "D", "total_cents": 400, "status": "paid"},
+        {"id": "E", "total_cents": 500, "status": "paid"},
+    ]
+    ledger = [
+        {"id": "A", "total_cents": "100", "status": "Paid"},
+        {"id": "B", "total_cents": "250", "status": "paid"},
+        {"id": "C", "total_cents": "300", "status": "paid"},
+        {"id": "E", "total_cents": "500", "status": "paid"},
+    ]
+    records = list(reconcile(invoices, ledger))
+    assert [(r.kind, r.id) for r in records] == [
+        (MATCHED, "A"),
+        (MISMATCH, "B"),
+        (MISSING, "C"),
+        (EXTRA, "D"),
+        (MATCHED, "E"),
+    ]
+    assert records[1].fields == ("total_cents", "status")
+    assert records[2].invoice is None and records[3].ledger is None
+
+    summary = summarize(reconcile(invoices, ledger, include_matched=False))
+    assert (summary.matched, summary.mismatch, summary.missing, summary.extra) == (0, 1, 1, 1)
+    assert summary.mismatched_fields == {"total_cents": 1, "status": 1}
+    assert not summary.clean
+
+
+def test_merge_is_lazy_and_rejects_unsorted_input():
+    def endless():
+        n = 0
+        while True:
+            yield {"id": f"{n:08d}"}
+            n += 1
+
+    stream = reconcile(endless(), iter([{"id": "00000001"}]), fields={})
+    assert [next(stream).kind for _ in range(3)] == [EXTRA, MATCHED, EXTRA]
+
+    with pytest.raises(iugupy.IuguValidationError, match="ledger is not sorted"):
+        list(reconcile([], [{"id": "B"}, {"id": "A"}]))
+    # Repeated ids (e.g. an item shifted across pages) are only reported once
+    assert len(list(reconcile([{"id": "A"}, {"id": "A"}], [{"id": "A"}], fields={}))) == 1
+
+
+def test_repeated_ledger_rows_are_reported():
+    ledger = [{"id": "A"}, {"id": "A"}, {"id": "B"}, {"id": "B"}, {"id": "B"}]
+    records = list(reconcile([{"id": "A"}], ledger, fields={}))
+    assert [(r.kind, r.id) for r in records] == [
+        (MATCHED, "A"),
+        (DUPLICATE, "A"),
+        (MISSING, "B"),
+        (DUPLICATE, "B"),
+        (DUPLICATE, "B"),
+    ]
+    assert records[1].invoice is None and records[1].ledger is ledger[1]
+    summary = summarize(records)
+    assert (summary.matched, summary.missing, summary.duplicate) == (1, 1, 3)
+    assert not summary.clean
+
+
+def test_csv_and_sql_ledgers(tmp_path):
+    path = tmp_path / "ledger.csv"
+    with open(path, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["id", "total_cents", "status", "created_at"])
+        writer.writerow(["A", "100", "paid", "2024-01-01"])
+        writer.writerow(["B", "200", "paid", "2024-01-02"])
+    day = Partition(date(2024, 1, 2), date(2024, 1, 3))
+    rows = list(csv_ledger(path, where=lambda row: day.contains(row["created_at"])))
+    assert [row["id"] for row in rows] == ["B"]
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE ledger (id TEXT, total_cents INTEGER, status TEXT)")
+    conn.executemany(
+        "INSERT INTO ledger VALUES (?, ?, ?)", [(f"I{n:03d}", n, "paid") for n in range(25)]
+    )
+    cursor = conn.execute("SELECT id, total_cents, status FROM ledger ORDER BY id")
+    rows = list(sql_ledger(cursor, batch_size=10))
+    assert len(rows) == 25 and rows[3] == {"id": "I003", "total_cents": 3, "status": "paid"}
+
+
+def test_date_partitions():
+    parts = date_partitions(date(2024, 1, 1), date(2024, 1, 8), days=3)
+    assert [(p.start.day, p.end.day) for p in parts] == [(1, 4), (4, 7), (7, 8)]
+    assert parts[0].params() == {"created_at_from": "2024-01-01", "created_at_to": "2024-01-03"}
+    assert parts[0].contains("2024-01-03T23:59:59-03:00") and not parts[0].contains("2024-01-04")
+
+
+def seed_invoices(emu: IuguEmulator, per_day: int, days: int) -> list:
+    emu.state.seed(invoices=per_day * days)
+    invoices = list(emu.state.invoices.values())
+    for n, invoice in enumerate(invoices):
+        invoice["created_at"] = f"2024-03-{1 + n % days:02d}T12:00:00+00:00"
+    return invoices
+
+
+def test_iter_invoices_streams_sorted_pages():
+    with IuguEmulator() as emu:
+        seed_invoices(emu, per_day=25, days=2)
+        c = make_client(base_url=emu.base_url)
+        day = Partition(date(2024, 3, 2), date(2024, 3, 3))
+        ids = [inv["id"] for inv in iter_invoices(c, page_size=10, partition=day)]
+        assert len(ids) == 25 and ids == sorted(ids)
+
+
+def test_partitions_reconcile_in_parallel():
+    with IuguEmulator() as emu:
+        invoices = seed_invoices(emu, per_day=30, days=4)
+        c = make_client(base_url=emu.base_url)
+        # The ledger lacks one invoice, has one unknown row and disagrees on one amount
+        ledger = [{**inv, "day": inv["created_at"][:10]} for inv in invoices[1:]]
+        ledger.append({"id": "0" * 32, "total_cents": 1, "status": "paid", "day": "2024-03-02"})
+        ledger[5]["total_cents"] += 1
+        ledger.sort(key=lambda row: row["id"])
+
+        def ledger_for(partition):
+            return (row for row in ledger if partition.contains(row["day"]))
+
+        parts = date_partitions(date(2024, 3, 1), date(2024, 3, 5))
+        records = list(reconcile_partitions(c, parts, ledger_for, workers=3, page_size=7))
+
+        summary = summarize(records)
+        counts = (summary.matched, summary.mismatch, summary.extra, summary.missing)
+        assert counts == (118, 1, 1, 1)
+        assert {r.partition for r in records} == set(parts)
+        assert next(r for r in records if r.kind == EXTRA).id == invoices[0]["id"]
+
+
+def test_partition_errors_propagate_and_stop_workers():
+    with IuguEmulator(error_rate=1.0) as emu:
+        c = make_client(base_url=emu.base_url)
+        parts = date_partitions(date(2024, 3, 1), date(2024, 3, 9))
+        with pytest.raises(iugupy.IuguAPIError):
+            list(reconcile_partitions(c, parts, lambda p: [], workers=2))
@@ -0,0 +1,154 @@
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+import iugupy
+from iugupy import client as client_module
+from iugupy.retry import RetryPolicy, parse_retry_after
+from conftest import FakeResp, make_client
+
+
+def script(monkeypatch, c, outcomes):
+    """Make each attempt return (or raise) the next scripted outcome."""
+    attempts: list = []
+    sleeps: list = []
+
+    def fake_send(method, url, params, json, headers, timeout, stream=False):
+        attempts.append((method, url, timeout))
+        outcome = outcomes[len(attempts) - 1]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(c, "_send", fake_send)
+    monkeypatch.setattr(client_module.time, "sleep", sleeps.append)
+    return attempts, sleeps
+
+
+def test_retries_transient_statuses_then_succeeds(monkeypatch):
+    events = []
+    c = make_client(retry=RetryPolicy(base_delay=0.1, max_delay=1.0, on_retry=events.append))
+    first, second = FakeResp(503), FakeResp(502)
+    attempts, sleeps = script(monkeypatch, c, [first, second, FakeResp(200, {"id": "p1"})])
+
+    assert c.plans.get("p1") == {"id": "p1"}
+    assert len(attempts) == 3
+    assert first.closed and second.closed
+    assert all(0.1 <= d <= 1.0 for d in sleeps)
+    assert [(e.attempt, e.status_code) for e in events] == [(1, 503), (2, 502)]
+
+
+def test_last_failure_is_surfaced_when_attempts_are_exhausted(monkeypatch):
+    c = make_client(retry=RetryPolicy(max_attempts=3, base_delay=0.01))
+    attempts, _ = script(monkeypatch, c, [FakeResp(503), FakeResp(503), FakeResp(503, {})])
+
+    with pytest.raises(iugupy.IuguAPIError) as exc:
+        c.invoices.get("inv_1")
+    assert exc.value.status_code == 503
+    assert len(attempts) == 3
+
+
+def test_non_idempotent_and_non_retryable_are_not_retried(monkeypatch):
+    c = make_client(retry=RetryPolicy(base_delay=0.01))
+    attempts, _ = script(monkeypatch, c, [FakeResp(503, {}), FakeResp(200, {})])
+    with pytest.raises(iugupy.IuguAPIError):
+        c.customers.create({"email": "a@b.com"})
+    assert len(attempts) == 1
+
+    attempts, _ = script(monkeypatch, c, [FakeResp(404, {}), FakeResp(200, {})])
+    with pytest.raises(iugupy.IuguAPIError):
+        c.customers.get("cus_1")
+    assert len(attempts) == 1
+
+
+def test_connection_errors_are_retried_then_raised(monkeypatch):
+    c = make_client(retry=RetryPolicy(max_attempts=2, base_delay=0.01))
+    attempts, _ = script(
+        monkeypatch, c, [requests.ConnectionError("reset"), requests.ConnectTimeout("slow")]
+    )
+    with pytest.raises(requests.ConnectTimeout):
+        c.plans.list()
+    assert len(attempts) == 2
+
+
+def test_retry_after_header_is_honoured(monkeypatch):
+    c = make_client(retry=RetryPolicy(base_delay=0.01, max_delay=0.05))
+    _, sleeps = script(
+        monkeypatch, c, [FakeResp(429, headers={"Retry-After": "2"}), FakeResp(200, {})]
+    )
+    c.plans.get("p1")
+    assert sleeps == [2.0]
+
+
+def test_retry_after_is_capped(monkeypatch):
+    c = make_client(retry=RetryPolicy(base_delay=0.01, max_retry_after=3.0, total_timeout=None))
+    _, sleeps = script(
+        monkeypatch, c, [FakeResp(429, headers={"Retry-After": "86400"}), FakeResp(200, {})]
+    )
+    c.plans.get("p1")
+    assert sleeps == [3.0]
+
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf", "NaN"])
+def test_non_finite_retry_after_falls_back_to_backoff(monkeypatch, value):
+    c = make_client(retry=RetryPolicy(base_delay=0.01, max_delay=0.05, total_timeout=None))
+    _, sleeps = script(
+        monkeypatch, c, [FakeResp(503, headers={"Retry-After": value}), FakeResp(200, {})]
+    )
+    c.plans.get("p1")
+    assert len(sleeps) == 1 and 0.01 <= sleeps[0] <= 0.05
+
+
+def test_total_budget_stops_retries_and_caps_attempt_timeout(monkeypatch):
+    c = make_client(retry=RetryPolicy(total_timeout=1.0, base_delay=0.01))
+    attempts, sleeps = script(
+        monkeypatch, c, [FakeResp(429, {}, headers={"Retry-After": "5"}), FakeResp(200, {})]
+    )
+    with pytest.raises(iugupy.IuguAPIError):
+        c.plans.get("p1")
+    assert len(attempts) == 1 and sleeps == []
+    assert attempts[0][2] <= 1.0  # per-attempt timeout capped by the budget
+
+
+def test_backoff_is_decorrelated_jitter_within_bounds():
+    policy = RetryPolicy(base_delay=0.5, max_delay=4.0)
+    delay = policy.base_delay
+    for _ in range(50):
+        nxt = policy.backoff(delay)
+        assert policy.base_delay <= nxt <= min(policy.max_delay, max(policy.base_delay, delay * 3))
+        delay = nxt
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("nan") is None and parse_retry_after("inf") is None
+    future = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= parse_retry_after(future) <= 30
+
+
+def test_async_client_retries(monkeypatch):
+    cfg = iugupy.IuguConfig(
+        api_token="tok",
+        client_id="cid",
+        base_url="https://api.example.com/v1",
+        retry=RetryPolicy(base_delay=0.001, max_delay=0.002),
+    )
+    c = iugupy.AsyncIuguClient(cfg)
+    outcomes = [ConnectionResetError("reset"), FakeResp(503), FakeResp(200, {"id": "p1"})]
+    attempts = []
+
+    async def fake_exchange(method, target, url, headers, body):
+        attempts.append(target)
+        outcome = outcomes[len(attempts) - 1]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(c, "_exchange", fake_exchange)
+    assert asyncio.run(c.plans.get("p1")) == {"id": "p1"}
+    assert attempts == ["/v1/plans/p1"] * 3
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+
+
+import iugupy
+from conftest import FakeResp, make_config
+
+
+def wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+def gated(monkeypatch, c, status: int = 200):
+    gate = threading.Event()
+    calls: list = []
+
+    def fake_request(method, path, **kwargs):
+        calls.append((method, path, kwargs.get("params")))
+        gate.wait(2)
+        return FakeResp(status, {"id": path.rpartition("/")[2]})
+
+    monkeypatch.setattr(c, "request", fake_request)
+    return gate, calls
+
+
+def run_threads(fn, n: int) -> list:
+    results: list = [None] * n
+
+    def worker(i):
+        try:
+            results[i] = fn()
+        except Exception as exc:
+            results[i] = exc
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results
+
+
+def test_concurrent_identical_gets_share_one_request(monkeypatch):
+    c = iugupy.IuguClient(make_config(single_flight=True))
+    gate, calls = gated(monkeypatch, c)
+
+    threads, results = run_threads(lambda: c.customers.get("cus_1"), 8)
+    wait_for(lambda: c.single_flight.shared == 7)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert calls == [("GET", "customers/cus_1", None)]
+    assert results == [{"id": "cus_1"}] * 8
+    assert len({id(r) for r in results}) == 8  # each caller gets its own copy
+
+
+def test_different_params_and_writes_are_not_coalesced(monkeypatch):
+    c = iugupy.IuguClient(make_config(single_flight=True))
+    gate, calls = gated(monkeypatch, c)
+    gate.set()
+
+    c.invoices.list(limit=1)
+    c.invoices.list(limit=2)
+    c.customers.update("cus_1", {"name": "a"})
+    assert len(calls) == 3
+    assert c.single_flight.executed == 2  # only the GETs go through the group
+
+
+def test_errors_are_shared_with_waiters(monkeypatch):
+    c = iugupy.IuguClient(make_config(single_flight=True))
+    gate, calls = gated(monkeypatch, c, status=500)
+
+    threads, results = run_threads(lambda: c.plans.get("gold"), 3)
+    wait_for(lambda: c.single_flight.shared == 2)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(isinstance(r, iugupy.IuguAPIError) for r in results)
+
+
+def test_disabled_by_default():
+    assert iugupy.IuguClient(make_config()).single_flight is None
+
+
+def test_async_single_flight(monkeypatch):
+    c = iugupy.AsyncIuguClient(make_config(single_flight=True))
+    calls: list = []
+
+    async def fake_request(method, path, **kwargs):
+        calls.append(path)
+        await asyncio.sleep(0.01)
+        return FakeResp(200, {"id": path.rpartition("/")[2]})
+
+    monkeypatch.setattr(c, "request", fake_request)
+
+    async def run():
+        return await asyncio.gather(*(c.plans.get("gold") for _ in range(10)))
+
+    assert asyncio.run(run()) == [{"id": "gold"}] * 10
+    assert calls == ["plans/gold"]
+
+
+def test_async_single_flight_propagates_errors(monkeypatch):
+    c = iugupy.AsyncIuguClient(make_config(single_flight=True))
+
+    async def fake_request(method, path, **kwargs):
+        await asyncio.sleep(0.01)
+        return FakeResp(503, {"message": "down"})
+
+    monkeypatch.setattr(c, "request", fake_request)
+
+    async def run():
+        return await asyncio.gather(
+            *(c.plans.get("gold") for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, iugupy.IuguAPIError) for r in results)
+
+
+def test_async_cancelled_leader_does_not_cancel_followers(monkeypatch):
+    c = iugupy.AsyncIuguClient(make_config(single_flight=True))
+    calls: list = []
+
+    async def fake_request(method, path, **kwargs):
+        calls.append(path)
+        await asyncio.sleep(0.05)
+        return FakeResp(200, {"id": path.rpartition("/")[2]})
+
+    monkeypatch.setattr(c, "request", fake_request)
+
+    async def run():
+        leader = asyncio.ensure_future(c.plans.get("gold"))
+        await asyncio.sleep(0.01)
+        followers = [asyncio.ensure_future(c.plans.get("gold")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*followers, return_exceptions=True)
+        return leader, followers, results
+
+    leader, followers, results = asyncio.run(run())
+    assert leader.cancelled()
+    assert not any(f.cancelled() for f in followers)
+    assert results == [{"id": "gold"}] * 3
+    # One follower ran the call again and the others shared it
+    assert calls == ["plans/gold", "plans/gold"]
+    assert c.single_flight.executed == 2 and c.single_flight.shared == 2
@@ -0,0 +1,117 @@
+import json
+import tracemalloc
+
+import pytest
+
+import iugupy
+from iugupy.emulator import IuguEmulator
+from iugupy.models import Invoice
+from iugupy.streaming import ListStream
+from conftest import make_client
+
+
+def chunked(data: bytes, size: int):
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+PAGE = {
+    "facets": {"status": {"paid": 1}},
+    "items": [
+        {"id": "A", "total_cents": 1990, "rate": 1.5e-3, "paid": True, "note": None},
+        {"id": "B", "description": 'Café "\\ ☃ 😀', "items": [[], {}]},
+        {"id": "C", "total_cents": 123456789},
+    ],
+    "totalItems": 42,
+}
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+def test_records_survive_any_chunk_boundary(size):
+    body = json.dumps(PAGE, ensure_ascii=False, indent=1).encode()
+    page = ListStream(chunked(body, size))
+    assert list(page) == PAGE["items"]
+    assert (page.count, page.total, page.fields["facets"]) == (3, 42, PAGE["facets"])
+
+
+def test_bare_arrays_and_empty_pages():
+    assert list(ListStream(chunked(b' [1, 22, {"a": 333}] ', 1))) == [1, 22, {"a": 333}]
+    for body in (b"[]", b'{"items": []}', b"{}", b'{"items": null, "totalItems": 0}'):
+        page = ListStream([body])
+        assert list(page) == [] and page.count == 0
+
+
+@pytest.mark.parametrize(
+    "body",
+    [b'{"items": [{"id": 1}', b'{"items": [1 2]}', b"{items: []}", b'{"items": []} x', b"", b"7"],
+)
+def test_malformed_or_truncated_bodies_raise(body):
+    with pytest.raises(json.JSONDecodeError):
+        list(ListStream(chunked(body, 3)))
+
+
+def test_records_are_yielded_before_the_body_ends():
+    def body():
+        yield b'{"items": [{"id": "A"},'
+        raise AssertionError("read past the first record")
+
+    assert next(iter(ListStream(body()))) == {"id": "A"}
+
+
+def test_memory_is_bounded_by_one_record():
+    record = json.dumps({"id": "X" * 32, "description": "y" * 2000}).encode()
+    count = 5000  # a ~10 MB page
+
+    def body():
+        yield b'{"totalItems": 5000, "items": ['
+        for n in range(count):
+            yield record + (b"," if n < count - 1 else b"]}")
+
+    tracemalloc.start()
+    try:
+        seen = sum(1 for _ in ListStream(body()))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert seen == count
+    assert peak < 20 * len(record)
+
+
+def test_iter_all_streams_every_page():
+    with IuguEmulator() as emu:
+        emu.state.seed(invoices=55)
+        c = make_client(base_url=emu.base_url)
+        streamed = list(c.invoices.iter_all(page_size=20, stream=True))
+        assert streamed == list(c.invoices.iter_all(page_size=20))
+        assert len(streamed) == 55
+
+        typed = make_client(base_url=emu.base_url, typed_responses=True, direct_send=True)
+        invoices = list(typed.invoices.iter_all(page_size=50, stream=True))
+        assert len(invoices) == 55 and all(isinstance(i, Invoice) for i in invoices)
+
+        with pytest.raises(iugupy.IuguValidationError):
+            list(c.invoices.iter_all(stream=True, prefetch=True))
+
+
+def test_streamed_errors_map_to_api_errors(monkeypatch):
+    with IuguEmulator(error_rate=1.0) as emu:
+        with pytest.raises(iugupy.IuguAPIError):
+            list(make_client(base_url=emu.base_url).plans.iter_all(stream=True))
+
+    class Truncated:
+        status_code = 200
+        url = "https://api.iugu.test/v1/plans"
+        closed = False
+
+        def iter_content(self, size):
+            yield b'{"items": [{"id": "P1"}, {"id": '
+
+        def close(self):
+            Truncated.closed = True
+
+    c = make_client()
+    monkeypatch.setattr(c, "request", lambda *args, **kwargs: Truncated())
+    records = c.plans.iter_all(stream=True)
+    assert next(records) == {"id": "P1"}
+    with pytest.raises(iugupy.IuguAPIError, match="invalid list response"):
+        next(records)
+    assert Truncated.closed
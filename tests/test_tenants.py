@@ -0,0 +1,212 @@
+import base64
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+import iugupy
+from iugupy.cache import TTLCache
+from iugupy.emulator import IuguEmulator
+from iugupy.tenants import ClientRegistry
+
+
+class RecordingAdapter(BaseAdapter):
+    """Answers every request with ``{}`` and records the Authorization header it carried."""
+
+    def __init__(self, gate=None):
+        super().__init__()
+        self.seen = []
+        self.gate = gate
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self.lock:
+            self.seen.append(request.headers.get("Authorization"))
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        if self.gate is not None:
+            self.gate.wait(5)
+        with self.lock:
+            self.running -= 1
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        resp._content = b"{}"
+        resp.request = request
+        return resp
+
+    def close(self):
+        pass
+
+
+def basic(token):
+    return "Basic " + base64.b64encode(f"{token}:".encode()).decode()
+
+
+def make_registry(adapter, **kwargs):
+    cfg = iugupy.IuguConfig(api_token="", client_id="market", base_url="https://iugu.test/v1")
+    registry = ClientRegistry(cfg, **kwargs)
+    registry.session.mount("https://", adapter)
+    return registry
+
+
+@pytest.mark.parametrize("direct_send", [False, True])
+def test_tenants_share_one_session_and_send_their_own_token(direct_send):
+    adapter = RecordingAdapter()
+    cfg = iugupy.IuguConfig(
+        api_token="", client_id="market", base_url="https://iugu.test/v1", direct_send=direct_send
+    )
+    with ClientRegistry(cfg) as registry:
+        registry.session.mount("https://", adapter)
+        a, b = registry.get("tok-a"), registry.get("tok-b", client_id="sub-b")
+        assert a.session is b.session is registry.session
+        assert registry.get("tok-a") is a and b.config.client_id == "sub-b"
+        a.plans.get("P1")
+        b.plans.get("P1")
+        a.get("plans/P2", headers={"X-Trace": "1"})
+    assert adapter.seen == [basic("tok-a"), basic("tok-b"), basic("tok-a")]
+    assert registry.session.auth is None and "Authorization" not in registry.session.headers
+    assert (registry.stats.created, registry.stats.hits) == (2, 1)
+
+
+def test_tenant_tokens_against_the_emulator():
+    with IuguEmulator(api_token="good") as emu:
+        cfg = iugupy.IuguConfig(api_token="", client_id="market", base_url=emu.base_url)
+        with ClientRegistry(cfg) as registry:
+            assert registry.get("good").get("plans").status_code == 200
+            assert registry.get("bad").get("plans").status_code == 401
+
+
+def test_lru_eviction_skips_busy_clients():
+    gate = threading.Event()
+    registry = make_registry(RecordingAdapter(gate), max_clients=2)
+    busy = registry.get("t1")
+    worker = threading.Thread(target=busy.get, args=("plans",))
+    worker.start()
+    try:
+        while not busy.active:
+            time.sleep(0.001)
+        registry.get("t2")
+        registry.get("t3")  # t1 is the oldest but busy: t2 goes instead
+        assert "t1" in registry and "t2" not in registry and len(registry) == 2
+    finally:
+        gate.set()
+        worker.join()
+    registry.get("t1")  # now most recently used
+    registry.get("t4")
+    assert "t3" not in registry and registry.stats.evicted == 2
+    assert registry.evict("t4") and not registry.evict("t4")
+
+
+def test_idle_ttl():
+    registry = make_registry(RecordingAdapter(), idle_ttl=60)
+    registry.get("t1")
+    registry.get("t2")
+    registry.get("t2").last_used -= 120
+    assert registry.prune() == 1 and "t2" not in registry and "t1" in registry
+
+
+def test_per_tenant_concurrency_limit():
+    gate = threading.Event()
+    adapter = RecordingAdapter(gate)
+    registry = make_registry(adapter, max_concurrency=2, acquire_timeout=0.05)
+    noisy, quiet = registry.get("noisy"), registry.get("quiet")
+    threads = [threading.Thread(target=noisy.get, args=("plans",)) for _ in range(2)]
+    worker = threading.Thread(target=quiet.get, args=("plans",))
+    for thread in threads:
+        thread.start()
+    try:
+        while adapter.running < 2:
+            time.sleep(0.001)
+        with pytest.raises(iugupy.IuguTenantBusyError):
+            noisy.get("plans")
+        # Other tenants still get through while the noisy one is saturated
+        worker.start()
+        while adapter.running < 3:
+            time.sleep(0.001)
+    finally:
+        gate.set()
+        for thread in threads + [worker]:
+            thread.join()
+    assert adapter.peak == 3 and noisy.active == 0
+
+
+def test_tenants_can_share_a_cache_backend():
+    class EchoTokenAdapter(RecordingAdapter):
+        def send(self, request, **kwargs):
+            resp = super().send(request, **kwargs)
+            resp._content = ('{"token": "%s"}' % request.headers["Authorization"]).encode()
+            return resp
+
+    backend = TTLCache(10)
+    adapter = EchoTokenAdapter()
+    cfg = iugupy.IuguConfig(
+        api_token="",
+        client_id="c",
+        base_url="https://iugu.test/v1",
+        cache_ttl={"plans": 60},
+        cache_backend=backend,
+    )
+    registry = ClientRegistry(cfg)
+    registry.session.mount("https://", adapter)
+    a, b = registry.get("tok_a"), registry.get("tok_b")
+
+    assert a.plans.get("gold") == {"token": basic("tok_a")}
+    assert b.plans.get("gold") == {"token": basic("tok_b")}
+    assert a.plans.get("gold") == {"token": basic("tok_a")}
+    assert b.plans.get("gold") == {"token": basic("tok_b")}
+    assert len(adapter.seen) == 2 and len(backend) == 2
+    with pytest.raises(iugupy.IuguValidationError):
+        registry.get("")
+
+
+def test_cookies_set_for_one_tenant_are_not_sent_for_another():
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            seen.append(self.headers.get("Cookie"))
+            self.send_response(200)
+            self.send_header("Set-Cookie", "lb=replica-1; Path=/")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}/v1"
+        cfg = iugupy.IuguConfig(api_token="", client_id="market", base_url=base)
+        with ClientRegistry(cfg) as registry:
+            registry.get("tok-a").get("plans")
+            registry.get("tok-b").get("plans")
+            assert len(registry.session.cookies) == 0
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert seen == [None, None]
+
+
+def test_evicted_and_closed_clients_shut_down_their_hedgers():
+    cfg = iugupy.IuguConfig(
+        api_token="", client_id="market", hedging=iugupy.HedgingPolicy(min_samples=1)
+    )
+    registry = ClientRegistry(cfg, max_clients=1)
+    closed = []
+    first = registry.get("t1")
+    first.hedger.close = lambda: closed.append("t1")
+    second = registry.get("t2")  # evicts t1
+    second.hedger.close = lambda: closed.append("t2")
+    registry.close()
+    assert closed == ["t1", "t2"] and len(registry) == 0
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import pickle
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import iugupy
+from iugupy.transport import PooledHTTPAdapter
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    paths: list = []
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with self.lock:
+            type(self).connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.paths.append(self.path)
+        body = json.dumps({"id": "plan_1"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_pool_settings_and_socket_options_from_config():
+    cfg = iugupy.IuguConfig(
+        api_token="tok",
+        client_id="cid",
+        pool_connections=4,
+        pool_maxsize=32,
+        pool_block=True,
+        socket_options=[(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 16)],
+    )
+    c = iugupy.IuguClient(cfg)
+    adapter = c.session.get_adapter("https://api.iugu.com/v1/")
+
+    assert isinstance(adapter, PooledHTTPAdapter)
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 32
+    assert adapter.poolmanager.connection_pool_kw["block"] is True
+    options = adapter.poolmanager.connection_pool_kw["socket_options"]
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+    assert (socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 16) in options
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in options
+
+    # Options survive the adapter being pickled and rebuilt
+    restored = pickle.loads(pickle.dumps(adapter))
+    assert restored.poolmanager.connection_pool_kw["socket_options"] == options
+
+
+def test_tcp_keepalive_can_be_disabled():
+    cfg = iugupy.IuguConfig(api_token="tok", client_id="cid", tcp_keepalive=False)
+    adapter = iugupy.IuguClient(cfg).session.get_adapter("https://api.iugu.com/v1/")
+    options = adapter.poolmanager.connection_pool_kw["socket_options"]
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) not in options
+
+
+def test_warm_up_connections_are_reused():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _Handler.connections = 0
+    try:
+        cfg = iugupy.IuguConfig(
+            api_token="tok",
+            client_id="cid",
+            base_url=f"http://127.0.0.1:{server.server_address[1]}/v1",
+            warm_up_connections=3,
+        )
+        c = iugupy.IuguClient(cfg)
+        assert _Handler.connections == 3
+
+        for _ in range(5):
+            assert c.plans.get("plan_1") == {"id": "plan_1"}
+        assert _Handler.connections == 3
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_warm_up_to_unreachable_host_does_not_raise():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    cfg = iugupy.IuguConfig(api_token="tok", client_id="cid", base_url=f"http://127.0.0.1:{port}")
+    assert iugupy.IuguClient(cfg).warm_up(2) == 0
+
+
+QUERY = {"status_filter": None, "limit": 5, "customer_id[]": ["c1", None, "c2"], "query": "á b"}
+
+
+def test_every_transport_builds_the_same_query_string_as_requests():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _Handler.paths = []
+    try:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+        for direct_send in (False, True):
+            cfg = iugupy.IuguConfig(
+                api_token="tok", client_id="cid", base_url=base_url, direct_send=direct_send
+            )
+            iugupy.IuguClient(cfg).invoices.list(**QUERY)
+            iugupy.IuguClient(cfg).invoices.list(status_filter=None)
+
+        async def run_async():
+            cfg = iugupy.IuguConfig(api_token="tok", client_id="cid", base_url=base_url)
+            async with iugupy.AsyncIuguClient(cfg) as client:
+                await client.invoices.list(**QUERY)
+                await client.invoices.list(status_filter=None)
+
+        asyncio.run(run_async())
+    finally:
+        server.shutdown()
+        server.server_close()
+    plain, plain_empty, direct, direct_empty, aio, aio_empty = _Handler.paths
+    assert direct == aio == plain
+    assert plain_empty == direct_empty == aio_empty == "/v1/invoices"
+    assert "None" not in plain and "customer_id%5B%5D=c1&customer_id%5B%5D=c2" in plain
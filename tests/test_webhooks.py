@@ -0,0 +1,221 @@
+import asyncio
+import io
+import threading
+import time
+from urllib.parse import urlencode
+
+import pytest
+
+import iugupy
+from iugupy.webhooks import (
+    EventBatcher,
+    InvoiceEvent,
+    ReceiverStats,
+    SubscriptionEvent,
+    WebhookEvent,
+    WebhookReceiver,
+    parse_event,
+)
+
+TOKEN = "s3cret"
+
+
+def body(event: str = "invoice.status_changed", **data) -> bytes:
+    data = data or {"id": "INV1", "status": "paid", "account_id": "ACC"}
+    return urlencode({"event": event, **{f"data[{k}]": v for k, v in data.items()}}).encode()
+
+
+def call(app, payload: bytes, *, method="POST", token=TOKEN):
+    environ = {
+        "REQUEST_METHOD": method,
+        "CONTENT_LENGTH": str(len(payload)),
+        "wsgi.input": io.BytesIO(payload),
+    }
+    if token is not None:
+        environ["HTTP_AUTHORIZATION"] = token
+    seen = {}
+
+    def start_response(status, headers):
+        seen["status"], seen["headers"] = status, dict(headers)
+
+    assert b"".join(app(environ, start_response)) == b""
+    return int(seen["status"][:3]), seen["headers"]
+
+
+class Collector:
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, events):
+        with self.lock:
+            self.batches.append(list(events))
+
+    @property
+    def events(self):
+        return [e for batch in self.batches for e in batch]
+
+
+def test_parse_typed_events():
+    event = parse_event(body())
+    assert isinstance(event, InvoiceEvent)
+    assert (event.resource, event.action) == ("invoice", "status_changed")
+    assert (event.invoice_id, event.status, event.account_id) == ("INV1", "paid", "ACC")
+
+    sub = parse_event(body("subscription.renewed", id="S1", plan_identifier="gold"))
+    assert isinstance(sub, SubscriptionEvent)
+    assert (sub.subscription_id, sub.plan_identifier) == ("S1", "gold")
+
+    nested = parse_event(b"event=withdraw_request.created&data[bank][code]=341&data[id]=W1")
+    assert type(nested) is WebhookEvent
+    assert nested.data == {"bank": {"code": "341"}, "id": "W1"}
+    assert (
+        nested.key
+        == parse_event(b"data[id]=W1&data[bank][code]=341&event=withdraw_request.created").key
+    )
+
+    for bad in (b"data[id]=1", b"\xff\xfe", b"event"):
+        with pytest.raises(iugupy.IuguValidationError):
+            parse_event(bad)
+
+
+def test_wsgi_acknowledges_dedupes_and_batches():
+    handled = Collector()
+    receiver = WebhookReceiver(TOKEN, handled, batch_size=10, max_wait=0.05)
+    try:
+        assert call(receiver, body())[0] == 200
+        assert call(receiver, body())[0] == 200  # redelivery
+        for n in range(5):
+            assert call(receiver, body(id=f"INV{n + 2}", status="paid"))[0] == 200
+    finally:
+        receiver.close()
+    assert [e.invoice_id for e in handled.events] == [f"INV{n}" for n in range(1, 7)]
+    stats = receiver.stats
+    assert (stats.received, stats.accepted, stats.duplicates, stats.handled) == (7, 6, 1, 6)
+    assert stats.batches == len(handled.batches) < 6
+
+
+def test_rejections():
+    receiver = WebhookReceiver(TOKEN, Collector(), max_body=200)
+    try:
+        assert call(receiver, body(), token="wrong")[0] == 401
+        assert call(receiver, body(), token=None)[0] == 401
+        assert call(receiver, b"nonsense", token=TOKEN)[0] == 400
+        assert call(receiver, b"", method="GET") == (405, {"Content-Length": "0", "Allow": "POST"})
+        assert call(receiver, body(id="x" * 300))[0] == 413
+    finally:
+        receiver.close()
+    stats = receiver.stats
+    assert (stats.unauthorized, stats.invalid, stats.accepted) == (2, 2, 0)
+
+
+def test_authentication_is_only_turned_off_explicitly():
+    with pytest.raises(ValueError):
+        WebhookReceiver("", Collector())
+    with pytest.raises(ValueError):
+        WebhookReceiver(None, Collector())
+    receiver = WebhookReceiver(None, Collector(), allow_unauthenticated=True)
+    try:
+        assert call(receiver, body(), token=None)[0] == 200
+    finally:
+        receiver.close()
+
+
+def test_full_queue_answers_503_and_accepts_the_retry():
+    started, release = threading.Event(), threading.Event()
+    handled = Collector()
+
+    def slow(events):
+        started.set()
+        release.wait(5)
+        handled(events)
+
+    receiver = WebhookReceiver(TOKEN, slow, batch_size=1, queue_size=2)
+    try:
+        assert call(receiver, body(id="I0"))[0] == 200
+        assert started.wait(5)
+        # One event is being handled and two wait in the queue; the rest are refused
+        statuses = [call(receiver, body(id=f"I{n}"))[0] for n in range(1, 4)]
+        assert statuses == [200, 200, 503]
+        status, headers = call(receiver, body(id="I4"))
+        assert status == 503 and headers["Retry-After"] == "5"
+        release.set()
+        deadline = time.monotonic() + 5
+        while len(receiver.batcher) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert call(receiver, body(id="I4"))[0] == 200  # not marked as seen when refused
+    finally:
+        release.set()
+        receiver.close()
+    assert "I4" in [e.invoice_id for e in handled.events]
+    assert receiver.stats.overloaded >= 2
+
+
+def test_handler_errors_do_not_stop_the_workers():
+    calls = []
+
+    def flaky(events):
+        calls.append(len(events))
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    batcher = EventBatcher(flaky, batch_size=1)
+    batcher.offer(parse_event(body(id="A")))
+    batcher.offer(parse_event(body(id="B")))
+    batcher.close()
+    assert calls == [1, 1]
+    assert (batcher.stats.handler_errors, batcher.stats.handled) == (1, 1)
+    assert batcher.offer(parse_event(body())) is False  # closed
+
+
+def test_stats_count_every_request_under_concurrency():
+    receiver = WebhookReceiver(TOKEN, lambda events: None)
+
+    def hammer():
+        for _ in range(2000):
+            receiver.handle("GET", {}, b"")
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    receiver.close()
+    assert receiver.stats.received == 16000
+    assert receiver.stats == ReceiverStats(received=16000)
+
+
+def test_asgi_app():
+    handled = Collector()
+    receiver = WebhookReceiver(TOKEN, handled)
+    payload = body()
+
+    async def request(headers, chunks):
+        messages = [
+            {"type": "http.request", "body": c, "more_body": i < len(chunks) - 1}
+            for i, c in enumerate(chunks)
+        ]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "POST", "headers": headers}
+        await receiver.asgi(scope, receive, send)
+        return sent[0]["status"]
+
+    async def run():
+        auth = [(b"authorization", TOKEN.encode())]
+        return (
+            await request(auth, [payload[:10], payload[10:]]),
+            await request([], [payload]),
+        )
+
+    try:
+        assert asyncio.run(run()) == (200, 401)
+    finally:
+        receiver.close()
+    assert [e.invoice_id for e in handled.events] == ["INV1"]